@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Importzeit der App-Module (python -X importtime)
+Misst, was ein Import kostet, und prüft, dass CLI-Werkzeuge weder Tk
+noch PIL laden und beim Import keine Verzeichnisse anlegen. Mit
+--baseline wird gegen eine gespeicherte Messung verglichen.
+
+Beispiele:
+  python3 bench_import.py
+  python3 bench_import.py --save import_baseline.json
+  python3 bench_import.py --baseline import_baseline.json --tolerance 30
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC_DIR = Path(__file__).parent / 'src'
+
+GUI_MODULES = ('tkinter', '_tkinter', 'PIL')
+
+# Modul -> Module, die dabei nicht geladen werden dürfen
+TARGETS: Dict[str, Tuple[str, ...]] = {
+    'app.config': GUI_MODULES,
+    'app.log_viewer': GUI_MODULES,
+    'app.error_store': GUI_MODULES,
+    'app.event_query': GUI_MODULES,
+    'app.energy': GUI_MODULES,
+    'app.motion_stats': GUI_MODULES,
+    'app.slideshow': GUI_MODULES,  # Bildliste ohne Dekodieren
+    'app.main': ('PIL', 'app.gui', 'app.slideshow_window'),  # Werden erst bei Bedarf geladen
+}
+
+
+def run_importtime(statement: str, home: str) -> List[Tuple[str, int, int]]:
+    """Führt statement mit -X importtime aus und gibt (Modul, self µs, kumulativ µs) zurück"""
+    env = dict(os.environ, HOME=home, PYTHONPATH=str(SRC_DIR))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else statement)
+    
+    # Zeilen: "import time:      self [us] | cumulative | imported package"
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        entries.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return entries
+
+
+def measure(module: str, baseline_modules: set, runs: int, home: str):
+    """Misst einen Modul-Import mehrfach, gibt (Zeiten in ms, Module des schnellsten Laufs) zurück"""
+    run_importtime(f'import {module}', home)  # Erzeugt die .pyc-Dateien (nicht mitgemessen)
+    times = []
+    best = None
+    for _ in range(runs):
+        entries = [e for e in run_importtime(f'import {module}', home) if e[0] not in baseline_modules]
+        total_ms = sum(self_us for _, self_us, _ in entries) / 1000.0
+        times.append(total_ms)
+        if best is None or total_ms <= min(times):
+            best = entries
+    return times, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importzeit-Benchmark mit Regressionsprüfung')
+    parser.add_argument('--runs', type=int, default=5, help='Messungen pro Modul (Standard: 5)')
+    parser.add_argument('--top', type=int, default=5, help='Teuerste Einzelmodule pro Ziel (Standard: 5)')
+    parser.add_argument('--module', action='append', help='Nur diese Module messen (mehrfach möglich)')
+    parser.add_argument('--save', type=Path, help='Ergebnis als Referenz speichern (JSON)')
+    parser.add_argument('--baseline', type=Path, help='Mit gespeicherter Referenz vergleichen')
+    parser.add_argument('--tolerance', type=float, default=25.0,
+                        help='Erlaubte Verschlechterung gegenüber der Referenz in %% (Standard: 25)')
+    args = parser.parse_args()
+    
+    targets = {m: TARGETS.get(m, ()) for m in args.module} if args.module else TARGETS
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    
+    print("\n" + "="*60)
+    print("⏱️  IMPORTZEIT-BENCHMARK (-X importtime)")
+    print("="*60)
+    print(f"Python {sys.version.split()[0]}, {args.runs} Läufe pro Modul (Minimum zählt)\n")
+    
+    home = tempfile.mkdtemp(prefix='import-home-')
+    failures = []
+    results = {}
+    try:
+        # Was der Interpreter ohnehin lädt, zählt nicht mit
+        baseline_modules = {name for name, _, _ in run_importtime('pass', home)}
+        
+        for module, forbidden in targets.items():
+            try:
+                times, entries = measure(module, baseline_modules, args.runs, home)
+            except RuntimeError as e:
+                print(f"{module:22s} ❌ {e}")
+                failures.append(f"{module} nicht importierbar")
+                continue
+            best_ms = min(times)
+            results[module] = best_ms
+            loaded = {name for name, _, _ in entries}
+            
+            print(f"{module:22s} {best_ms:7.1f} ms  (Median {statistics.median(times):.1f} ms, "
+                  f"{len(loaded)} Module)")
+            for name, self_us, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:args.top]:
+                print(f"    {self_us / 1000.0:6.1f} ms  {name}")
+            
+            bad = sorted(name for name in loaded
+                         if any(name == f or name.startswith(f + '.') for f in forbidden))
+            if bad:
+                print(f"  ❌ Lädt {', '.join(bad)}")
+                failures.append(f"{module} lädt {', '.join(bad)}")
+            
+            reference = baseline.get(module)
+            if reference:
+                change = 100.0 * (best_ms - reference) / reference
+                ok = change <= args.tolerance
+                print(f"  {'✅' if ok else '❌'} Referenz {reference:.1f} ms ({change:+.0f}%)")
+                if not ok:
+                    failures.append(f"{module} {change:+.0f}% langsamer")
+        
+        # Importe dürfen keine Verzeichnisse anlegen
+        created = sorted(str(p.relative_to(home)) for p in Path(home).rglob('*'))
+        if created:
+            print(f"\n❌ Beim Import angelegt: {', '.join(created)}")
+            failures.append("Import legt Dateien an")
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + '\n')
+        print(f"\nReferenz gespeichert: {args.save}")
+    
+    print("\n" + "="*60)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        print("="*60 + "\n")
+        sys.exit(1)
+    print("✅ Keine Regressionen")
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
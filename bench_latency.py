@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Bewegung -> Bildschirm an -> erstes Bild
+Treibt den kompletten Aufweck-Pfad mit simulierter GPIO-Flanke und
+einem Bildschirm-Stub. Benötigt ein DISPLAY (z.B. xvfb-run).
+
+Beispiele:
+  python3 bench_latency.py
+  python3 bench_latency.py --screen-delay-ms 300 --polling
+  xvfb-run python3 bench_latency.py --runs 100
+"""
+
+import sys
+import time
+import tempfile
+import argparse
+from pathlib import Path
+
+# Füge src zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import tkinter as tk
+from PIL import Image
+
+from app.config import AppConfig
+from app.gpio_backend import MockGPIOBackend
+from app.screen_control import ScreenController
+from app.slideshow_window import SlideshowWindow
+
+PIN = 4
+
+
+class StubScreenController(ScreenController):
+    """Bildschirm-Stub mit einstellbarer Schaltzeit"""
+    
+    def __init__(self, delay_ms: float):
+        super().__init__()
+        self.delay = delay_ms / 1000.0
+    
+    def _set_power(self, on: bool) -> bool:
+        time.sleep(self.delay)
+        return True
+
+
+def create_images(folder: Path, count: int = 3):
+    """Erstellt einfache Testbilder"""
+    for i in range(count):
+        Image.new('RGB', (1920, 1080), (40 * i, 80, 160)).save(folder / f"bench-{i}.png")
+
+
+def pump(root: tk.Tk, condition, timeout: float = 5.0) -> bool:
+    """Verarbeitet Tk-Events bis condition() wahr ist"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        root.update()
+        if condition():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Motion-to-Photon Latenz-Benchmark')
+    parser.add_argument('--runs', type=int, default=30, help='Anzahl Aufweck-Vorgänge (Standard: 30)')
+    parser.add_argument('--screen-delay-ms', type=float, default=0, help='Simulierte Schaltzeit des Bildschirms')
+    parser.add_argument('--polling', action='store_true', help='Polling statt Flankenerkennung')
+    parser.add_argument('--debounce-ms', type=int, default=50, help='Software-Entprellung')
+    args = parser.parse_args()
+    
+    print("\n" + "="*60)
+    print("⏱️  MOTION-TO-PHOTON BENCHMARK")
+    print("="*60)
+    print(f"Sensor: {'Polling' if args.polling else 'Flankenerkennung'}, "
+          f"Entprellung: {args.debounce_ms} ms, Bildschirm: {args.screen_delay_ms:g} ms\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        create_images(Path(tmp))
+        
+        config = AppConfig(
+            display_mode="pir",
+            image_folder=tmp,
+            fullscreen=False,
+            show_sensor_status=False,
+            pir_pin=PIN,
+            pir_use_interrupts=not args.polling,
+            pir_debounce_ms=args.debounce_ms
+        )
+        
+        root = tk.Tk()
+        root.withdraw()
+        
+        backend = MockGPIOBackend(edge_detection=not args.polling)
+        window = SlideshowWindow(
+            config,
+            screen_controller=StubScreenController(args.screen_delay_ms),
+            gpio_backend=backend
+        )
+        window.start()
+        pump(root, lambda: window.current_image_time > 0)
+        
+        tracker = window.latency_tracker
+        for _ in range(args.runs):
+            # Bildschirm aus (wie nach Timeout)
+            window.screen_controller.turn_off()
+            window.screen_active = False
+            
+            samples = tracker.samples
+            backend.set_level(PIN, 1)
+            if not pump(root, lambda: tracker.samples > samples):
+                print("⚠️  Timeout beim Warten auf das erste Bild")
+            
+            backend.set_level(PIN, 0)
+            pump(root, lambda: not window.pir_sensor.motion_detected, timeout=1)
+            # Entprell-Fenster abwarten
+            time.sleep(args.debounce_ms / 1000.0 + 0.01)
+        
+        window.stop()
+        root.destroy()
+    
+    for stage in tracker.STAGES:
+        hist = tracker.histograms[stage]
+        print(f"{stage}: n={hist.count} mittel={hist.mean():.2f}ms "
+              f"min={hist.min or 0:.2f}ms max={hist.max or 0:.2f}ms")
+        print(hist.format())
+        print()
+    
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark: log-viewer auf einem großen synthetischen Log-Verzeichnis
+Legt --errors Fehler im Error-Speicher (verteilt auf --days Tagessegmente)
+sowie Crash-Reports und Error-Reports im alten Markdown-Format an und misst
+list (erste Seite, Filter, kompletter JSON-Export), show und cleanup --dry-run.
+Zum Vergleich wird die frühere Sortierung aller Markdown-Dateien nach
+Änderungszeit (mehrere stat pro Datei) gemessen. Schlägt fehl, wenn die
+erste Seite länger als --max-seconds dauert.
+
+Beispiele:
+  python3 bench_log_viewer.py
+  python3 bench_log_viewer.py --errors 200000 --legacy 20000
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import struct
+import random
+import tempfile
+import argparse
+import contextlib
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+# Füge src zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from app.error_store import INDEX_FORMAT, INDEX_SUFFIX, report_id, segment_file
+from app.log_viewer import LogFilter, cleanup_logs, iter_logs, list_logs, show_error
+from app.error_store import ErrorStore
+
+HASHES = [f"{i:012x}" for i in range(0x5a5a00, 0x5a5a00 + 40)]
+MESSAGES = ["Bild konnte nicht geladen werden", "Timeout beim Lesen des Sensors",
+            "Konfiguration ungültig", "Speicher knapp beim Skalieren"]
+
+
+def build_tree(root: Path, errors: int, days: int, crashes: int, legacy: int) -> int:
+    """
+    Schreibt den Error-Speicher direkt im Segmentformat (schneller als append pro Fehler)
+    
+    Returns:
+        Anzahl angelegter Reports (alte Reports mit gleichem Namen zählen einmal)
+    """
+    rng = random.Random(42)
+    error_dir = root / 'errors'
+    crash_dir = root / 'crashes'
+    error_dir.mkdir(parents=True)
+    crash_dir.mkdir(parents=True)
+    now = datetime.now().replace(microsecond=0)
+    first = now - timedelta(days=days - 1)
+    
+    per_day = errors // days
+    for day_index in range(days):
+        day = (first + timedelta(days=day_index)).date()
+        start = datetime.combine(day, datetime.min.time()).timestamp()
+        count = per_day if day_index < days - 1 else errors - per_day * (days - 1)
+        times = sorted(start + rng.random() * 86399 for _ in range(count))
+        lines = []
+        index = []
+        offset = 0
+        for timestamp in times:
+            error_hash = rng.choice(HASHES)
+            record = {
+                'timestamp': timestamp,
+                'error_hash': error_hash,
+                'error_type': 'RuntimeError',
+                'error_message': f"{rng.choice(MESSAGES)} ({rng.randrange(1000)})",
+                'traceback': 'Traceback (most recent call last):\n  File "slideshow.py", line 1\nRuntimeError',
+                'context': {'image': f"/home/pi/bilder/{rng.randrange(5000)}.jpg"},
+                'count': 1,
+                'first_occurrence': timestamp,
+            }
+            line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+            lines.append(line)
+            index.append(struct.pack(INDEX_FORMAT, timestamp, offset, error_hash.encode('ascii')))
+            offset += len(line)
+        path = segment_file(error_dir, day)
+        path.write_bytes(b''.join(lines))
+        path.with_suffix(INDEX_SUFFIX).write_bytes(b''.join(index))
+    
+    for i in range(crashes):
+        when = first + timedelta(seconds=rng.randrange(days * 86400))
+        (crash_dir / f"crash-{when.strftime('%Y%m%d-%H%M%S')}-{i}.md").write_text(
+            "# 💥 CRASH REPORT\n\nMemoryError\n", encoding='utf-8')
+    names = set()
+    for i in range(legacy):
+        when = first + timedelta(seconds=rng.randrange(days * 86400))
+        name = report_id(when.timestamp(), rng.choice(HASHES)) + '.md'
+        (error_dir / name).write_text("# ⚠️ ERROR REPORT\n\nAltes Format\n", encoding='utf-8')
+        names.add(name)
+    return errors + crashes + len(names)
+
+
+def old_list(log_dir: Path) -> int:
+    """Frühere Übersicht: glob und Sortierung nach st_mtime (stat pro Vergleichsschlüssel und Ausgabe)"""
+    shown = 0
+    for subdir in ['crashes', 'errors']:
+        files = sorted((log_dir / subdir).glob('*.md'), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in files:
+            path.stat().st_mtime
+            path.stat().st_size
+            shown += 1
+    return shown
+
+
+def timed(label: str, func: Callable[[], object]) -> float:
+    """Laufzeit in Sekunden (Ausgabe der Funktion wird verworfen)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:40s} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='log-viewer mit vielen Reports')
+    parser.add_argument('--errors', type=int, default=100000, help='Fehler im Error-Speicher (Standard: 100000)')
+    parser.add_argument('--days', type=int, default=30, help='Tagessegmente (Standard: 30)')
+    parser.add_argument('--crashes', type=int, default=200, help='Crash-Reports (Standard: 200)')
+    parser.add_argument('--legacy', type=int, default=5000,
+                        help='Error-Reports im alten Markdown-Format (Standard: 5000)')
+    parser.add_argument('--max-seconds', type=float, default=1.0,
+                        help='Obergrenze für die erste Seite von list (Standard: 1)')
+    args = parser.parse_args()
+    
+    root = Path(tempfile.mkdtemp(prefix='log-viewer-'))
+    try:
+        print("\n" + "="*60)
+        print("📋 LOG-VIEWER-BENCHMARK")
+        print("="*60)
+        start = time.perf_counter()
+        expected = build_tree(root, args.errors, args.days, args.crashes, args.legacy)
+        print(f"{args.errors} Fehler in {args.days} Segmenten, {args.crashes} Crash-Reports, "
+              f"{args.legacy} alte Error-Reports ({time.perf_counter() - start:.1f}s angelegt)\n")
+        
+        problems: List[str] = []
+        total = sum(1 for _ in iter_logs(root))
+        if total != expected:
+            problems.append(f"{total} statt {expected} Einträge in der Übersicht")
+        
+        now = datetime.now()
+        first_page = timed("list (erste Seite)", lambda: list_logs(root))
+        timed("list --offset 50000", lambda: list_logs(root, offset=50000))
+        timed("list --type error --hash", lambda: list_logs(root, 'error', LogFilter(error_hash=HASHES[0])))
+        timed("list --since 2d", lambda: list_logs(root, log_filter=LogFilter(since=now - timedelta(days=2))))
+        timed("list --grep Timeout", lambda: list_logs(root, log_filter=LogFilter(text='Timeout')))
+        timed("list --grep (ohne Treffer) --limit 0",
+              lambda: list_logs(root, log_filter=LogFilter(text='gibt es nicht'), limit=0))
+        timed("list --limit 0 --json (alles)", lambda: list_logs(root, limit=0, as_json=True))
+        
+        store = ErrorStore(root / 'errors')
+        last = next(store.iter_entries(newest_first=True))
+        timed("show (Error-Speicher)", lambda: show_error(store, last.report_id))
+        timed("cleanup --days 7 --dry-run", lambda: cleanup_logs(root, 7, dry_run=True))
+        timed("früher: glob + mtime-Sort (nur .md)", lambda: old_list(root))
+        
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            list_logs(root, 'error', LogFilter(error_hash=HASHES[1]), limit=5, as_json=True)
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        if len(rows) != 5 or any(row['hash'] != HASHES[1] for row in rows) \
+                or rows != sorted(rows, key=lambda row: row['timestamp'], reverse=True):
+            problems.append("JSON-Ausgabe mit --hash falsch (Anzahl, Hash oder Reihenfolge)")
+        
+        print("\n" + "="*60)
+        if first_page > args.max_seconds:
+            problems.append(f"Erste Seite {first_page:.2f}s > {args.max_seconds:g}s")
+        if problems:
+            for problem in problems:
+                print(f"❌ {problem}")
+            print("="*60 + "\n")
+            sys.exit(1)
+        print(f"✅ Erste Seite in {first_page:.2f}s <= {args.max_seconds:g}s bei {expected} Reports")
+        print("✅ Filter und JSON-Ausgabe geprüft")
+        print("="*60 + "\n")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
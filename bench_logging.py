@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Kosten des Loggings im aufrufenden Thread (Tk-Thread)
+Vergleicht direktes Schreiben (StreamHandler) mit der Queue aus
+app.logging_setup, auch bei langsamer Ausgabe (z.B. volle stdout-Pipe
+zu systemd), sowie gefilterte Debug-Meldungen mit f-String und %-Argumenten.
+Der journald-Handler wird gegen einen lokalen Unix-Socket geprüft (Felder,
+mehrzeilige und übergroße Einträge). Schlägt fehl, wenn ein Aufruf über die
+Queue im p99 länger als --max-p99-us dauert oder das Journal-Format nicht stimmt.
+
+Beispiele:
+  python3 bench_logging.py
+  python3 bench_logging.py --records 50000 --sink-delay-ms 2
+"""
+
+import io
+import os
+import sys
+import time
+import queue
+import socket
+import tempfile
+import threading
+import logging
+import argparse
+import logging.handlers
+import statistics
+from pathlib import Path
+from typing import List, Tuple
+
+# Füge src zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from app.logging_setup import LOG_FORMAT, DeferredQueueHandler
+from app.journal_handler import JournalHandler, decode_entry
+
+
+class SlowStream(io.StringIO):
+    """Ausgabe, deren write() blockiert (wie eine volle Pipe)"""
+    
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+    
+    def write(self, text: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return len(text)
+
+
+class Image:
+    """Bild wie in der Slideshow (nur der Name wird geloggt)"""
+    name = 'eingang-sommerfest-2025-017.jpg'
+
+
+def time_calls(log, records: int) -> List[float]:
+    """Zeit pro Aufruf in µs (ein typischer Bildwechsel)"""
+    image = Image()
+    times = []
+    for i in range(records):
+        start = time.perf_counter_ns()
+        log.info("Zeige Bild: %s (%d von %d)", image.name, i, records)
+        times.append((time.perf_counter_ns() - start) / 1000.0)
+    return times
+
+
+def report(label: str, times: List[float]) -> float:
+    times = sorted(times)
+    p99 = times[int(len(times) * 0.99) - 1]
+    print(f"{label:34s} Median {statistics.median(times):8.1f} µs   p99 {p99:8.1f} µs   "
+          f"max {times[-1]:9.1f} µs")
+    return p99
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    log = logging.getLogger(name)
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+    return log
+
+
+def bench_sync(records: int, delay: float) -> float:
+    handler = logging.StreamHandler(SlowStream(delay))
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log = make_logger(f'bench.sync.{delay}', handler)
+    return report(f"StreamHandler (Ausgabe {delay * 1000:g} ms)", time_calls(log, records))
+
+
+def bench_queue(records: int, delay: float, queue_size: int) -> float:
+    output = logging.StreamHandler(SlowStream(delay))
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    handler = DeferredQueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, output)
+    listener.start()
+    log = make_logger(f'bench.queue.{delay}', handler)
+    
+    p99 = report(f"Queue (Ausgabe {delay * 1000:g} ms)", time_calls(log, records))
+    start = time.perf_counter()
+    listener.stop()
+    print(f"{'':34s} {handler.dropped} verworfen, Queue geleert in {time.perf_counter() - start:.2f}s")
+    return p99
+
+
+def receive_entries(sock: socket.socket, entries: list, stop: threading.Event):
+    """Journal-Stand-in: empfängt Datagramme und übergebene memfds"""
+    while not stop.is_set():
+        try:
+            data, fds, _, _ = socket.recv_fds(sock, 1 << 20, 1)
+        except socket.timeout:
+            continue
+        for fd in fds:
+            data = os.pread(fd, os.fstat(fd).st_size, 0)
+            os.close(fd)
+        entries.append(decode_entry(data))
+
+
+def bench_journal(records: int, queue_size: int) -> Tuple[float, List[str]]:
+    """Queue + JournalHandler gegen einen lokalen Socket, gibt (p99, Fehler) zurück"""
+    directory = tempfile.mkdtemp(prefix='journal-')
+    path = os.path.join(directory, 'socket')
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    server.bind(path)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    server.settimeout(0.2)
+    entries: list = []
+    stop = threading.Event()
+    receiver = threading.Thread(target=receive_entries, args=(server, entries, stop), daemon=True)
+    receiver.start()
+    
+    journal = JournalHandler(socket_path=path)
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    handler = DeferredQueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, journal)
+    listener.start()
+    log = make_logger('bench.journal', handler)
+    
+    p99 = report("Queue -> journald-Socket", time_calls(log, records))
+    log.error("Bild defekt:\nzweite Zeile", extra={'error_hash': '0123456789ab', 'image_path': '/tmp/x.jpg'})
+    log.warning("x" * 400000)  # Größer als ein Datagramm -> memfd
+    listener.stop()
+    
+    deadline = time.monotonic() + 5
+    expected = records - handler.dropped + 2
+    while len(entries) < expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+    stop.set()
+    receiver.join()
+    server.close()
+    journal.close()
+    os.unlink(path)
+    os.rmdir(directory)
+    
+    print(f"{'':34s} {len(entries)} Einträge empfangen, {handler.dropped} verworfen, "
+          f"{journal.failed} Sendefehler")
+    problems = []
+    if len(entries) != expected:
+        problems.append(f"{len(entries)} statt {expected} Journal-Einträge")
+    if entries and (entries[0].get('PRIORITY') != '6' or entries[0].get('SYSLOG_IDENTIFIER') != 'raspi-app'):
+        problems.append("Felder PRIORITY/SYSLOG_IDENTIFIER fehlen")
+    error = next((e for e in entries if e.get('PRIORITY') == '3'), {})
+    if error.get('MESSAGE') != "Bild defekt:\nzweite Zeile" or error.get('ERROR_HASH') != '0123456789ab' \
+            or error.get('IMAGE_PATH') != '/tmp/x.jpg':
+        problems.append("Mehrzeilige Meldung oder ERROR_HASH/IMAGE_PATH falsch")
+    if not any(len(e.get('MESSAGE', '')) == 400000 for e in entries):
+        problems.append("Übergroßer Eintrag (memfd) fehlt")
+    return p99, problems
+
+
+def bench_filtered(records: int):
+    log = make_logger('bench.filtered', logging.NullHandler())
+    image = Image()
+    
+    start = time.perf_counter_ns()
+    for i in range(records):
+        log.debug(f"Zeige Bild: {image.name} ({i} von {records})")
+    fstring = (time.perf_counter_ns() - start) / records
+    
+    start = time.perf_counter_ns()
+    for i in range(records):
+        log.debug("Zeige Bild: %s (%d von %d)", image.name, i, records)
+    lazy = (time.perf_counter_ns() - start) / records
+    
+    print(f"{'Gefiltertes debug mit f-String':34s} {fstring:8.0f} ns")
+    print(f"{'Gefiltertes debug mit %-Argumenten':34s} {lazy:8.0f} ns")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Logging-Kosten im Tk-Thread')
+    parser.add_argument('--records', type=int, default=20000, help='Meldungen pro Messung (Standard: 20000)')
+    parser.add_argument('--sink-delay-ms', type=float, default=1.0,
+                        help='Blockierzeit der langsamen Ausgabe pro Zeile (Standard: 1)')
+    parser.add_argument('--queue-size', type=int, default=10000, help='Größe der Log-Queue (Standard: 10000)')
+    parser.add_argument('--max-p99-us', type=float, default=50.0,
+                        help='Obergrenze für einen Aufruf über die Queue im p99 (Standard: 50)')
+    args = parser.parse_args()
+    
+    delay = args.sink_delay_ms / 1000.0
+    slow_records = min(args.records, 2000)  # Direktes Schreiben blockiert pro Zeile
+    
+    print("\n" + "="*60)
+    print("📝 LOGGING-BENCHMARK (Kosten im aufrufenden Thread)")
+    print("="*60)
+    print(f"{args.records} Meldungen, Queue {args.queue_size}\n")
+    
+    bench_sync(args.records, 0.0)
+    bench_sync(slow_records, delay)
+    p99_fast = bench_queue(args.records, 0.0, args.queue_size)
+    p99_slow = bench_queue(args.records, delay, args.queue_size)
+    p99_journal, problems = bench_journal(args.records, args.queue_size)
+    print()
+    bench_filtered(args.records)
+    
+    print("\n" + "="*60)
+    worst = max(p99_fast, p99_slow, p99_journal)
+    if worst > args.max_p99_us:
+        problems.append(f"Queue p99 {worst:.1f} µs > {args.max_p99_us:g} µs")
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        print("="*60 + "\n")
+        sys.exit(1)
+    print(f"✅ Queue p99 {worst:.1f} µs <= {args.max_p99_us:g} µs, auch bei langsamer Ausgabe")
+    print("✅ journald-Format geprüft (Felder, mehrzeilig, memfd)")
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PIR-Sensor Flankenerkennung vs. Polling
+Misst Reaktions-Latenz und CPU-Verbrauch mit dem Mock-GPIO-Backend
+(läuft auf jedem Linux-Rechner, kein Raspberry Pi nötig)
+"""
+
+import sys
+import time
+import threading
+import argparse
+import statistics
+from pathlib import Path
+
+# Füge src zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from app.gpio_backend import MockGPIOBackend
+from app.pir_sensor import PIRSensor
+
+PIN = 4
+
+
+def run_case(use_interrupts: bool, edges: int, idle_seconds: float):
+    """Führt einen Messdurchlauf aus und gibt (Latenzen, CPU-Sekunden) zurück"""
+    backend = MockGPIOBackend(edge_detection=use_interrupts)
+    reported = threading.Event()
+    latencies = []
+    
+    def callback(motion: bool):
+        latencies.append(time.perf_counter() - backend.last_edge_time[PIN])
+        reported.set()
+    
+    sensor = PIRSensor(PIN, callback=callback, backend=backend,
+                       use_interrupts=use_interrupts, debounce_ms=0)
+    sensor.start_monitoring()
+    
+    # Latenz: abwechselnd steigende und fallende Flanken
+    for i in range(edges):
+        reported.clear()
+        backend.set_level(PIN, (i + 1) % 2)
+        reported.wait(timeout=1)
+        time.sleep(0.02)
+    
+    # CPU-Verbrauch im Leerlauf (keine Bewegung)
+    backend.set_level(PIN, 0)
+    time.sleep(0.2)
+    cpu_start = time.process_time()
+    time.sleep(idle_seconds)
+    cpu_idle = time.process_time() - cpu_start
+    
+    sensor.cleanup()
+    return sensor.mode, latencies, cpu_idle
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PIR-Sensor Latenz-/CPU-Benchmark')
+    parser.add_argument('--edges', type=int, default=50, help='Anzahl Flanken (Standard: 50)')
+    parser.add_argument('--idle', type=float, default=5.0, help='Leerlauf-Messdauer in Sekunden')
+    args = parser.parse_args()
+    
+    print("\n" + "="*60)
+    print("⏱️  PIR-SENSOR BENCHMARK (Mock-GPIO)")
+    print("="*60 + "\n")
+    
+    for use_interrupts in (True, False):
+        mode, latencies, cpu_idle = run_case(use_interrupts, args.edges, args.idle)
+        latencies_ms = sorted(l * 1000 for l in latencies)
+        print(f"Modus: {mode}")
+        if latencies_ms:
+            p95 = latencies_ms[int(len(latencies_ms) * 0.95) - 1]
+            print(f"  Latenz Median: {statistics.median(latencies_ms):8.2f} ms")
+            print(f"  Latenz p95:    {p95:8.2f} ms")
+            print(f"  Latenz max:    {latencies_ms[-1]:8.2f} ms")
+        print(f"  CPU im Leerlauf: {cpu_idle * 1000:.1f} ms in {args.idle:.0f} s")
+        print()
+    
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
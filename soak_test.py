@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Soak-Test: viele Wochen Betrieb im Zeitraffer
+Treibt Start/Stop-Zyklen wie über ESC/START, tausende Bildwechsel und
+Sensor-Events mit virtueller Uhr durch die echte Anwendung. Überwacht
+RSS, tracemalloc, offene Dateien, Threads und Tk-Objekte und schlägt
+fehl, wenn sie über die Schwellen hinaus wachsen.
+Benötigt ein DISPLAY (z.B. xvfb-run). Konfiguration und Daten landen
+in einem temporären HOME, der Bildschirm wird nicht geschaltet.
+
+Beispiele:
+  xvfb-run python3 soak_test.py
+  xvfb-run python3 soak_test.py --days 56 --cycles 200
+  xvfb-run python3 soak_test.py --mode time_pir --max-rss-growth-mb 5
+"""
+
+import os
+import sys
+import gc
+import time
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+# Eigenes HOME, damit config.json, Event- und Energie-Daten unberührt bleiben
+SOAK_HOME = tempfile.mkdtemp(prefix='soak-home-')
+os.environ['HOME'] = SOAK_HOME
+
+# Füge src zum Path hinzu
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import tkinter as tk
+from PIL import Image
+
+from app import main as app_main
+from app import slideshow_window
+from app.display_policy import VirtualClock
+from app.event_bus import MotionEvent
+from app.screen_control import ScreenController
+from app.utils import get_rss_bytes
+
+
+class NullScreenController(ScreenController):
+    """Bildschirm-Steuerung ohne Backends (schaltet nichts)"""
+    
+    def __init__(self, *args, **kwargs):
+        kwargs['backends'] = []
+        super().__init__(*args, **kwargs)
+
+
+def create_images(folder: Path, count: int = 8):
+    """Erstellt einfache Testbilder"""
+    for i in range(count):
+        Image.new('RGB', (1280, 720), (30 * i, 90, 150)).save(folder / f"soak-{i}.png")
+
+
+def count_widgets(widget: tk.Misc) -> int:
+    """Anzahl Tk-Widgets unterhalb von widget (inklusive)"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def take_sample(root: tk.Tk) -> Dict[str, float]:
+    """Misst die überwachten Ressourcen"""
+    gc.collect()
+    return {
+        'rss_mb': get_rss_bytes() / 1e6,
+        'heap_mb': tracemalloc.get_traced_memory()[0] / 1e6 if tracemalloc.is_tracing() else 0.0,
+        'fds': len(os.listdir('/proc/self/fd')),
+        'threads': threading.active_count(),
+        'widgets': count_widgets(root),
+        'images': len(root.tk.splitlist(root.tk.call('image', 'names'))),
+        'after': len(root.tk.splitlist(root.tk.call('after', 'info'))),
+    }
+
+
+def run_cycle(app, root: tk.Tk, clock: VirtualClock, rng: random.Random,
+              seconds: float, args) -> Dict[str, int]:
+    """Ein Start/Stop-Zyklus über `seconds` virtuelle Sekunden"""
+    app._start_slideshow()
+    window = app.slideshow_window
+    window.clock = clock.time
+    window.time_controller.clock = clock.datetime
+    window.last_motion_time = clock.time()
+    window.current_image_time = 0
+    
+    slides = 0
+    arrivals = 0
+    last_image_time = window.current_image_time
+    motion_until = None
+    next_arrival = clock.time() + rng.expovariate(1.0 / args.arrival_interval)
+    end = clock.time() + seconds
+    
+    while clock.time() < end:
+        clock.set(clock.time() + args.tick)
+        now = clock.time()
+        
+        # Besucher: Bewegung für einige Sekunden, dann wieder Ruhe
+        if motion_until is not None and now >= motion_until:
+            window.event_bus.publish(MotionEvent(timestamp=now, motion=False))
+            motion_until = None
+        if now >= next_arrival:
+            window.event_bus.publish(MotionEvent(timestamp=now, motion=True))
+            motion_until = now + rng.uniform(5, 60)
+            next_arrival = now + rng.expovariate(1.0 / args.arrival_interval)
+            arrivals += 1
+        
+        window._apply_policy()
+        root.update()
+        
+        if window.current_image_time != last_image_time:
+            last_image_time = window.current_image_time
+            slides += 1
+    
+    app._stop_slideshow()
+    root.update()
+    return {'slides': slides, 'arrivals': arrivals}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soak-Test mit virtueller Uhr und Leck-Erkennung')
+    parser.add_argument('--days', type=float, default=28, help='Simulierte Betriebsdauer (Standard: 28)')
+    parser.add_argument('--cycles', type=int, default=100, help='Start/Stop-Zyklen (Standard: 100)')
+    parser.add_argument('--warmup', type=int, default=3, help='Zyklen vor der Referenzmessung (Standard: 3)')
+    parser.add_argument('--mode', choices=['pir', 'time', 'continuous', 'time_pir'], default='pir',
+                        help='Display-Modus (Standard: pir)')
+    parser.add_argument('--tick', type=float, default=10.0, help='Virtuelle Sekunden pro Update (Standard: 10)')
+    parser.add_argument('--image-duration', type=int, default=300,
+                        help='Virtuelle Sekunden pro Bild (Standard: 300)')
+    parser.add_argument('--arrival-interval', type=float, default=900.0,
+                        help='Mittlerer Abstand zwischen Besuchern in Sekunden (Standard: 900)')
+    parser.add_argument('--seed', type=int, default=1, help='Zufallsstartwert')
+    parser.add_argument('--max-rss-growth-mb', type=float, default=10.0, help='Erlaubtes RSS-Wachstum')
+    parser.add_argument('--max-heap-growth-mb', type=float, default=2.0, help='Erlaubtes Python-Heap-Wachstum')
+    parser.add_argument('--max-fd-growth', type=int, default=0, help='Erlaubte zusätzliche Dateideskriptoren')
+    parser.add_argument('--max-thread-growth', type=int, default=0, help='Erlaubte zusätzliche Threads')
+    parser.add_argument('--max-widget-growth', type=int, default=0,
+                        help='Erlaubte zusätzliche Tk-Objekte (Widgets, Images, after)')
+    parser.add_argument('--no-tracemalloc', action='store_true', help='Ohne tracemalloc (schneller)')
+    parser.add_argument('--verbose', action='store_true', help='Log-Ausgaben der Anwendung anzeigen')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    # Bildschirm bleibt während des Tests unberührt
+    slideshow_window.ScreenController = NullScreenController
+    
+    image_dir = Path(SOAK_HOME) / 'images'
+    image_dir.mkdir()
+    create_images(image_dir)
+    
+    app = app_main.EntranceDisplayApp()
+    app.sensor_detector.is_pir_available = lambda pin=4: True
+    app.config_manager.update(
+        display_mode=args.mode,
+        image_folder=str(image_dir),
+        image_duration=args.image_duration,
+        fullscreen=False,
+        autostart=False,
+        show_sensor_status=False
+    )
+    if not app.setup():
+        print("❌ Setup fehlgeschlagen")
+        sys.exit(1)
+    root = app.root
+    
+    print("\n" + "="*60)
+    print("🧪 SOAK-TEST")
+    print("="*60)
+    print(f"Modus: {args.mode}, {args.days:g} Tage in {args.cycles} Zyklen, Tick {args.tick:g}s\n")
+    
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    
+    clock = VirtualClock(time.time())
+    rng = random.Random(args.seed)
+    seconds_per_cycle = args.days * 86400.0 / args.cycles
+    
+    totals = {'slides': 0, 'arrivals': 0}
+    baseline = None
+    baseline_snapshot = None
+    samples: List[Dict[str, float]] = []
+    wall_start = time.monotonic()
+    
+    print(f"{'Zyklus':>6s} {'RSS MB':>8s} {'Heap MB':>8s} {'FDs':>5s} {'Threads':>8s} "
+          f"{'Widgets':>8s} {'Images':>7s} {'after':>6s}")
+    for cycle in range(1, args.cycles + 1):
+        result = run_cycle(app, root, clock, rng, seconds_per_cycle, args)
+        for key in totals:
+            totals[key] += result[key]
+        
+        sample = take_sample(root)
+        samples.append(sample)
+        if cycle == args.warmup:
+            baseline = sample
+            if tracemalloc.is_tracing():
+                baseline_snapshot = tracemalloc.take_snapshot()
+        if cycle == 1 or cycle == args.warmup or cycle % max(1, args.cycles // 10) == 0:
+            print(f"{cycle:6d} {sample['rss_mb']:8.1f} {sample['heap_mb']:8.2f} {sample['fds']:5d} "
+                  f"{sample['threads']:8d} {sample['widgets']:8d} {sample['images']:7d} {sample['after']:6d}")
+    
+    wall = time.monotonic() - wall_start
+    final = samples[-1]
+    baseline = baseline or samples[0]
+    print(f"\nBildwechsel: {totals['slides']}, Besucher: {totals['arrivals']}, "
+          f"Dauer: {wall:.0f}s ({args.days * 86400 / wall:,.0f}x Echtzeit)")
+    
+    if baseline_snapshot is not None:
+        print("\nGrößte Zuwächse seit der Referenzmessung (tracemalloc):")
+        for stat in tracemalloc.take_snapshot().compare_to(baseline_snapshot, 'lineno')[:10]:
+            print(f"  {stat}")
+    
+    limits = [
+        ('rss_mb', args.max_rss_growth_mb, 'RSS (MB)'),
+        ('heap_mb', args.max_heap_growth_mb, 'Python-Heap (MB)'),
+        ('fds', args.max_fd_growth, 'Dateideskriptoren'),
+        ('threads', args.max_thread_growth, 'Threads'),
+        ('widgets', args.max_widget_growth, 'Tk-Widgets'),
+        ('images', args.max_widget_growth, 'Tk-Images'),
+        ('after', args.max_widget_growth, 'Tk-after-Aufträge'),
+    ]
+    failures = []
+    print("\nWachstum seit Zyklus", args.warmup)
+    for key, limit, label in limits:
+        growth = final[key] - baseline[key]
+        ok = growth <= limit
+        print(f"  {'✅' if ok else '❌'} {label:20s} {baseline[key]:10.2f} -> {final[key]:10.2f} "
+              f"({growth:+.2f}, erlaubt {limit:g})")
+        if not ok:
+            failures.append(label)
+    
+    app.cleanup()  # Schließt auch das Tk-Hauptfenster
+    shutil.rmtree(SOAK_HOME, ignore_errors=True)
+    
+    print("\n" + "="*60)
+    if failures:
+        print(f"❌ Leck-Verdacht: {', '.join(failures)}")
+        print("="*60 + "\n")
+        sys.exit(1)
+    print("✅ Keine Lecks gefunden")
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
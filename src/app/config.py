@@ -4,21 +4,42 @@ Konfigurationsverwaltung für die Raspberry Pi Eingangsbereich App
 """
 
 import os
+import re
 import json
+import logging
 from pathlib import Path
-from typing import Dict, Any
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Any, FrozenSet, List, Optional
+from dataclasses import dataclass, asdict, field, fields
 
 # Pfade
 APP_NAME = 'raspi-app'
 APP_DIR = Path('/opt') / APP_NAME
 CONFIG_DIR = Path.home() / '.config' / APP_NAME
 CONFIG_FILE = CONFIG_DIR / 'config.json'
+DATA_DIR = Path.home() / '.local' / 'share' / APP_NAME
 LOG_DIR = Path('/var/log')
 SERVICE_FILE = Path('/etc/systemd/system') / f'{APP_NAME}.service'
+# Verzeichnisse werden erst beim Schreiben angelegt (save(), Event-Speicher usw.)
 
-# Stelle sicher, dass Config-Verzeichnis existiert
-CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+logger = logging.getLogger(__name__)
+
+DISPLAY_MODES = ["pir", "time", "continuous", "time_pir"]
+SENSOR_LOGICS = ["or", "and", "priority"]
+TIME_PATTERN = re.compile(r'^([01]?\d|2[0-3]):[0-5]\d$')
+
+# Felder für die Typprüfung in validate() (bei Hot-Reload ohne GUI von Hand bearbeitet)
+BOOL_FIELDS = ('pir_use_interrupts', 'record_events', 'predictive_wake', 'random_order', 'autostart',
+               'fullscreen', 'hide_cursor', 'deep_idle', 'resume_last_frame', 'debug_mode', 'show_sensor_status')
+STRING_FIELDS = ('gpio_chip', 'motion_trace_file', 'image_folder')
+
+
+def _is_number(value: Any) -> bool:
+    """int oder float, aber kein bool"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_pin(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 27
 
 
 @dataclass
@@ -35,6 +56,19 @@ class AppConfig:
     # PIR Sensor (nur wenn display_mode == "pir")
     pir_pin: int = 4  # GPIO Pin für PIR Sensor
     screen_timeout: int = 120  # Sekunden bis Bildschirm ausgeht (2 Minuten)
+    pir_use_interrupts: bool = True  # Flankenerkennung statt 100ms-Polling
+    pir_debounce_ms: int = 50  # Software-Entprellung des Sensors
+    # Mehrere Sensoren (z.B. großes Foyer): leer = nur pir_pin verwenden
+    pir_pins: List[int] = field(default_factory=list)
+    sensor_logic: str = "or"  # "or", "and", "priority" (erster Pin = höchste Priorität)
+    gpio_chip: str = "/dev/gpiochip0"  # GPIO-Character-Device für mehrere Sensoren
+    motion_trace_file: str = ""  # Bewegungs-Flanken aufzeichnen (leer = aus), siehe app.replay
+    record_events: bool = True  # Bewegung/Bildschirm/Bilder im Event-Speicher ablegen (./event-query)
+    # Vorausschauendes Einschalten anhand gelernter Besuchszeiten (pir/time_pir)
+    predictive_wake: bool = False
+    predictive_min_timeout: int = 30  # Verkürzter Timeout in Zeiten ohne Besucher
+    predictive_hot_threshold: float = 0.6  # Ab dieser Wahrscheinlichkeit Bildschirm warm halten
+    predictive_dead_threshold: float = 0.05  # Bis zu dieser Wahrscheinlichkeit Timeout verkürzen
     
     # Zeitsteuerung (nur wenn display_mode == "time")
     work_start_time: str = "08:00"  # Arbeitsbeginn
@@ -51,20 +85,50 @@ class AppConfig:
     autostart: bool = True
     fullscreen: bool = True
     hide_cursor: bool = True  # Mauszeiger in Slideshow verstecken
+    display_watts_on: float = 30.0  # Leistung des Bildschirms im Betrieb (für Energie-Schätzung)
+    display_watts_standby: float = 0.5  # Leistung im Standby
+    deep_idle: bool = True  # Bei ausgeschaltetem Bildschirm Bilder freigeben und Update-Schleife anhalten
+    resume_last_frame: bool = True  # Letztes Bild beim Start sofort zeigen und dort weitermachen
+    last_frame_interval: int = 3600  # Sekunden zwischen Sicherungen des letzten Bildes (0 = nur beim Beenden)
     
     # Debug
     debug_mode: bool = False
+    log_levels: Dict[str, str] = field(default_factory=dict)  # Logger -> Level, z.B. {"app.slideshow_window": "DEBUG"}
     show_sensor_status: bool = True
     
     # Version
     version: str = "1.4.0"
 
 
+@dataclass(frozen=True)
+class ConfigDiff:
+    """Unterschied zwischen zwei Konfigurationen"""
+    
+    old: AppConfig
+    new: AppConfig
+    changed: FrozenSet[str]
+    
+    @classmethod
+    def between(cls, old: AppConfig, new: AppConfig) -> 'ConfigDiff':
+        """Vergleicht alle Felder"""
+        changed = frozenset(f.name for f in fields(AppConfig)
+                            if getattr(old, f.name) != getattr(new, f.name))
+        return cls(old, new, changed)
+    
+    def touches(self, *names: str) -> bool:
+        """True wenn mindestens eines der Felder geändert wurde"""
+        return not self.changed.isdisjoint(names)
+    
+    def __bool__(self) -> bool:
+        return bool(self.changed)
+
+
 class ConfigManager:
     """Verwaltet die Konfiguration"""
     
     def __init__(self):
         self.config = self.load()
+        self._watcher = None
     
     def load(self) -> AppConfig:
         """Lädt die Konfiguration aus der Datei"""
@@ -86,8 +150,12 @@ class ConfigManager:
         """Speichert die Konfiguration in die Datei"""
         try:
             CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+            # Atomar ersetzen, damit Leser (und die Überwachung) nie eine halbe Datei sehen
+            tmp_file = CONFIG_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(asdict(config), f, indent=2)
+            os.replace(tmp_file, CONFIG_FILE)
+            self.config = config
             return True
         except Exception as e:
             print(f"Fehler beim Speichern der Konfiguration: {e}")
@@ -114,4 +182,103 @@ class ConfigManager:
         Returns:
             True wenn gültig
         """
-        return mode in ["pir", "time", "continuous", "time_pir"]
+        return mode in DISPLAY_MODES
+    
+    def validate(self, config: AppConfig) -> List[str]:
+        """
+        Prüft eine Konfiguration auf unzulässige Werte
+        
+        Returns:
+            Fehlerbeschreibungen (leer wenn gültig)
+        """
+        errors = []
+        if not self.validate_display_mode(config.display_mode):
+            errors.append(f"display_mode '{config.display_mode}' unbekannt")
+        for name in ('work_start_time', 'work_end_time'):
+            value = getattr(config, name)
+            if not isinstance(value, str) or not TIME_PATTERN.match(value):
+                errors.append(f"{name} '{value}' ist keine Uhrzeit (HH:MM)")
+        for name in ('screen_timeout', 'image_duration', 'predictive_min_timeout'):
+            value = getattr(config, name)
+            if not _is_number(value) or value <= 0:
+                errors.append(f"{name} muss eine positive Zahl sein")
+        for name in ('pir_debounce_ms', 'last_frame_interval', 'display_watts_on', 'display_watts_standby'):
+            value = getattr(config, name)
+            if not _is_number(value) or value < 0:
+                errors.append(f"{name} muss eine Zahl >= 0 sein")
+        for name in ('predictive_hot_threshold', 'predictive_dead_threshold'):
+            value = getattr(config, name)
+            if not _is_number(value) or not 0 <= value <= 1:
+                errors.append(f"{name} muss zwischen 0 und 1 liegen")
+        if _is_number(config.predictive_hot_threshold) and _is_number(config.predictive_dead_threshold) \
+                and config.predictive_dead_threshold > config.predictive_hot_threshold:
+            errors.append("predictive_dead_threshold darf nicht größer als predictive_hot_threshold sein")
+        for name in BOOL_FIELDS:
+            if not isinstance(getattr(config, name), bool):
+                errors.append(f"{name} muss true oder false sein")
+        for name in STRING_FIELDS:
+            if not isinstance(getattr(config, name), str):
+                errors.append(f"{name} muss ein Text sein")
+        if not isinstance(config.pir_pins, list):
+            errors.append("pir_pins muss eine Liste von GPIO-Pins sein")
+        elif not _is_pin(config.pir_pin) or not all(_is_pin(pin) for pin in config.pir_pins):
+            errors.append("GPIO-Pins müssen ganze Zahlen zwischen 0 und 27 sein")
+        if config.sensor_logic not in SENSOR_LOGICS:
+            errors.append(f"sensor_logic '{config.sensor_logic}' unbekannt")
+        if not isinstance(config.log_levels, dict) or \
+                not all(isinstance(k, str) and isinstance(v, str) for k, v in config.log_levels.items()):
+            errors.append("log_levels muss ein Objekt sein (Logger -> Level)")
+        return errors
+    
+    def reload(self) -> Optional[ConfigDiff]:
+        """
+        Liest config.json neu und übernimmt gültige Änderungen
+        
+        Returns:
+            Die Änderungen, oder None wenn nichts geändert wurde oder die
+            Datei ungültig ist (dann bleibt die bisherige Konfiguration aktiv)
+        """
+        try:
+            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                config = AppConfig(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"config.json nicht übernommen: {e}")
+            return None
+        
+        errors = self.validate(config)
+        if errors:
+            logger.warning(f"config.json nicht übernommen: {'; '.join(errors)}")
+            return None
+        
+        diff = ConfigDiff.between(self.config, config)
+        if not diff:
+            return None
+        self.config = config
+        logger.info(f"config.json neu geladen: {', '.join(sorted(diff.changed))}")
+        return diff
+    
+    def start_watching(self, on_change: Callable[[ConfigDiff], None], debounce: float = 0.5):
+        """
+        Überwacht config.json und meldet gültige Änderungen
+        
+        Args:
+            on_change: Erhält den Diff (läuft im Watcher-Thread)
+            debounce: Ruhezeit nach der letzten Änderung in Sekunden
+        """
+        if self._watcher is not None:
+            return
+        from .config_watch import FileWatcher
+        
+        def changed():
+            diff = self.reload()
+            if diff:
+                on_change(diff)
+        
+        self._watcher = FileWatcher(CONFIG_FILE, changed, debounce=debounce)
+        self._watcher.start()
+    
+    def stop_watching(self):
+        """Beendet die Überwachung von config.json"""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
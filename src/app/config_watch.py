@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Überwachung einer Datei auf Änderungen (inotify per ctypes)
+Ohne inotify wird die Änderungszeit regelmäßig geprüft.
+"""
+
+import os
+import time
+import struct
+import select
+import logging
+import threading
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# inotify-Masken (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event: wd, mask, cookie, len (danach der Name)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _inotify_open(directory: Path) -> Optional[int]:
+    """Öffnet eine inotify-Instanz für das Verzeichnis (None wenn nicht verfügbar)"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError) as e:
+        logger.debug(f"inotify nicht verfügbar: {e}")
+        return None
+    if fd < 0:
+        logger.debug(f"inotify_init1 fehlgeschlagen: {os.strerror(ctypes.get_errno())}")
+        return None
+    
+    # Das Verzeichnis überwachen: Editoren ersetzen Dateien oft per rename
+    if libc.inotify_add_watch(fd, os.fsencode(str(directory)), WATCH_MASK) < 0:
+        logger.debug(f"inotify_add_watch fehlgeschlagen: {os.strerror(ctypes.get_errno())}")
+        os.close(fd)
+        return None
+    return fd
+
+
+class FileWatcher:
+    """
+    Ruft einen Callback auf, wenn sich eine Datei geändert hat
+    
+    Mehrere Änderungen kurz hintereinander (Editor speichert in Etappen)
+    werden zusammengefasst: der Callback läuft erst, wenn die Datei
+    debounce Sekunden lang unverändert war. Er läuft im Watcher-Thread.
+    """
+    
+    def __init__(self, path: Union[str, Path], callback: Callable[[], None],
+                 debounce: float = 0.5, poll_interval: float = 2.0):
+        """
+        Args:
+            path: Überwachte Datei (das Verzeichnis muss existieren)
+            callback: Wird nach einer Änderung aufgerufen
+            debounce: Ruhezeit nach der letzten Änderung in Sekunden
+            poll_interval: Prüfabstand, falls inotify nicht verfügbar ist
+        """
+        self.path = Path(path)
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.mode = "none"  # "inotify" oder "polling"
+        self.changes = 0
+        
+        self._inotify_fd: Optional[int] = None
+        self._stop_r: Optional[int] = None
+        self._stop_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Startet die Überwachung"""
+        if self._thread is not None:
+            return
+        
+        self._inotify_fd = _inotify_open(self.path.parent)
+        self.mode = "inotify" if self._inotify_fd is not None else "polling"
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = threading.Thread(target=self._watch_loop, name="config-watch", daemon=True)
+        self._thread.start()
+        logger.info(f"Überwache {self.path} (Modus: {self.mode})")
+    
+    def stop(self):
+        """Beendet die Überwachung"""
+        if self._thread is None:
+            return
+        try:
+            os.write(self._stop_w, b'\0')
+        except OSError:
+            pass
+        self._thread.join(timeout=2)
+        self._thread = None
+        
+        for fd in (self._inotify_fd, self._stop_r, self._stop_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._inotify_fd = self._stop_r = self._stop_w = None
+    
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _watch_loop(self):
+        """Wartet auf Änderungen und ruft nach der Ruhezeit den Callback auf"""
+        fds = [self._stop_r]
+        if self._inotify_fd is not None:
+            fds.append(self._inotify_fd)
+        last_mtime = self._mtime()
+        deadline: Optional[float] = None
+        
+        while True:
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            else:
+                timeout = None if self._inotify_fd is not None else self.poll_interval
+            
+            readable, _, _ = select.select(fds, [], [], timeout)
+            if self._stop_r in readable:
+                break
+            
+            changed = False
+            if self._inotify_fd in readable:
+                changed = self._read_inotify()
+            elif self._inotify_fd is None:
+                mtime = self._mtime()
+                changed = mtime != last_mtime
+                last_mtime = mtime
+            
+            if changed:
+                deadline = time.monotonic() + self.debounce
+            elif deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                self.changes += 1
+                try:
+                    self.callback()
+                except Exception as e:
+                    logger.error(f"Fehler beim Verarbeiten der Änderung an {self.path.name}: {e}")
+    
+    def _read_inotify(self) -> bool:
+        """Liest wartende inotify-Events, True wenn die Datei betroffen ist"""
+        name = os.fsencode(self.path.name)
+        hit = False
+        while True:
+            try:
+                data = os.read(self._inotify_fd, 4096)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                logger.error(f"Lesen der inotify-Events fehlgeschlagen: {e}")
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                if data[offset:offset + length].rstrip(b'\0') == name:
+                    hit = True
+                offset += length
+        return hit
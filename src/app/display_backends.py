@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Backends zum Ein-/Ausschalten des Bildschirms ohne Subprozesse
+Welche Methoden funktionieren, wird einmal ermittelt und zwischengespeichert.
+"""
+
+import os
+import json
+import shutil
+import logging
+import platform
+import subprocess
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+
+from .config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+BACKEND_CACHE_FILE = DATA_DIR / 'display_backends.json'
+BACKEND_CACHE_VERSION = 1
+
+BACKLIGHT_DIR = Path('/sys/class/backlight')
+
+# DPMS-Stufen (X11/extensions/dpmsconst.h)
+DPMS_MODE_ON = 0
+DPMS_MODE_OFF = 3
+
+# bl_power-Werte (FB_BLANK_UNBLANK / FB_BLANK_POWERDOWN)
+BL_POWER_ON = 0
+BL_POWER_OFF = 4
+
+
+class DisplayBackend:
+    """Basisklasse für eine Methode zum Schalten des Bildschirms"""
+    
+    name = "none"
+    forks = False  # Startet einen Prozess pro Aufruf
+    
+    def available(self) -> bool:
+        """Schnelle Prüfung ob die Methode hier nutzbar ist (öffnet Ressourcen)"""
+        return False
+    
+    def probe(self) -> bool:
+        """Gründliche Prüfung beim ersten Start (darf langsamer sein)"""
+        return self.available()
+    
+    def set_power(self, on: bool) -> bool:
+        """Schaltet den Bildschirm, True bei Erfolg"""
+        raise NotImplementedError
+    
+    def get_power(self) -> Optional[bool]:
+        """Liest den tatsächlichen Zustand (None = nicht unterstützt)"""
+        return None
+    
+    def close(self):
+        """Gibt Ressourcen frei"""
+
+
+class X11DPMSBackend(DisplayBackend):
+    """DPMS über libX11/libXext per ctypes (ersetzt 'xset dpms force')"""
+    
+    name = "x11_dpms"
+    
+    def __init__(self, display_name: Optional[str] = None):
+        self.display_name = display_name or os.environ.get('DISPLAY')
+        self._x11 = None
+        self._xext = None
+        self._display = None
+    
+    def available(self) -> bool:
+        if self._display:
+            return True
+        if not self.display_name:
+            return False
+        try:
+            x11_path = ctypes.util.find_library('X11')
+            xext_path = ctypes.util.find_library('Xext')
+            if not x11_path or not xext_path:
+                return False
+            self._x11 = ctypes.CDLL(x11_path)
+            self._xext = ctypes.CDLL(xext_path)
+        except OSError as e:
+            logger.debug(f"X11-Bibliotheken nicht ladbar: {e}")
+            return False
+        
+        self._x11.XOpenDisplay.restype = ctypes.c_void_p
+        self._x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._x11.XFlush.argtypes = [ctypes.c_void_p]
+        self._x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self._xext.DPMSCapable.argtypes = [ctypes.c_void_p]
+        self._xext.DPMSEnable.argtypes = [ctypes.c_void_p]
+        self._xext.DPMSForceLevel.argtypes = [ctypes.c_void_p, ctypes.c_ushort]
+        self._xext.DPMSInfo.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_ushort),
+                                        ctypes.POINTER(ctypes.c_ubyte)]
+        
+        # Eigene Verbindung, damit Tk's Verbindung nicht mitbenutzt wird
+        display = self._x11.XOpenDisplay(self.display_name.encode())
+        if not display:
+            return False
+        if not self._xext.DPMSCapable(display):
+            self._x11.XCloseDisplay(display)
+            return False
+        self._display = display
+        return True
+    
+    def set_power(self, on: bool) -> bool:
+        if not self._display and not self.available():
+            return False
+        # DPMSForceLevel erfordert aktiviertes DPMS (sonst BadMatch)
+        self._xext.DPMSEnable(self._display)
+        self._xext.DPMSForceLevel(self._display, DPMS_MODE_ON if on else DPMS_MODE_OFF)
+        self._x11.XFlush(self._display)
+        return True
+    
+    def get_power(self) -> Optional[bool]:
+        if not self._display:
+            return None
+        level = ctypes.c_ushort()
+        enabled = ctypes.c_ubyte()
+        if not self._xext.DPMSInfo(self._display, ctypes.byref(level), ctypes.byref(enabled)):
+            return None
+        # Ohne aktiviertes DPMS bleibt der Bildschirm an
+        return not enabled.value or level.value == DPMS_MODE_ON
+    
+    def close(self):
+        if self._display:
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+
+class BacklightBackend(DisplayBackend):
+    """Hintergrundbeleuchtung über sysfs (z.B. offizielles Pi-Touchdisplay)"""
+    
+    name = "backlight"
+    
+    def __init__(self, device: Optional[Path] = None):
+        self.device = device
+        self._power_file: Optional[Path] = None
+    
+    def available(self) -> bool:
+        candidates = [self.device] if self.device else sorted(BACKLIGHT_DIR.glob('*'))
+        for device in candidates:
+            power_file = device / 'bl_power'
+            if power_file.exists() and os.access(power_file, os.W_OK):
+                self._power_file = power_file
+                return True
+        return False
+    
+    def set_power(self, on: bool) -> bool:
+        if not self._power_file and not self.available():
+            return False
+        try:
+            with open(self._power_file, 'w') as f:
+                f.write(str(BL_POWER_ON if on else BL_POWER_OFF))
+            return True
+        except OSError as e:
+            logger.error(f"Schreiben nach {self._power_file} fehlgeschlagen: {e}")
+            return False
+    
+    def get_power(self) -> Optional[bool]:
+        if not self._power_file:
+            return None
+        try:
+            with open(self._power_file, 'r') as f:
+                return int(f.read().strip()) == BL_POWER_ON
+        except (OSError, ValueError):
+            return None
+
+
+class VcgencmdBackend(DisplayBackend):
+    """'vcgencmd display_power' (startet einen Prozess pro Befehl - letzte Wahl)"""
+    
+    name = "vcgencmd"
+    forks = True
+    
+    TIMEOUT = 5
+    
+    def available(self) -> bool:
+        return shutil.which('vcgencmd') is not None
+    
+    def probe(self) -> bool:
+        if not self.available():
+            return False
+        try:
+            # Nur abfragen, nicht schalten
+            result = subprocess.run(['vcgencmd', 'display_power'], capture_output=True,
+                                    text=True, timeout=self.TIMEOUT)
+            return result.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+    
+    def set_power(self, on: bool) -> bool:
+        try:
+            result = subprocess.run(['vcgencmd', 'display_power', '1' if on else '0'],
+                                    capture_output=True, text=True, timeout=self.TIMEOUT)
+            return result.returncode == 0
+        except subprocess.TimeoutExpired:
+            logger.error("Timeout bei 'vcgencmd display_power'")
+            return False
+        except OSError as e:
+            logger.error(f"vcgencmd fehlgeschlagen: {e}")
+            return False
+    
+    def get_power(self) -> Optional[bool]:
+        try:
+            result = subprocess.run(['vcgencmd', 'display_power'], capture_output=True,
+                                    text=True, timeout=self.TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        # Ausgabe: "display_power=1"
+        value = result.stdout.strip().rpartition('=')[2]
+        return value == '1' if result.returncode == 0 and value in ('0', '1') else None
+
+
+# Reihenfolge = Priorität
+BACKEND_CLASSES: List[Type[DisplayBackend]] = [X11DPMSBackend, BacklightBackend, VcgencmdBackend]
+BACKENDS_BY_NAME: Dict[str, Type[DisplayBackend]] = {cls.name: cls for cls in BACKEND_CLASSES}
+
+
+def _fingerprint() -> str:
+    """Ändert sich, wenn sich die Hardware-/Sitzungsumgebung ändert"""
+    backlights = ','.join(sorted(p.name for p in BACKLIGHT_DIR.glob('*'))) if BACKLIGHT_DIR.exists() else ''
+    return f"{platform.machine()}|{os.environ.get('DISPLAY', '')}|{backlights}"
+
+
+def _load_cache(cache_file: Path) -> Optional[List[str]]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == BACKEND_CACHE_VERSION and data.get('fingerprint') == _fingerprint():
+            return list(data.get('backends', []))
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _save_cache(cache_file: Path, names: List[str]):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': BACKEND_CACHE_VERSION, 'fingerprint': _fingerprint(), 'backends': names}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"Backend-Cache konnte nicht gespeichert werden: {e}")
+
+
+def detect_backends(cache_file: Optional[Path] = BACKEND_CACHE_FILE) -> List[DisplayBackend]:
+    """
+    Ermittelt die nutzbaren Backends (in Prioritätsreihenfolge)
+    
+    Ein gültiger Cache aus einem früheren Start überspringt die gründliche
+    Prüfung; es wird nur noch geöffnet, was damals funktioniert hat.
+    """
+    cached = _load_cache(cache_file) if cache_file else None
+    if cached is not None:
+        backends = []
+        for name in cached:
+            cls = BACKENDS_BY_NAME.get(name)
+            backend = cls() if cls else None
+            if backend and backend.available():
+                backends.append(backend)
+        if len(backends) == len(cached):
+            logger.info(f"Bildschirm-Backends (Cache): {', '.join(cached) or 'keine'}")
+            return backends
+        for backend in backends:
+            backend.close()
+        logger.info("Bildschirm-Backend-Cache veraltet - prüfe neu")
+    
+    backends = []
+    for cls in BACKEND_CLASSES:
+        backend = cls()
+        if backend.probe():
+            backends.append(backend)
+        else:
+            backend.close()
+    
+    names = [backend.name for backend in backends]
+    logger.info(f"Bildschirm-Backends erkannt: {', '.join(names) or 'keine'}")
+    if cache_file:
+        _save_cache(cache_file, names)
+    return backends
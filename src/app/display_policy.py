@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Entscheidungslogik der Display-Modi ohne Tk
+Eine Tabelle beschreibt pro Modus, was während und außerhalb der
+Arbeitszeit gilt. Die Zeit wird immer übergeben, daher lässt sich die
+Logik mit virtueller Uhr beliebig schnell durchspielen.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, NamedTuple, Optional
+
+# Phasen: was in einem Zeitabschnitt mit dem Bildschirm passiert
+PHASE_ON = 'on'  # Bildschirm an, Dauerschleife
+PHASE_OFF = 'off'  # Bildschirm aus
+PHASE_PIR = 'pir'  # Bewegungsmelder schaltet (Timeout nach letzter Bewegung)
+
+# Gründe für eine Entscheidung
+REASON_NONE = ''
+REASON_SCHEDULE = 'schedule'  # Phase verlangt an/aus
+REASON_TIMEOUT = 'timeout'  # Keine Bewegung innerhalb des Timeouts
+REASON_WARM = 'warm'  # Besucher erwartet, Bildschirm bleibt an
+
+
+class ModeRule(NamedTuple):
+    """Verhalten eines Display-Modus"""
+    work_phase: str  # Phase während der Arbeitszeit
+    off_phase: str  # Phase außerhalb der Arbeitszeit (oder ohne Zeitsteuerung)
+    on_status: str  # Status-Text beim Einschalten durch die Phase
+    off_status: str  # Status-Text beim Ausschalten
+    
+    @property
+    def uses_schedule(self) -> bool:
+        """Arbeitszeit beeinflusst den Modus"""
+        return self.work_phase != self.off_phase
+    
+    @property
+    def uses_pir(self) -> bool:
+        """Bewegungsmelder wird benötigt"""
+        return PHASE_PIR in (self.work_phase, self.off_phase)
+
+
+MODE_TABLE: Dict[str, ModeRule] = {
+    "pir": ModeRule(PHASE_PIR, PHASE_PIR, "", "Bildschirm AUS (Timeout)"),
+    "time": ModeRule(PHASE_ON, PHASE_OFF, "Arbeitszeit - Dauerschleife aktiv", "Feierabend - Bildschirm AUS"),
+    "continuous": ModeRule(PHASE_ON, PHASE_ON, "Dauerschleife aktiv (24/7)", ""),
+    "time_pir": ModeRule(PHASE_ON, PHASE_PIR, "Arbeitszeit - Dauerschleife aktiv",
+                         "Feierabend - PIR aktiv (Bildschirm AUS)"),
+}
+
+
+class Decision(NamedTuple):
+    """Ergebnis einer Auswertung"""
+    screen: Optional[bool]  # True einschalten, False ausschalten, None unverändert
+    advance: bool  # Nächstes Bild anzeigen
+    reason: str = REASON_NONE
+
+
+# Häufigste Ergebnisse ohne Neuanlage
+NO_CHANGE = Decision(None, False)
+ADVANCE = Decision(None, True)
+
+
+class DisplayPolicy:
+    """
+    Entscheidet pro Tick über Bildschirm und Bildwechsel
+    
+    Die Policy hält keinen eigenen Zustand: Bildschirmzustand, letzte
+    Bewegung und letzter Bildwechsel kommen vom Aufrufer.
+    """
+    
+    def __init__(self, mode: str, screen_timeout: float, image_duration: float,
+                 timeout_for: Optional[Callable[[float], Optional[float]]] = None):
+        """
+        Args:
+            mode: Display-Modus (Schlüssel in MODE_TABLE)
+            screen_timeout: Sekunden ohne Bewegung bis zum Ausschalten (PIR-Phase)
+            image_duration: Sekunden pro Bild
+            timeout_for: Liefert den Timeout zum Zeitpunkt (None = warm halten),
+                z.B. PredictiveWake.timeout_for; Standard: screen_timeout
+        """
+        if mode not in MODE_TABLE:
+            raise ValueError(f"Unbekannter Display-Modus: {mode}")
+        self.mode = mode
+        self.rule = MODE_TABLE[mode]
+        self.screen_timeout = screen_timeout
+        self.image_duration = image_duration
+        self.timeout_for = timeout_for
+    
+    @property
+    def uses_schedule(self) -> bool:
+        return self.rule.uses_schedule
+    
+    @property
+    def uses_pir(self) -> bool:
+        return self.rule.uses_pir
+    
+    def phase(self, work_time: bool) -> str:
+        """Aktive Phase"""
+        return self.rule.work_phase if work_time else self.rule.off_phase
+    
+    def evaluate(self, now: float, work_time: bool, screen_on: bool,
+                 last_motion: float, last_advance: float) -> Decision:
+        """
+        Wertet einen Tick aus
+        
+        Args:
+            now: Aktuelle (ggf. virtuelle) Zeit
+            work_time: Arbeitszeit laut Zeitsteuerung (nur relevant wenn uses_schedule)
+            screen_on: Bildschirm ist derzeit an
+            last_motion: Zeitpunkt der letzten Bewegung
+            last_advance: Zeitpunkt des letzten Bildwechsels
+        """
+        phase = self.rule.work_phase if work_time else self.rule.off_phase
+        screen = None
+        reason = REASON_NONE
+        
+        if phase == PHASE_ON:
+            if not screen_on:
+                screen, reason, screen_on = True, REASON_SCHEDULE, True
+        elif phase == PHASE_OFF:
+            if screen_on:
+                screen, reason, screen_on = False, REASON_SCHEDULE, False
+        else:
+            timeout = self.timeout_for(now) if self.timeout_for else self.screen_timeout
+            if timeout is None:
+                reason = REASON_WARM
+                if not screen_on:
+                    screen, screen_on = True, True
+            elif screen_on and now - last_motion > timeout:
+                screen, reason, screen_on = False, REASON_TIMEOUT, False
+        
+        # Bilder wechseln nur bei eingeschaltetem Bildschirm
+        advance = screen_on and now - last_advance >= self.image_duration
+        if screen is None and not reason:
+            return ADVANCE if advance else NO_CHANGE
+        return Decision(screen, advance, reason)
+
+
+class VirtualClock:
+    """Uhr, die nur vom Aufrufer vorgestellt wird (Replays, Simulationen)"""
+    
+    def __init__(self, start: float = 0.0):
+        self.now = start
+    
+    def time(self) -> float:
+        return self.now
+    
+    def datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.now)
+    
+    def set(self, timestamp: float):
+        self.now = max(self.now, timestamp)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Einschaltdauer und geschätzter Energieverbrauch des Bildschirms
+Pro Tag und Display-Modus; Bericht über python3 -m app.energy
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+ENERGY_FILE = DATA_DIR / 'energy.json'
+ENERGY_VERSION = 1
+KEEP_DAYS = 400
+
+# Index in den Tageszählern [beobachtet, an, Schaltvorgänge]
+OBSERVED, ON, TOGGLES = 0, 1, 2
+
+
+class EnergyMeter:
+    """
+    Zählt Einschaltdauer und Schaltvorgänge pro Tag und Modus (thread-sicher)
+    
+    Gespeichert werden nur Tagessummen als kleine JSON-Datei, höchstens
+    alle save_interval Sekunden und beim Schließen.
+    """
+    
+    def __init__(self, path: Optional[Union[str, Path]] = ENERGY_FILE,
+                 watts_on: float = 30.0, watts_standby: float = 0.5,
+                 save_interval: float = 900.0, clock=time.time):
+        """
+        Args:
+            path: JSON-Datei (None = nur im Speicher)
+            watts_on: Leistungsaufnahme des Bildschirms im Betrieb
+            watts_standby: Leistungsaufnahme im Standby
+            save_interval: Mindestabstand zwischen zwei Speichervorgängen (Sekunden)
+            clock: Zeitquelle (austauschbar für Replays)
+        """
+        self.path = Path(path) if path else None
+        self.watts_on = watts_on
+        self.watts_standby = watts_standby
+        self.save_interval = save_interval
+        self.clock = clock
+        
+        self.days: Dict[str, Dict[str, List[float]]] = {}
+        self.mode = "unknown"
+        self.is_on: Optional[bool] = None
+        
+        self._lock = threading.Lock()
+        self._since: Optional[float] = None
+        self._last_save = time.monotonic()
+        self._dirty = False
+        
+        if self.path and self.path.exists():
+            self._load()
+    
+    def set_mode(self, mode: str):
+        """Ordnet die folgende Zeit einem Display-Modus zu"""
+        with self._lock:
+            self._accrue(self.clock())
+            self.mode = mode
+    
+    def record_power(self, on: bool):
+        """Meldet den tatsächlichen Zustand des Bildschirms"""
+        with self._lock:
+            now = self.clock()
+            self._accrue(now)
+            if self.is_on is not None and on != self.is_on:
+                self._bucket(now)[TOGGLES] += 1
+            self.is_on = on
+            self._since = now
+        self._maybe_save()
+    
+    def _bucket(self, timestamp: float) -> List[float]:
+        day = datetime.fromtimestamp(timestamp).date().isoformat()
+        modes = self.days.setdefault(day, {})
+        return modes.setdefault(self.mode, [0.0, 0.0, 0])
+    
+    def _accrue(self, now: float):
+        """Verbucht die Zeit seit der letzten Meldung (Tageswechsel werden geteilt)"""
+        if self._since is None or self.is_on is None:
+            self._since = now
+            return
+        start = self._since
+        while start < now:
+            moment = datetime.fromtimestamp(start)
+            midnight = datetime.combine(moment.date() + timedelta(days=1), datetime.min.time()).timestamp()
+            end = min(now, midnight)
+            bucket = self._bucket(start)
+            bucket[OBSERVED] += end - start
+            if self.is_on:
+                bucket[ON] += end - start
+            start = end
+        self._since = now
+        self._dirty = True
+    
+    def energy_wh(self, counters: List[float]) -> float:
+        """Geschätzter Verbrauch in Wh für [beobachtet, an, ...]"""
+        on_hours = counters[ON] / 3600.0
+        off_hours = (counters[OBSERVED] - counters[ON]) / 3600.0
+        return on_hours * self.watts_on + off_hours * self.watts_standby
+    
+    def get_report(self, days: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Summen pro Modus
+        
+        Returns:
+            {Modus: {hours, on_hours, toggles, energy_wh, saved_wh, on_ratio}}
+            saved_wh ist die Ersparnis gegenüber Dauerbetrieb (continuous)
+        """
+        with self._lock:
+            self._accrue(self.clock())
+            selected = sorted(self.days)
+            if days:
+                selected = selected[-days:]
+            totals: Dict[str, List[float]] = {}
+            for day in selected:
+                for mode, counters in self.days[day].items():
+                    total = totals.setdefault(mode, [0.0, 0.0, 0])
+                    for i, value in enumerate(counters):
+                        total[i] += value
+        
+        report = {}
+        for mode, counters in totals.items():
+            energy = self.energy_wh(counters)
+            continuous = counters[OBSERVED] / 3600.0 * self.watts_on
+            report[mode] = {
+                'hours': counters[OBSERVED] / 3600.0,
+                'on_hours': counters[ON] / 3600.0,
+                'toggles': int(counters[TOGGLES]),
+                'energy_wh': energy,
+                'saved_wh': continuous - energy,
+                'on_ratio': counters[ON] / counters[OBSERVED] if counters[OBSERVED] else 0.0,
+            }
+        return report
+    
+    def format_report(self, days: Optional[int] = None) -> str:
+        """Bericht als Text"""
+        report = self.get_report(days)
+        if not report:
+            return "Noch keine Daten"
+        lines = [f"{'Modus':12s} {'Stunden':>9s} {'an':>9s} {'Anteil':>7s} {'Schaltungen':>12s} "
+                 f"{'Verbrauch':>11s} {'Ersparnis':>11s}"]
+        for mode, values in sorted(report.items()):
+            lines.append(f"{mode:12s} {values['hours']:9.1f} {values['on_hours']:9.1f} "
+                         f"{values['on_ratio']:7.1%} {values['toggles']:12d} "
+                         f"{values['energy_wh'] / 1000:8.2f} kWh {values['saved_wh'] / 1000:7.2f} kWh")
+        lines.append(f"\n(Schätzung mit {self.watts_on:g} W an / {self.watts_standby:g} W Standby, "
+                     f"Ersparnis gegenüber Dauerbetrieb)")
+        return "\n".join(lines)
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == ENERGY_VERSION:
+                self.days = data.get('days', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Energie-Daten konnten nicht geladen werden: {e}")
+    
+    def _maybe_save(self):
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+    
+    def save(self) -> bool:
+        """Speichert die Tagessummen atomar"""
+        if not self.path:
+            return False
+        with self._lock:
+            self._accrue(self.clock())
+            if not self._dirty:
+                return False
+            for day in sorted(self.days)[:-KEEP_DAYS]:
+                del self.days[day]
+            data = json.dumps({'version': ENERGY_VERSION, 'days': self.days}, separators=(',', ':'))
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logger.warning(f"Energie-Daten konnten nicht gespeichert werden: {e}")
+            return False
+
+
+def main():
+    """Hauptfunktion für den Energie-Bericht"""
+    parser = argparse.ArgumentParser(description='Einschaltdauer und Energieverbrauch pro Display-Modus')
+    parser.add_argument('--days', type=int, help='Nur die letzten N Tage')
+    parser.add_argument('--watts', type=float, help='Leistung im Betrieb (Standard: aus config.json)')
+    parser.add_argument('--file', type=Path, default=ENERGY_FILE, help='Energie-Datei')
+    args = parser.parse_args()
+    
+    if not args.file.exists():
+        print(f"❌ Keine Energie-Daten gefunden: {args.file}")
+        sys.exit(1)
+    
+    from .config import ConfigManager
+    config = ConfigManager().get()
+    meter = EnergyMeter(args.file, watts_on=args.watts or config.display_watts_on,
+                        watts_standby=config.display_watts_standby)
+    print(meter.format_report(args.days))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,9 @@ Verhindert Log-Spam durch Rate-Limiting und intelligente Gruppierung
 
 import sys
 import os
+import atexit
 import logging
+import threading
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -14,11 +16,25 @@ from typing import Dict, Optional
 import json
 import hashlib
 
+from .error_store import ErrorStore
+from .flight_recorder import get_flight_recorder, render_snapshot
+
 logger = logging.getLogger(__name__)
 
 
 class ErrorLogger:
-    """Verwaltet Fehlerprotokolle und Crash-Reports"""
+    """
+    Verwaltet Fehlerprotokolle und Crash-Reports
+    
+    Fehler landen im ErrorStore (ein Segment pro Tag), Crashes weiterhin
+    als einzelne Markdown-Datei.
+    Der Rate-Limit-Cache wird nur im Speicher geändert und von einem
+    Hintergrund-Thread gesammelt gesichert (alle CACHE_FLUSH_INTERVAL
+    Sekunden, bei Crashes und beim Beenden).
+    """
+    
+    CACHE_FLUSH_INTERVAL = 30.0
+    ERROR_LOG_LINES = 50  # Log-Meldungen aus dem Flugschreiber pro Error-Report
     
     def __init__(self, log_dir: Optional[Path] = None):
         """
@@ -37,10 +53,17 @@ class ErrorLogger:
         # Erstelle Verzeichnisse
         self.crash_dir.mkdir(parents=True, exist_ok=True)
         self.error_dir.mkdir(parents=True, exist_ok=True)
+        self.error_store = ErrorStore(self.error_dir)
         
         # Error-Tracking für Rate-Limiting
         self.error_cache: Dict[str, dict] = {}
         self.error_cache_file = log_dir / 'error_cache.json'
+        self.cache_writes = 0
+        self._cache_cond = threading.Condition()
+        self._cache_dirty = False
+        self._cache_writer: Optional[threading.Thread] = None
+        self._closing = False
+        self._atexit_registered = False
         
         # Lade Error-Cache
         self._load_error_cache()
@@ -60,12 +83,64 @@ class ErrorLogger:
             self.error_cache = {}
     
     def _save_error_cache(self):
-        """Speichert den Error-Cache in die Datei"""
+        """Speichert den Error-Cache atomar in die Datei (nur wenn geändert)"""
+        with self._cache_cond:
+            if not self._cache_dirty:
+                return
+            self._cleanup_cache()
+            data = {key: dict(entry) for key, entry in self.error_cache.items()}
+            self._cache_dirty = False
+        
         try:
-            with open(self.error_cache_file, 'w') as f:
-                json.dump(self.error_cache, f, indent=2)
+            tmp_file = self.error_cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.error_cache_file)
+            self.cache_writes += 1
         except Exception as e:
             logger.warning(f"Fehler beim Speichern des Error-Cache: {e}")
+            with self._cache_cond:
+                self._cache_dirty = True  # Beim nächsten Durchlauf erneut versuchen
+    
+    def _mark_cache_dirty(self):
+        """Merkt eine Änderung am Cache vor (Aufrufer hält _cache_cond)"""
+        self._cache_dirty = True
+        if self._cache_writer is None or not self._cache_writer.is_alive():
+            self._cache_writer = threading.Thread(target=self._cache_writer_loop,
+                                                  name="error-cache", daemon=True)
+            self._cache_writer.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+    
+    def _cache_writer_loop(self):
+        """Sichert den Cache gesammelt im Hintergrund"""
+        while True:
+            with self._cache_cond:
+                if not self._closing:
+                    self._cache_cond.wait(self.CACHE_FLUSH_INTERVAL)
+                closing = self._closing
+            self._save_error_cache()
+            if closing:
+                break
+    
+    def flush(self):
+        """Sichert den Cache sofort (z.B. vor einem Absturz)"""
+        self._save_error_cache()
+    
+    def close(self):
+        """Beendet den Hintergrund-Schreiber und sichert den Cache"""
+        with self._cache_cond:
+            self._closing = True
+            self._cache_cond.notify()
+            writer, self._cache_writer = self._cache_writer, None
+        if writer is not None:
+            writer.join(timeout=5)
+        self._save_error_cache()
+        with self._cache_cond:
+            self._closing = False
     
     def _cleanup_cache(self):
         """Entfernt alte Cache-Einträge"""
@@ -81,6 +156,21 @@ class ErrorLogger:
         for key in keys_to_remove:
             del self.error_cache[key]
     
+    def get_rate_limits(self) -> Dict[str, dict]:
+        """Rate-Limiter-Zustand für den Zustands-Snapshot"""
+        with self._cache_cond:
+            return {key: dict(entry) for key, entry in self.error_cache.items()}
+    
+    def restore_rate_limits(self, entries: Dict[str, dict]):
+        """Übernimmt Rate-Limiter-Einträge aus einem Snapshot (der neuere Eintrag gewinnt)"""
+        with self._cache_cond:
+            for key, data in entries.items():
+                current = self.error_cache.get(key)
+                if current is None or data.get('last_occurrence', 0) > current.get('last_occurrence', 0):
+                    self.error_cache[key] = data
+                    self._mark_cache_dirty()
+            self._cleanup_cache()
+    
     def _get_error_hash(self, error_type: str, error_message: str, 
                         traceback_str: Optional[str] = None) -> str:
         """
@@ -121,38 +211,38 @@ class ErrorLogger:
         """
         now = datetime.now().timestamp()
         
-        if error_hash not in self.error_cache:
-            # Neuer Fehler -> immer loggen
-            self.error_cache[error_hash] = {
-                'first_occurrence': now,
-                'last_occurrence': now,
-                'count': 1,
-                'last_logged': now
-            }
-            self._save_error_cache()
-            return True
-        
-        error_data = self.error_cache[error_hash]
-        error_data['count'] += 1
-        error_data['last_occurrence'] = now
-        
-        # Rate-Limiting-Regeln:
-        # 1. Ersten 3 Vorkommen immer loggen
-        if error_data['count'] <= 3:
-            error_data['last_logged'] = now
-            self._save_error_cache()
-            return True
-        
-        # 2. Danach nur alle 5 Minuten
-        time_since_last_log = now - error_data.get('last_logged', 0)
-        if time_since_last_log > 300:  # 5 Minuten
-            error_data['last_logged'] = now
-            self._save_error_cache()
-            return True
-        
-        # 3. Nicht loggen (zu häufig)
-        self._save_error_cache()
-        return False
+        # Nur im Speicher ändern, gesichert wird im Hintergrund
+        with self._cache_cond:
+            self._mark_cache_dirty()
+            
+            if error_hash not in self.error_cache:
+                # Neuer Fehler -> immer loggen
+                self.error_cache[error_hash] = {
+                    'first_occurrence': now,
+                    'last_occurrence': now,
+                    'count': 1,
+                    'last_logged': now
+                }
+                return True
+            
+            error_data = self.error_cache[error_hash]
+            error_data['count'] += 1
+            error_data['last_occurrence'] = now
+            
+            # Rate-Limiting-Regeln:
+            # 1. Ersten 3 Vorkommen immer loggen
+            if error_data['count'] <= 3:
+                error_data['last_logged'] = now
+                return True
+            
+            # 2. Danach nur alle 5 Minuten
+            time_since_last_log = now - error_data.get('last_logged', 0)
+            if time_since_last_log > 300:  # 5 Minuten
+                error_data['last_logged'] = now
+                return True
+            
+            # 3. Nicht loggen (zu häufig)
+            return False
     
     def log_crash(self, exception: Exception, context: Optional[Dict] = None):
         """
@@ -182,6 +272,9 @@ class ErrorLogger:
             context=context
         )
         
+        # Rate-Limit-Cache sichern, bevor der Prozess endet
+        self.flush()
+        
         # Speichere Report
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
@@ -214,29 +307,30 @@ class ErrorLogger:
         
         # Prüfe ob Fehler geloggt werden soll
         if not self._should_log_error(error_hash):
-            logger.debug(f"Fehler {error_hash} übersprungen (Rate-Limiting)")
+            logger.debug("Fehler %s übersprungen (Rate-Limiting)", error_hash, extra={'error_hash': error_hash})
             return
         
-        timestamp = datetime.now()
-        filename = f"error-{timestamp.strftime('%Y%m%d-%H%M%S')}-{error_hash}.md"
-        filepath = self.error_dir / filename
-        
-        # Erstelle Error-Report
-        report = self._create_error_report(
-            timestamp=timestamp,
-            error_type=error_type,
-            error_message=error_message,
-            traceback_str=traceback_str,
-            context=context,
-            error_hash=error_hash
-        )
+        now = datetime.now().timestamp()
+        with self._cache_cond:
+            error_data = dict(self.error_cache.get(error_hash, {}))
+        
+        record = {
+            'timestamp': now,
+            'error_hash': error_hash,
+            'error_type': error_type,
+            'error_message': error_message,
+            'traceback': traceback_str,
+            'context': {str(key): str(value) for key, value in (context or {}).items()},
+            'count': error_data.get('count', 1),
+            'first_occurrence': error_data.get('first_occurrence', now),
+            'recent': get_flight_recorder().snapshot(self.ERROR_LOG_LINES),
+        }
         
-        # Speichere Report
+        # Im Tagessegment speichern (Markdown erst beim Anzeigen)
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(report)
-            
-            logger.error(f"Error-Report erstellt: {filepath}")
+            name = self.error_store.append(record)
+            logger.error(f"Error-Report erstellt: {name} (./log-viewer show {name})",
+                         extra={'error_hash': error_hash})
             
         except Exception as e:
             logger.warning(f"Fehler beim Erstellen des Error-Reports: {e}")
@@ -273,6 +367,9 @@ class ErrorLogger:
                 report += f"- **{key}:** {value}\n"
             report += "\n"
         
+        # Was die App kurz vor dem Crash getan hat
+        report += render_snapshot(get_flight_recorder().snapshot())
+        
         report += """## Empfohlene Aktionen
 1. Prüfe die Traceback-Informationen
 2. Suche nach ähnlichen Crashes in diesem Ordner
@@ -281,56 +378,6 @@ class ErrorLogger:
 
 ## Hinweis
 Dieser Crash-Report wurde automatisch erstellt.
-"""
-        
-        return report
-    
-    def _create_error_report(self, timestamp: datetime, error_type: str,
-                            error_message: str, traceback_str: Optional[str],
-                            context: Optional[Dict], error_hash: str) -> str:
-        """Erstellt einen formatierten Error-Report"""
-        
-        error_data = self.error_cache.get(error_hash, {})
-        count = error_data.get('count', 1)
-        
-        report = f"""# ⚠️ ERROR REPORT
-
-## Zeitpunkt
-**{timestamp.strftime('%d.%m.%Y %H:%M:%S')}**
-
-## Fehler
-**Typ:** `{error_type}`  
-**Nachricht:** {error_message}  
-**Hash:** `{error_hash}`  
-**Vorkommen:** {count}x
-
-"""
-        
-        if traceback_str:
-            report += f"""## Traceback
-```python
-{traceback_str}
-```
-
-"""
-        
-        if context:
-            report += "## Kontext\n"
-            for key, value in context.items():
-                report += f"- **{key}:** {value}\n"
-            report += "\n"
-        
-        if count > 1:
-            first_occurrence = datetime.fromtimestamp(error_data.get('first_occurrence', 0))
-            report += f"""## Häufigkeit
-Dieser Fehler ist bereits **{count}x** aufgetreten.  
-Erstes Vorkommen: {first_occurrence.strftime('%d.%m.%Y %H:%M:%S')}
-
-"""
-        
-        report += """## Hinweis
-Dieser Error-Report wurde automatisch erstellt.
-Ähnliche Fehler werden gruppiert um Log-Spam zu vermeiden.
 """
         
         return report
@@ -339,6 +386,10 @@ Dieser Error-Report wurde automatisch erstellt.
         """
         Löscht alte Log-Dateien
         
+        Fehler werden tageweise gelöscht (ganze Segmente), Crash-Reports
+        und Error-Reports im alten Format (eine .md-Datei pro Fehler)
+        einzeln nach Änderungsdatum.
+        
         Args:
             days: Alter in Tagen (Standard: 30)
         """
@@ -357,8 +408,12 @@ Dieser Error-Report wurde automatisch erstellt.
                 except Exception as e:
                     logger.warning(f"Fehler beim Löschen von {log_file}: {e}")
         
+        for day, entries, _ in self.error_store.drop_before(cutoff_time.date()):
+            deleted_count += entries
+            logger.debug(f"Error-Segment gelöscht: {day.isoformat()} ({entries} Fehler)")
+        
         if deleted_count > 0:
-            logger.info(f"{deleted_count} alte Log-Dateien gelöscht (älter als {days} Tage)")
+            logger.info(f"{deleted_count} alte Log-Einträge gelöscht (älter als {days} Tage)")
     
     def get_statistics(self) -> Dict:
         """
@@ -368,7 +423,7 @@ Dieser Error-Report wurde automatisch erstellt.
             Dictionary mit Statistiken
         """
         crash_count = len(list(self.crash_dir.glob('*.md')))
-        error_count = len(list(self.error_dir.glob('*.md')))
+        error_count = self.error_store.count()
         
         # Zähle eindeutige Fehler
         unique_errors = len(self.error_cache)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Append-only Speicher für Error-Reports
+Eine JSONL-Datei pro Tag mit einem Index fester Länge daneben
+(Zeitstempel, Position, Hash). Markdown-Reports werden erst beim Anzeigen
+erzeugt (siehe render_report), aufgeräumt wird tageweise.
+"""
+
+import os
+import json
+import struct
+import logging
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .flight_recorder import render_snapshot
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = 'errors-'
+SEGMENT_SUFFIX = '.jsonl'
+INDEX_SUFFIX = '.idx'
+
+# Index-Record: Zeitstempel, Byte-Position der Zeile im Segment, Fehler-Hash
+INDEX_FORMAT = '<dQ12s'
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+
+REPORT_PREFIX = 'error-'
+
+# Plausible Zeitpunkte im Index (2000-01-01 bis 2100-01-01)
+MIN_TIMESTAMP = 946684800.0
+MAX_TIMESTAMP = 4102444800.0
+
+
+class ErrorEntry(NamedTuple):
+    """Index-Eintrag eines gespeicherten Fehlers"""
+    timestamp: float
+    error_hash: str
+    offset: int
+    segment: Path
+    
+    @property
+    def report_id(self) -> str:
+        return report_id(self.timestamp, self.error_hash)
+
+
+def report_id(timestamp: float, error_hash: str) -> str:
+    """Name eines Reports wie bei den früheren Markdown-Dateien (ohne .md)"""
+    return f"{REPORT_PREFIX}{datetime.fromtimestamp(timestamp).strftime('%Y%m%d-%H%M%S')}-{error_hash}"
+
+
+def parse_report_id(name: str) -> Optional[Tuple[datetime, str]]:
+    """Zerlegt 'error-YYYYMMDD-HHMMSS-HASH[.md]' in Zeitpunkt und Hash"""
+    if name.endswith('.md'):
+        name = name[:-3]
+    if not name.startswith(REPORT_PREFIX):
+        return None
+    parts = name[len(REPORT_PREFIX):].split('-')
+    if len(parts) != 3:
+        return None
+    try:
+        return datetime.strptime(f"{parts[0]}-{parts[1]}", '%Y%m%d-%H%M%S'), parts[2]
+    except ValueError:
+        return None
+
+
+def segment_file(directory: Path, day: date) -> Path:
+    """Pfad des Tagessegments"""
+    return directory / f"{SEGMENT_PREFIX}{day.isoformat()}{SEGMENT_SUFFIX}"
+
+
+class ErrorStore:
+    """
+    Error-Reports als Tagessegmente (thread-sicher)
+    
+    Erst wird die JSON-Zeile angehängt, dann der Index-Record. Ein Index
+    zeigt damit nie auf eine halb geschriebene Zeile; Zeilen ohne Index
+    (z.B. nach Stromausfall) werden nicht angezeigt.
+    """
+    
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Args:
+            directory: Verzeichnis der Segmente
+        """
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+    
+    def append(self, record: Dict[str, Any]) -> str:
+        """
+        Hängt einen Fehler an das Segment seines Tages an
+        
+        Args:
+            record: JSON-fähiger Datensatz mit 'timestamp' und 'error_hash'
+        
+        Returns:
+            Report-Name (für log-viewer show)
+        """
+        timestamp = record['timestamp']
+        error_hash = record['error_hash']
+        path = segment_file(self.directory, datetime.fromtimestamp(timestamp).date())
+        line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        
+        with self._lock:
+            # Erst beim Schreiben anlegen (log-viewer liest auch fremde Verzeichnisse)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(path, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+            index = path.with_suffix(INDEX_SUFFIX)
+            with open(index, 'ab') as f:
+                # Halb geschriebenen Record (z.B. nach Stromausfall) abschneiden,
+                # sonst wären alle folgenden Records verschoben
+                torn = f.tell() % INDEX_SIZE
+                if torn:
+                    logger.warning(f"Error-Index {index.name}: {torn} Bytes unvollständiger Record entfernt")
+                    f.truncate(f.tell() - torn)
+                f.write(struct.pack(INDEX_FORMAT, timestamp, offset, error_hash.encode('ascii')[:12]))
+        return report_id(timestamp, error_hash)
+    
+    def segments(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Tuple[date, Path]]:
+        """Tagessegmente im Zeitraum, chronologisch sortiert"""
+        result = []
+        try:
+            names = sorted(entry.name for entry in os.scandir(self.directory)
+                           if entry.name.startswith(SEGMENT_PREFIX) and entry.name.endswith(SEGMENT_SUFFIX))
+        except OSError:
+            return result
+        for name in names:
+            try:
+                day = date.fromisoformat(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            except ValueError:
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            result.append((day, self.directory / name))
+        return result
+    
+    def _read_index(self, segment: Path) -> List[ErrorEntry]:
+        try:
+            with open(segment.with_suffix(INDEX_SUFFIX), 'rb') as f:
+                data = f.read()
+            segment_size = segment.stat().st_size
+        except OSError:
+            return []
+        usable = len(data) - len(data) % INDEX_SIZE
+        entries = []
+        skipped = 0
+        for timestamp, offset, raw_hash in struct.iter_unpack(INDEX_FORMAT, data[:usable]):
+            # Kaputte Records (Zeitpunkt oder Position ungültig) überspringen
+            if not MIN_TIMESTAMP <= timestamp <= MAX_TIMESTAMP or offset >= segment_size:
+                skipped += 1
+                continue
+            entries.append(ErrorEntry(timestamp, raw_hash.rstrip(b'\0').decode('ascii', 'replace'), offset, segment))
+        if skipped:
+            logger.warning(f"Error-Index {segment.name}: {skipped} ungültige Einträge übersprungen")
+        return entries
+    
+    def iter_entries(self, start: Optional[date] = None, end: Optional[date] = None,
+                     error_hash: Optional[str] = None, newest_first: bool = False) -> Iterator[ErrorEntry]:
+        """
+        Index-Einträge im Zeitraum (nur die Index-Dateien werden gelesen)
+        
+        Args:
+            start: Erster Tag (inklusive)
+            end: Letzter Tag (inklusive)
+            error_hash: Nur Fehler mit diesem Hash
+            newest_first: Neueste zuerst statt chronologisch
+        """
+        segments = self.segments(start, end)
+        if newest_first:
+            segments.reverse()
+        for _, segment in segments:
+            entries = self._read_index(segment)
+            if newest_first:
+                entries.reverse()
+            for entry in entries:
+                if error_hash is None or entry.error_hash == error_hash:
+                    yield entry
+    
+    def iter_lines(self, start: Optional[date] = None, end: Optional[date] = None,
+                   error_hash: Optional[str] = None, newest_first: bool = False) -> Iterator[Tuple[ErrorEntry, bytes]]:
+        """
+        Index-Einträge mit ihrer rohen JSON-Zeile (jedes Segment wird einmal gelesen)
+        
+        Für Durchsuchen vieler Einträge statt read() pro Eintrag.
+        """
+        segments = self.segments(start, end)
+        if newest_first:
+            segments.reverse()
+        for _, segment in segments:
+            entries = [entry for entry in self._read_index(segment)
+                       if error_hash is None or entry.error_hash == error_hash]
+            if not entries:
+                continue
+            try:
+                with open(segment, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                logger.warning(f"Error-Segment {segment.name} nicht lesbar: {e}")
+                continue
+            if newest_first:
+                entries.reverse()
+            for entry in entries:
+                end_of_line = data.find(b'\n', entry.offset)
+                yield entry, data[entry.offset:end_of_line if end_of_line >= 0 else len(data)]
+    
+    def read(self, entry: ErrorEntry) -> Optional[Dict[str, Any]]:
+        """Liest den vollständigen Datensatz zu einem Index-Eintrag"""
+        try:
+            with open(entry.segment, 'rb') as f:
+                f.seek(entry.offset)
+                return json.loads(f.readline().decode('utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Error-Report {entry.report_id} nicht lesbar: {e}")
+            return None
+    
+    def find(self, name: str) -> List[Dict[str, Any]]:
+        """Datensätze zu einem Report-Namen (mehrere, wenn derselbe Fehler in derselben Sekunde kam)"""
+        parsed = parse_report_id(name)
+        if parsed is None:
+            return []
+        when, error_hash = parsed
+        day = when.date()
+        records = []
+        for entry in self.iter_entries(day, day, error_hash=error_hash):
+            if entry.report_id == report_id(when.timestamp(), error_hash):
+                record = self.read(entry)
+                if record is not None:
+                    records.append(record)
+        return records
+    
+    def count(self) -> int:
+        """Anzahl gespeicherter Fehler (ein stat pro Tagessegment)"""
+        total = 0
+        for _, segment in self.segments():
+            try:
+                total += segment.with_suffix(INDEX_SUFFIX).stat().st_size // INDEX_SIZE
+            except OSError:
+                pass
+        return total
+    
+    def drop_before(self, day: date, dry_run: bool = False) -> List[Tuple[date, int, int]]:
+        """
+        Löscht ganze Tagessegmente vor day
+        
+        Returns:
+            Liste von (Tag, Anzahl Fehler, Bytes) der gelöschten Segmente
+        """
+        dropped = []
+        for segment_day, segment in self.segments():
+            if segment_day >= day:
+                break
+            index = segment.with_suffix(INDEX_SUFFIX)
+            size = 0
+            entries = 0
+            for path in (segment, index):
+                try:
+                    file_size = path.stat().st_size
+                except OSError:
+                    continue
+                size += file_size
+                if path == index:
+                    entries = file_size // INDEX_SIZE
+                if not dry_run:
+                    try:
+                        path.unlink()
+                    except OSError as e:
+                        logger.warning(f"Fehler beim Löschen von {path}: {e}")
+            dropped.append((segment_day, entries, size))
+        return dropped
+
+
+def render_report(record: Dict[str, Any]) -> str:
+    """Erstellt den Markdown-Report zu einem gespeicherten Fehler"""
+    timestamp = datetime.fromtimestamp(record.get('timestamp', 0))
+    count = record.get('count', 1)
+    
+    report = f"""# ⚠️ ERROR REPORT
+
+## Zeitpunkt
+**{timestamp.strftime('%d.%m.%Y %H:%M:%S')}**
+
+## Fehler
+**Typ:** `{record.get('error_type', '')}`  
+**Nachricht:** {record.get('error_message', '')}  
+**Hash:** `{record.get('error_hash', '')}`  
+**Vorkommen:** {count}x
+
+"""
+    
+    traceback_str = record.get('traceback')
+    if traceback_str:
+        report += f"""## Traceback
+```python
+{traceback_str}
+```
+
+"""
+    
+    context = record.get('context')
+    if context:
+        report += "## Kontext\n"
+        for key, value in context.items():
+            report += f"- **{key}:** {value}\n"
+        report += "\n"
+    
+    if count > 1:
+        first_occurrence = datetime.fromtimestamp(record.get('first_occurrence', 0))
+        report += f"""## Häufigkeit
+Dieser Fehler ist bereits **{count}x** aufgetreten.  
+Erstes Vorkommen: {first_occurrence.strftime('%d.%m.%Y %H:%M:%S')}
+
+"""
+    
+    report += render_snapshot(record.get('recent'))
+    
+    report += """## Hinweis
+Dieser Error-Report wurde automatisch erstellt.
+Ähnliche Fehler werden gruppiert um Log-Spam zu vermeiden.
+"""
+    
+    return report
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Event-Bus zwischen Sensor-/Watcher-Threads und der Tk-Hauptschleife
+Threads veröffentlichen typisierte Events, der UI-Thread verarbeitet sie gebündelt
+"""
+
+import os
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Hashable, List, Optional, Type
+
+from .flight_recorder import get_flight_recorder
+
+if TYPE_CHECKING:
+    from .config import ConfigDiff
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Event:
+    """Basisklasse für alle Events"""
+    
+    timestamp: float = field(default_factory=time.time)
+    
+    def coalesce_key(self) -> Optional[Hashable]:
+        """
+        Schlüssel für das Zusammenfassen innerhalb eines Batches
+        
+        Von mehreren Events mit gleichem Schlüssel wird nur das letzte
+        zugestellt. None bedeutet: nie zusammenfassen.
+        """
+        return None
+
+
+@dataclass(frozen=True)
+class MotionEvent(Event):
+    """Bewegungssensor hat seinen Zustand geändert"""
+    
+    motion: bool = False
+    source: str = "pir"
+    
+    def coalesce_key(self) -> Optional[Hashable]:
+        # Pro Quelle bleibt höchstens ein "Bewegung" und ein "keine Bewegung"
+        return (MotionEvent, self.source, self.motion)
+
+
+@dataclass(frozen=True)
+class ConfigChangedEvent(Event):
+    """config.json wurde geändert und geprüft"""
+    
+    diff: Optional['ConfigDiff'] = None
+    
+    def coalesce_key(self) -> Optional[Hashable]:
+        # diff.new ist vollständig - die letzte Änderung genügt
+        return (ConfigChangedEvent,)
+
+
+class EventBus:
+    """
+    Thread-sichere Event-Warteschlange mit gebündelter Zustellung
+    
+    publish() darf aus beliebigen Threads aufgerufen werden und kommt ohne
+    Lock aus (deque.append ist atomar). Pro Burst wird der UI-Thread nur
+    einmal über eine Pipe geweckt; drain() läuft ausschließlich im UI-Thread
+    und ruft dort die registrierten Handler auf.
+    """
+    
+    def __init__(self, max_pending: int = 256, max_batch: int = 64):
+        """
+        Args:
+            max_pending: Maximale Anzahl wartender Events (älteste werden verworfen)
+            max_batch: Maximale Anzahl Events pro drain()-Aufruf
+        """
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self._queue: Deque[Event] = deque(maxlen=max_pending)
+        self._handlers: Dict[Type[Event], List[Callable[[Event], None]]] = {}
+        self._wakeup_pending = False
+        
+        # Statistik
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.wakeups = 0
+        
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+    
+    def fileno(self) -> int:
+        """Lesbarer Dateideskriptor, der bei neuen Events bereit wird"""
+        return self._read_fd
+    
+    def subscribe(self, event_type: Type[Event], handler: Callable[[Event], None]):
+        """Registriert einen Handler (wird im UI-Thread aufgerufen)"""
+        self._handlers.setdefault(event_type, []).append(handler)
+    
+    def publish(self, event: Event):
+        """Veröffentlicht ein Event (thread-sicher)"""
+        if len(self._queue) >= self.max_pending:
+            self.dropped += 1
+        self._queue.append(event)
+        self.published += 1
+        
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._wake()
+    
+    def _wake(self):
+        """Weckt den UI-Thread über die Pipe"""
+        self.wakeups += 1
+        try:
+            os.write(self._write_fd, b'\0')
+        except (BlockingIOError, OSError):
+            # Pipe voll oder geschlossen - UI-Thread ist ohnehin geweckt
+            pass
+    
+    def pending(self) -> int:
+        """Anzahl wartender Events"""
+        return len(self._queue)
+    
+    def drain(self) -> int:
+        """
+        Verarbeitet wartende Events (nur im UI-Thread aufrufen)
+        
+        Returns:
+            Anzahl zugestellter Events
+        """
+        # Zuerst zurücksetzen, damit Events während des Leerens erneut wecken
+        self._wakeup_pending = False
+        try:
+            while os.read(self._read_fd, 512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        
+        get_flight_recorder().sample('event_queue', len(self._queue))
+        batch: List[Event] = []
+        for _ in range(self.max_batch):
+            try:
+                batch.append(self._queue.popleft())
+            except IndexError:
+                break
+        
+        if not batch:
+            return 0
+        
+        # Rest im nächsten Durchlauf, damit die UI nicht blockiert
+        if self._queue and not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._wake()
+        
+        events = self._coalesce(batch)
+        for event in events:
+            for handler in self._handlers.get(type(event), ()):
+                try:
+                    handler(event)
+                except Exception as e:
+                    logger.error(f"Fehler im Event-Handler für {type(event).__name__}: {e}")
+        self.delivered += len(events)
+        return len(events)
+    
+    def _coalesce(self, batch: List[Event]) -> List[Event]:
+        """Fasst Events mit gleichem Schlüssel zusammen (Reihenfolge bleibt erhalten)"""
+        last_index: Dict[Hashable, int] = {}
+        for index, event in enumerate(batch):
+            key = event.coalesce_key()
+            if key is not None:
+                last_index[key] = index
+        
+        events = [
+            event for index, event in enumerate(batch)
+            if event.coalesce_key() is None or last_index[event.coalesce_key()] == index
+        ]
+        self.coalesced += len(batch) - len(events)
+        return events
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Gibt Zähler für Diagnosezwecke zurück"""
+        return {
+            'published': self.published,
+            'delivered': self.delivered,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'wakeups': self.wakeups,
+            'pending': len(self._queue),
+        }
+    
+    def close(self):
+        """Schließt die Weck-Pipe"""
+        for fd in (self._read_fd, self._write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Auswertung des Event-Speichers (Bewegung, Bildschirm, Bilder)
+Streamt Aggregate pro Stunde oder Tag mit konstantem Speicherbedarf,
+auch über Monate an Daten.
+"""
+
+import sys
+import time
+import argparse
+from array import array
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from .event_store import (
+    DEFAULT_EVENT_DIR, EVENT_MOTION_ON, EVENT_SCREEN_OFF, EVENT_SCREEN_ON, EVENT_SLIDE,
+    StoredEvent, iter_events
+)
+
+WEEKDAYS = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
+
+
+class BucketRow(NamedTuple):
+    """Aggregat eines Zeitabschnitts"""
+    start: datetime
+    arrivals: int
+    screen_on_seconds: float
+    slides: int
+
+
+def _bucket_bounds(timestamp: float, granularity: str) -> Tuple[datetime, datetime]:
+    """Beginn und Ende des Abschnitts, in dem der Zeitstempel liegt"""
+    moment = datetime.fromtimestamp(timestamp)
+    if granularity == 'hour':
+        start = moment.replace(minute=0, second=0, microsecond=0)
+        return start, start + timedelta(hours=1)
+    start = datetime.combine(moment.date(), datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+def aggregate(events: Iterable[StoredEvent], granularity: str = 'day',
+              source: Optional[int] = None, until: Optional[float] = None) -> Iterator[BucketRow]:
+    """
+    Fasst Events zu Zeilen pro Stunde oder Tag zusammen
+    
+    Zeilen werden ausgegeben, sobald ihr Abschnitt abgeschlossen ist.
+    Abschnitte ohne Events erscheinen nur, wenn der Bildschirm an war.
+    
+    Args:
+        events: Chronologisch sortierte Events
+        granularity: 'hour' oder 'day'
+        source: Nur Bewegungen dieses Eingangs (GPIO-Pin) zählen
+        until: Ende der Auswertung (z.B. jetzt) - ist der Bildschirm dann noch an,
+            zählt die Zeit bis hierhin mit; spätere Events werden ignoriert
+    """
+    bucket_start: Optional[datetime] = None
+    bucket_end_ts = 0.0
+    arrivals = 0
+    screen_seconds = 0.0
+    slides = 0
+    screen_on_since: Optional[float] = None
+    
+    def advance(timestamp: float) -> Iterator[BucketRow]:
+        """Schließt alle Abschnitte vor dem Zeitstempel ab"""
+        nonlocal bucket_start, bucket_end_ts, arrivals, screen_seconds, slides, screen_on_since
+        while bucket_start is None or timestamp >= bucket_end_ts:
+            if bucket_start is not None:
+                if screen_on_since is not None:
+                    screen_seconds += bucket_end_ts - screen_on_since
+                    screen_on_since = bucket_end_ts
+                if arrivals or screen_seconds or slides:
+                    yield BucketRow(bucket_start, arrivals, screen_seconds, slides)
+                arrivals, screen_seconds, slides = 0, 0.0, 0
+            
+            if bucket_start is not None and screen_on_since is not None:
+                # Bildschirm war durchgehend an - Abschnitte lückenlos fortsetzen
+                bucket_start, bucket_end = _bucket_bounds(bucket_end_ts, granularity)
+            else:
+                bucket_start, bucket_end = _bucket_bounds(timestamp, granularity)
+            bucket_end_ts = bucket_end.timestamp()
+    
+    for event in events:
+        if until is not None and event.timestamp > until:
+            break
+        yield from advance(event.timestamp)
+        
+        if event.kind == EVENT_MOTION_ON:
+            if source is None or event.source == source:
+                arrivals += 1
+        elif event.kind == EVENT_SCREEN_ON:
+            if screen_on_since is None:
+                screen_on_since = event.timestamp
+        elif event.kind == EVENT_SCREEN_OFF:
+            if screen_on_since is not None:
+                screen_seconds += event.timestamp - screen_on_since
+                screen_on_since = None
+        elif event.kind == EVENT_SLIDE:
+            slides += 1
+    
+    if until is not None and screen_on_since is not None and until > screen_on_since:
+        # Bildschirm ist noch an - offene Zeit bis zum Ende mitzählen
+        yield from advance(until)
+        screen_seconds += until - screen_on_since
+    
+    if bucket_start is not None and (arrivals or screen_seconds or slides):
+        yield BucketRow(bucket_start, arrivals, screen_seconds, slides)
+
+
+def print_rows(rows: Iterable[BucketRow], granularity: str, csv: bool = False):
+    """Gibt Aggregat-Zeilen aus (während sie entstehen)"""
+    time_format = '%Y-%m-%d %H:00' if granularity == 'hour' else '%Y-%m-%d'
+    if csv:
+        print("start,arrivals,screen_on_seconds,slides")
+    else:
+        print(f"{'Zeitraum':18s} {'Besucher':>9s} {'Bildschirm an':>14s} {'Bilder':>8s}")
+        print("-" * 52)
+    
+    total_arrivals = 0
+    total_seconds = 0.0
+    for row in rows:
+        total_arrivals += row.arrivals
+        total_seconds += row.screen_on_seconds
+        if csv:
+            print(f"{row.start.strftime(time_format)},{row.arrivals},{row.screen_on_seconds:.0f},{row.slides}")
+        else:
+            print(f"{row.start.strftime(time_format):18s} {row.arrivals:9d} "
+                  f"{row.screen_on_seconds / 3600:12.2f} h {row.slides:8d}")
+    
+    if not csv:
+        print("-" * 52)
+        print(f"{'Summe':18s} {total_arrivals:9d} {total_seconds / 3600:12.2f} h")
+
+
+def print_heatmap(events: Iterable[StoredEvent], source: Optional[int] = None):
+    """Besucher pro Wochentag und Stunde (Durchschnitt pro Tag)"""
+    counts = array('L', [0]) * (7 * 24)
+    days_seen = [set() for _ in range(7)]
+    
+    for event in events:
+        if event.kind != EVENT_MOTION_ON or (source is not None and event.source != source):
+            continue
+        moment = datetime.fromtimestamp(event.timestamp)
+        weekday = moment.weekday()
+        counts[weekday * 24 + moment.hour] += 1
+        days_seen[weekday].add(moment.date().toordinal())
+    
+    print("     " + "".join(f"{hour:>4d}" for hour in range(24)))
+    for weekday in range(7):
+        days = len(days_seen[weekday]) or 1
+        cells = "".join(f"{counts[weekday * 24 + hour] / days:4.0f}" for hour in range(24))
+        print(f"{WEEKDAYS[weekday]:5s}{cells}")
+    print("\n(Besucher pro Stunde, Durchschnitt über Tage mit Bewegung)")
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültiges Datum (erwartet JJJJ-MM-TT): {value}")
+
+
+def main():
+    """Hauptfunktion für das Event-Query CLI"""
+    parser = argparse.ArgumentParser(
+        description='Auswertung von Bewegungs- und Bildschirm-Events',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Beispiele:
+  %(prog)s daily                         # Besucher und Bildschirmzeit pro Tag
+  %(prog)s hourly --from 2025-11-01      # Pro Stunde ab 1. November
+  %(prog)s heatmap --source 17           # Wochentag x Stunde für Eingang an GPIO 17
+  %(prog)s daily --csv > belegung.csv    # Export für Tabellenkalkulation
+        """
+    )
+    parser.add_argument('command', choices=['daily', 'hourly', 'heatmap'], help='Befehl')
+    parser.add_argument('--from', dest='start', type=_parse_date, help='Erster Tag (JJJJ-MM-TT)')
+    parser.add_argument('--to', dest='end', type=_parse_date, help='Letzter Tag (JJJJ-MM-TT)')
+    parser.add_argument('--source', type=int, help='Nur Bewegungen dieses Eingangs (GPIO-Pin)')
+    parser.add_argument('--csv', action='store_true', help='CSV-Ausgabe')
+    parser.add_argument('--event-dir', type=Path, default=DEFAULT_EVENT_DIR, help='Event-Verzeichnis')
+    args = parser.parse_args()
+    
+    if not args.event_dir.exists():
+        print(f"❌ Event-Verzeichnis nicht gefunden: {args.event_dir}")
+        print("Tipp: record_events in der Konfiguration aktivieren und die Slideshow starten.")
+        sys.exit(1)
+    
+    events = iter_events(args.event_dir, args.start, args.end)
+    # Noch laufende Bildschirmzeit endet jetzt bzw. am Ende des letzten Tags
+    until = time.time()
+    if args.end is not None:
+        until = min(until, datetime.combine(args.end + timedelta(days=1), datetime.min.time()).timestamp())
+    
+    if args.command == 'heatmap':
+        print_heatmap(events, args.source)
+    else:
+        granularity = 'hour' if args.command == 'hourly' else 'day'
+        print_rows(aggregate(events, granularity, args.source, until), granularity, args.csv)
+
+
+if __name__ == '__main__':
+    main()
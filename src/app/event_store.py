@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Zeitreihen-Speicher für Bewegungs-, Bildschirm- und Bild-Events
+Eine Datei pro Tag mit Records fester Länge, beschrieben über mmap.
+Auswertung mit app.event_query (./event-query).
+"""
+
+import os
+import mmap
+import time
+import struct
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Union
+
+from .config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_DIR = DATA_DIR / 'events'
+
+# Event-Arten
+EVENT_MOTION_ON = 1
+EVENT_MOTION_OFF = 2
+EVENT_SCREEN_ON = 3
+EVENT_SCREEN_OFF = 4
+EVENT_SLIDE = 5
+
+EVENT_NAMES = {
+    EVENT_MOTION_ON: 'motion_on',
+    EVENT_MOTION_OFF: 'motion_off',
+    EVENT_SCREEN_ON: 'screen_on',
+    EVENT_SCREEN_OFF: 'screen_off',
+    EVENT_SLIDE: 'slide',
+}
+
+# Datei-Header: Magic, Version, Record-Größe, Anzahl gültiger Records
+STORE_MAGIC = b'MEVT'
+STORE_VERSION = 1
+HEADER_FORMAT = '<4sHHI4x'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+COUNT_OFFSET = 8
+# Record: Zeitstempel, Art, Quelle (z.B. GPIO-Pin des Eingangs), Wert (z.B. Bildindex)
+RECORD_FORMAT = '<dBBH'
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+FILE_PREFIX = 'events-'
+FILE_SUFFIX = '.bin'
+
+
+class StoredEvent(NamedTuple):
+    """Ein gespeichertes Event"""
+    timestamp: float
+    kind: int
+    source: int
+    value: int
+
+
+def event_file(directory: Path, day: date) -> Path:
+    """Pfad der Tagesdatei"""
+    return directory / f"{FILE_PREFIX}{day.isoformat()}{FILE_SUFFIX}"
+
+
+class EventStore:
+    """
+    Append-only Event-Speicher mit täglicher Rotation (thread-sicher)
+    
+    Die Tagesdatei wird in Blöcken vorab angelegt und per mmap beschrieben.
+    Der Zähler im Header wird mit jedem Record aktualisiert, Daten hinter
+    dem Zähler (z.B. nach Stromausfall) gelten als ungültig.
+    """
+    
+    def __init__(self, directory: Optional[Union[str, Path]] = None,
+                 capacity: int = 16384, flush_interval: float = 60.0):
+        """
+        Args:
+            directory: Verzeichnis der Tagesdateien (Standard: ~/.local/share/raspi-app/events)
+            capacity: Records pro Block (Datei wächst blockweise)
+            flush_interval: Sekunden zwischen zwei msync-Aufrufen
+        """
+        self.directory = Path(directory) if directory else DEFAULT_EVENT_DIR
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.records = 0
+        
+        self._lock = threading.Lock()
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._count = 0
+        self._slots = 0
+        self._day_end = 0.0
+        self._last_flush = time.monotonic()
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Event-Speicher: {self.directory}")
+    
+    def append(self, kind: int, timestamp: Optional[float] = None, source: int = 0, value: int = 0):
+        """Hängt ein Event an die Datei des jeweiligen Tages an"""
+        if timestamp is None:
+            timestamp = time.time()
+        
+        with self._lock:
+            try:
+                if self._map is None or timestamp >= self._day_end:
+                    self._rotate(timestamp)
+                if self._count >= self._slots:
+                    self._grow()
+                
+                struct.pack_into(RECORD_FORMAT, self._map, HEADER_SIZE + self._count * RECORD_SIZE,
+                                 timestamp, kind, source & 0xFF, value & 0xFFFF)
+                self._count += 1
+                struct.pack_into('<I', self._map, COUNT_OFFSET, self._count)
+                self.records += 1
+                
+                now = time.monotonic()
+                if now - self._last_flush >= self.flush_interval:
+                    self._map.flush()
+                    self._last_flush = now
+            except (OSError, ValueError) as e:
+                logger.error(f"Event konnte nicht gespeichert werden: {e}")
+    
+    def _rotate(self, timestamp: float):
+        """Öffnet die Tagesdatei für den Zeitstempel"""
+        self._close_file()
+        
+        day = datetime.fromtimestamp(timestamp).date()
+        next_day = datetime.combine(day + timedelta(days=1), datetime.min.time())
+        self._day_end = next_day.timestamp()
+        
+        path = event_file(self.directory, day)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._file = os.fdopen(fd, 'r+b')
+        size = os.fstat(fd).st_size
+        
+        if size < HEADER_SIZE:
+            self._count = 0
+            self._file.truncate(HEADER_SIZE + self.capacity * RECORD_SIZE)
+            self._slots = self.capacity
+            self._map = mmap.mmap(fd, 0)
+            struct.pack_into(HEADER_FORMAT, self._map, 0, STORE_MAGIC, STORE_VERSION, RECORD_SIZE, 0)
+        else:
+            self._map = mmap.mmap(fd, 0)
+            magic, version, record_size, count = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+            if magic != STORE_MAGIC or version != STORE_VERSION or record_size != RECORD_SIZE:
+                self._close_file()
+                raise ValueError(f"Keine gültige Event-Datei: {path}")
+            self._slots = (size - HEADER_SIZE) // RECORD_SIZE
+            self._count = min(count, self._slots)
+    
+    def _grow(self):
+        """Vergrößert die Tagesdatei um einen Block"""
+        self._map.flush()
+        self._map.close()
+        self._slots += self.capacity
+        self._file.truncate(HEADER_SIZE + self._slots * RECORD_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+    
+    def flush(self):
+        """Schreibt geänderte Seiten auf den Datenträger"""
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                self._last_flush = time.monotonic()
+    
+    def _close_file(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            # Unbenutzten Vorrat am Dateiende wieder freigeben
+            self._file.truncate(HEADER_SIZE + self._count * RECORD_SIZE)
+            self._file.close()
+            self._file = None
+    
+    def close(self):
+        """Schließt die aktuelle Tagesdatei"""
+        with self._lock:
+            try:
+                self._close_file()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Fehler beim Schließen des Event-Speichers: {e}")
+
+
+def iter_event_files(directory: Path, start: Optional[date] = None,
+                     end: Optional[date] = None) -> Iterator[Path]:
+    """Tagesdateien im Zeitraum, chronologisch sortiert"""
+    if not directory.exists():
+        return
+    names = sorted(entry.name for entry in os.scandir(directory)
+                   if entry.name.startswith(FILE_PREFIX) and entry.name.endswith(FILE_SUFFIX))
+    for name in names:
+        try:
+            day = date.fromisoformat(name[len(FILE_PREFIX):-len(FILE_SUFFIX)])
+        except ValueError:
+            continue
+        if start and day < start:
+            continue
+        if end and day > end:
+            break
+        yield directory / name
+
+
+def read_event_file(path: Path, chunk_records: int = 4096) -> Iterator[StoredEvent]:
+    """Liest die gültigen Records einer Tagesdatei (konstanter Speicherbedarf)"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            return
+        magic, version, record_size, count = struct.unpack(HEADER_FORMAT, header)
+        if magic != STORE_MAGIC or version != STORE_VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"Keine gültige Event-Datei: {path}")
+        
+        remaining = count
+        while remaining > 0:
+            chunk = f.read(min(remaining, chunk_records) * RECORD_SIZE)
+            usable = len(chunk) - len(chunk) % RECORD_SIZE
+            if not usable:
+                break
+            for record in struct.iter_unpack(RECORD_FORMAT, chunk[:usable]):
+                yield StoredEvent(*record)
+            remaining -= usable // RECORD_SIZE
+
+
+def iter_events(directory: Optional[Path] = None, start: Optional[date] = None,
+                end: Optional[date] = None) -> Iterator[StoredEvent]:
+    """Alle Events im Zeitraum (Tag für Tag gestreamt)"""
+    for path in iter_event_files(directory or DEFAULT_EVENT_DIR, start, end):
+        try:
+            yield from read_event_file(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Event-Datei übersprungen: {path.name}: {e}")
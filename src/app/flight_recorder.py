@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Flugschreiber für Crash- und Error-Reports
+Hält die letzten Log-Meldungen und Leistungswerte (Dekodierzeiten,
+Warteschlangen, RSS) in vorab angelegten Ringpuffern. Formatiert wird erst,
+wenn ein Report geschrieben wird.
+"""
+
+import time
+import logging
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .utils import get_rss_bytes
+
+LOG_CAPACITY = 500  # Letzte Log-Meldungen
+SAMPLE_CAPACITY = 64  # Letzte Werte pro Leistungszähler
+
+# Leistungszähler (Name -> Beschreibung für den Report)
+PERF_COUNTERS = {
+    'decode_ms': 'Dekodieren und Skalieren (ms)',
+    'event_queue': 'Wartende Sensor-Events',
+    'log_queue': 'Wartende Log-Meldungen',
+    'rss_mb': 'Arbeitsspeicher RSS (MB)',
+}
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Behält die letzten capacity Log-Records (ohne Formatieren, ohne Lock)
+    
+    Pro Meldung wird nur ein Tupel in einen vorab angelegten Slot
+    geschrieben. Treffen zwei Threads genau gleichzeitig ein, kann eine
+    Meldung überschrieben werden - für den Flugschreiber unerheblich.
+    """
+    
+    def __init__(self, capacity: int = LOG_CAPACITY, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.capacity = capacity
+        self._slots: List[Optional[tuple]] = [None] * capacity
+        self._next = 0
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.level:
+            self.emit(record)
+        return True
+    
+    def emit(self, record: logging.LogRecord):
+        index = self._next
+        self._next = index + 1
+        # Keine exc_info: Tracebacks würden ganze Frames am Leben halten
+        self._slots[index % self.capacity] = (record.created, record.levelname, record.name,
+                                              record.msg, record.args)
+    
+    def lines(self, limit: Optional[int] = None) -> List[str]:
+        """Die letzten Meldungen als Textzeilen (älteste zuerst)"""
+        end = self._next
+        count = min(end, self.capacity, limit if limit is not None else self.capacity)
+        lines = []
+        for index in range(end - count, end):
+            entry = self._slots[index % self.capacity]
+            if entry is None:
+                continue
+            created, levelname, name, msg, args = entry
+            try:
+                message = str(msg) % args if args else str(msg)
+            except Exception:
+                message = f"{msg} {args!r}"
+            stamp = datetime.fromtimestamp(created).strftime('%H:%M:%S.%f')[:-3]
+            lines.append(f"{stamp} {levelname:8s} {name}: {message}")
+        return lines
+
+
+class PerfCounters:
+    """Letzte Werte pro Zähler in festen Ringpuffern (array('d'))"""
+    
+    def __init__(self, capacity: int = SAMPLE_CAPACITY):
+        self.capacity = capacity
+        self._values: Dict[str, array] = {}
+        self._times: Dict[str, array] = {}
+        self._counts: Dict[str, int] = {}
+        for name in PERF_COUNTERS:
+            self._allocate(name)
+    
+    def _allocate(self, name: str):
+        self._values[name] = array('d', bytes(8 * self.capacity))
+        self._times[name] = array('d', bytes(8 * self.capacity))
+        self._counts[name] = 0
+    
+    def sample(self, name: str, value: float, timestamp: Optional[float] = None):
+        """Speichert einen Wert (unbekannte Zähler werden beim ersten Mal angelegt)"""
+        if name not in self._counts:
+            self._allocate(name)
+        index = self._counts[name]
+        self._counts[name] = index + 1
+        slot = index % self.capacity
+        self._values[name][slot] = value
+        self._times[name][slot] = timestamp if timestamp is not None else time.time()
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Letzter Wert, Minimum, Maximum und Mittel der gespeicherten Werte pro Zähler"""
+        result = {}
+        for name, total in self._counts.items():
+            count = min(total, self.capacity)
+            if not count:
+                continue
+            values = self._values[name]
+            last = (total - 1) % self.capacity
+            recent = values[:count] if total <= self.capacity else values
+            result[name] = {
+                'last': values[last],
+                'last_time': self._times[name][last],
+                'min': min(recent),
+                'max': max(recent),
+                'mean': sum(recent) / count,
+                'samples': total,
+            }
+        return result
+
+
+class FlightRecorder:
+    """Log-Ringpuffer und Leistungszähler für die Reports"""
+    
+    def __init__(self, log_capacity: int = LOG_CAPACITY, sample_capacity: int = SAMPLE_CAPACITY):
+        self.handler = RingBufferHandler(log_capacity)
+        self.counters = PerfCounters(sample_capacity)
+    
+    def install(self, target: Optional[logging.Logger] = None):
+        """Hängt den Ringpuffer an einen Logger (Standard: Root-Logger)"""
+        target = target or logging.getLogger()
+        if self.handler not in target.handlers:
+            target.addHandler(self.handler)
+    
+    def sample(self, name: str, value: float):
+        """Speichert einen Leistungswert (siehe PERF_COUNTERS)"""
+        self.counters.sample(name, value)
+    
+    def sample_system(self):
+        """Speichert RSS und die Länge der Log-Queue"""
+        from .logging_setup import queue_depth
+        self.counters.sample('rss_mb', get_rss_bytes() / 1e6)
+        self.counters.sample('log_queue', queue_depth())
+    
+    def snapshot(self, log_limit: Optional[int] = None) -> Dict[str, Any]:
+        """JSON-fähiger Auszug für einen Report"""
+        self.sample_system()
+        return {'log': self.handler.lines(log_limit), 'perf': self.counters.summary()}
+
+
+def render_snapshot(snapshot: Optional[Dict[str, Any]]) -> str:
+    """Markdown-Abschnitte zu einem Auszug (leer wenn nichts aufgezeichnet wurde)"""
+    if not snapshot:
+        return ""
+    report = ""
+    
+    perf = snapshot.get('perf') or {}
+    if perf:
+        report += "## Leistungswerte (zuletzt)\n"
+        report += "| Zähler | Letzter | Min | Max | Mittel | Werte |\n"
+        report += "|--------|---------|-----|-----|--------|-------|\n"
+        for name, values in perf.items():
+            label = PERF_COUNTERS.get(name, name)
+            report += (f"| {label} | {values['last']:.1f} | {values['min']:.1f} | {values['max']:.1f} "
+                       f"| {values['mean']:.1f} | {values['samples']} |\n")
+        report += "\n"
+    
+    lines = snapshot.get('log') or []
+    if lines:
+        report += f"## Letzte Log-Meldungen ({len(lines)})\n```\n"
+        report += "\n".join(lines)
+        report += "\n```\n\n"
+    
+    return report
+
+
+# Globale Instanz
+_flight_recorder: Optional[FlightRecorder] = None
+
+
+def get_flight_recorder() -> FlightRecorder:
+    """Gibt die globale FlightRecorder-Instanz zurück"""
+    global _flight_recorder
+    if _flight_recorder is None:
+        _flight_recorder = FlightRecorder()
+    return _flight_recorder
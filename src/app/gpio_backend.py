@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+GPIO-Backends für Sensor-Eingänge
+Kapselt RPi.GPIO und stellt ein Mock-Backend für Tests ohne Raspberry Pi bereit
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import RPi.GPIO as GPIO
+    GPIO_AVAILABLE = True
+except (ImportError, RuntimeError):
+    GPIO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Callback-Signatur: callback(pin, level)
+EdgeCallback = Callable[[int, int], None]
+
+
+class GPIOBackend:
+    """Basisklasse für GPIO-Backends"""
+    
+    name = "base"
+    
+    def setup_input(self, pin: int):
+        """Konfiguriert einen Pin als Eingang (mit Pull-Down)"""
+        raise NotImplementedError
+    
+    def read(self, pin: int) -> int:
+        """Liest den aktuellen Pegel eines Pins (0 oder 1)"""
+        raise NotImplementedError
+    
+    def add_edge_callback(self, pin: int, callback: EdgeCallback) -> bool:
+        """
+        Registriert einen Callback für steigende und fallende Flanken
+        
+        Args:
+            pin: GPIO Pin-Nummer (BCM)
+            callback: Funktion callback(pin, level)
+        
+        Returns:
+            True wenn Flankenerkennung aktiv ist, False wenn nicht unterstützt
+        """
+        return False
+    
+    def remove_edge_callback(self, pin: int):
+        """Entfernt die Flankenerkennung für einen Pin"""
+        pass
+    
+    def cleanup(self, pin: int):
+        """Gibt einen Pin wieder frei"""
+        pass
+
+
+class RPiGPIOBackend(GPIOBackend):
+    """Backend auf Basis von RPi.GPIO (Flankenerkennung per add_event_detect)"""
+    
+    name = "rpi-gpio"
+    
+    def __init__(self):
+        if not GPIO_AVAILABLE:
+            raise RuntimeError("RPi.GPIO nicht verfügbar")
+        GPIO.setmode(GPIO.BCM)
+    
+    def setup_input(self, pin: int):
+        GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+    
+    def read(self, pin: int) -> int:
+        return 1 if GPIO.input(pin) == GPIO.HIGH else 0
+    
+    def add_edge_callback(self, pin: int, callback: EdgeCallback) -> bool:
+        try:
+            GPIO.add_event_detect(
+                pin,
+                GPIO.BOTH,
+                callback=lambda channel: callback(channel, self.read(channel))
+            )
+            return True
+        except RuntimeError as e:
+            # z.B. "Failed to add edge detection" bei neueren Kerneln
+            logger.warning(f"Flankenerkennung auf Pin {pin} nicht möglich: {e}")
+            return False
+    
+    def remove_edge_callback(self, pin: int):
+        try:
+            GPIO.remove_event_detect(pin)
+        except Exception:
+            pass
+    
+    def cleanup(self, pin: int):
+        GPIO.cleanup(pin)
+
+
+class MockGPIOBackend(GPIOBackend):
+    """
+    Simuliertes GPIO-Backend für normale Linux-Rechner
+    
+    Pegel werden per set_level() gesetzt. Flanken-Callbacks laufen wie bei
+    RPi.GPIO in einem eigenen Thread. Der Zeitpunkt jeder Flanke wird
+    festgehalten, damit Latenzen gemessen werden können.
+    """
+    
+    name = "mock"
+    
+    def __init__(self, edge_detection: bool = True):
+        """
+        Args:
+            edge_detection: False simuliert ein System ohne Flankenerkennung
+        """
+        self.edge_detection = edge_detection
+        self.levels: Dict[int, int] = {}
+        self.last_edge_time: Dict[int, float] = {}
+        self.read_count = 0
+        self._callbacks: Dict[int, EdgeCallback] = {}
+        self._queue: "queue.Queue" = queue.Queue()
+        self._dispatcher: Optional[threading.Thread] = None
+    
+    def setup_input(self, pin: int):
+        self.levels.setdefault(pin, 0)
+    
+    def read(self, pin: int) -> int:
+        self.read_count += 1
+        return self.levels.get(pin, 0)
+    
+    def set_level(self, pin: int, level: int):
+        """Setzt den Pegel eines Pins und löst ggf. einen Flanken-Callback aus"""
+        level = 1 if level else 0
+        if self.levels.get(pin, 0) == level:
+            return
+        
+        self.levels[pin] = level
+        self.last_edge_time[pin] = time.perf_counter()
+        
+        if pin in self._callbacks:
+            self._queue.put((pin, level))
+    
+    def add_edge_callback(self, pin: int, callback: EdgeCallback) -> bool:
+        if not self.edge_detection:
+            return False
+        
+        self._callbacks[pin] = callback
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+            self._dispatcher.start()
+        return True
+    
+    def remove_edge_callback(self, pin: int):
+        self._callbacks.pop(pin, None)
+    
+    def cleanup(self, pin: int):
+        self.remove_edge_callback(pin)
+        self.levels.pop(pin, None)
+    
+    def _dispatch_loop(self):
+        """Ruft Flanken-Callbacks nacheinander auf (wie der RPi.GPIO-Thread)"""
+        while True:
+            pin, level = self._queue.get()
+            callback = self._callbacks.get(pin)
+            if callback:
+                try:
+                    callback(pin, level)
+                except Exception as e:
+                    logger.error(f"Fehler im Flanken-Callback für Pin {pin}: {e}")
+
+
+def get_gpio_backend() -> Optional[GPIOBackend]:
+    """
+    Gibt das Standard-Backend zurück
+    
+    Returns:
+        RPiGPIOBackend oder None wenn kein GPIO verfügbar ist
+    """
+    if not GPIO_AVAILABLE:
+        return None
+    try:
+        return RPiGPIOBackend()
+    except Exception as e:
+        logger.error(f"GPIO-Backend konnte nicht initialisiert werden: {e}")
+        return None
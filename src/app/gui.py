@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import logging
 from pathlib import Path
+from dataclasses import replace
 from typing import Optional, Callable
 
 from .config import ConfigManager, AppConfig
@@ -18,13 +19,15 @@ logger = logging.getLogger(__name__)
 class ConfigGUI:
     """Konfigurationsfenster"""
     
-    def __init__(self, config_manager: ConfigManager, on_start_callback: Optional[Callable] = None):
+    def __init__(self, config_manager: ConfigManager, on_start_callback: Optional[Callable] = None,
+                 master: Optional[tk.Misc] = None):
         """
         Initialisiert das GUI
         
         Args:
             config_manager: ConfigManager-Instanz
             on_start_callback: Callback wenn Start-Button geklickt wird
+            master: Bestehendes Tk-Hauptfenster (Fenster wird dann als Toplevel erstellt)
         """
         self.config_manager = config_manager
         self.config = config_manager.get()
@@ -35,14 +38,15 @@ class ConfigGUI:
         self.available_modes = self.sensor_detector.get_available_modes()
         self.pir_available = self.sensor_detector.is_pir_available()
         
-        # Hauptfenster
-        self.root = tk.Tk()
+        # Hauptfenster (eigenes oder Toplevel der laufenden Anwendung)
+        self.root = tk.Toplevel(master) if master is not None else tk.Tk()
         self.root.title("Eingangsbereich Display - Konfiguration")
         self.root.geometry("850x700")
         self.root.resizable(True, True)
         
         # Minimale Fenstergröße
         self.root.minsize(800, 600)
+        self.root.protocol("WM_DELETE_WINDOW", self._quit)
         
         # Variablen
         self.vars = {}
@@ -425,8 +429,9 @@ class ConfigGUI:
             except:
                 hide_cursor_value = True
             
-            # Erstelle neue Config mit Werten aus GUI
-            new_config = AppConfig(
+            # Erstelle neue Config mit Werten aus GUI (übrige Felder aus der aktuellen, ggf. neu geladenen Config)
+            new_config = replace(
+                self.config_manager.get(),
                 display_mode=display_mode,
                 pir_pin=self.vars['pir_pin'].get(),
                 screen_timeout=self.vars['screen_timeout'].get(),
@@ -482,7 +487,8 @@ class ConfigGUI:
                 hide_cursor_value = True
             
             # Erstelle neue Config
-            new_config = AppConfig(
+            new_config = replace(
+                self.config_manager.get(),
                 display_mode=display_mode,
                 pir_pin=self.vars['pir_pin'].get(),
                 screen_timeout=self.vars['screen_timeout'].get(),
@@ -522,7 +528,8 @@ class ConfigGUI:
     
     def _quit(self):
         """Beendet die Anwendung"""
-        if messagebox.askokcancel("Beenden", "Möchten Sie die Anwendung wirklich beenden?"):
+        if messagebox.askokcancel("Beenden", "Möchten Sie die Anwendung wirklich beenden?",
+                                  parent=self.root):
             self.root.destroy()
             import sys
             sys.exit(0)
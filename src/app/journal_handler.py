@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Log-Handler für das native journald-Protokoll
+Jede Meldung geht als strukturierter Eintrag direkt an den journald-Socket
+(PRIORITY, LOGGER, CODE_FILE, ERROR_HASH, IMAGE_PATH ...), statt als Text
+über die stdout-Pipe. Auswerten z.B. mit
+journalctl -u raspi-app.service ERROR_HASH=0123456789ab oder -F IMAGE_PATH.
+"""
+
+import os
+import fcntl
+import errno
+import socket
+import struct
+import logging
+from typing import Dict, List, Optional
+
+JOURNAL_SOCKET = '/run/systemd/journal/socket'
+SYSLOG_IDENTIFIER = 'raspi-app'
+
+# logging-Level -> syslog-Priorität
+PRIORITIES = {
+    logging.CRITICAL: 2,
+    logging.ERROR: 3,
+    logging.WARNING: 4,
+    logging.INFO: 6,
+    logging.DEBUG: 7,
+}
+
+# Zusätzliche Record-Attribute (logger.x(..., extra={...})) -> Journal-Feld
+EXTRA_FIELDS = {
+    'error_hash': 'ERROR_HASH',
+    'image_path': 'IMAGE_PATH',
+    'display_mode': 'DISPLAY_MODE',
+}
+
+
+def journal_available(path: str = JOURNAL_SOCKET) -> bool:
+    """True wenn der Prozess unter systemd mit Journal läuft"""
+    return bool(os.environ.get('JOURNAL_STREAM')) and os.path.exists(path)
+
+
+def encode_field(name: str, value: str) -> bytes:
+    """Ein Feld im nativen Format (Werte mit Zeilenumbruch mit Längenangabe)"""
+    data = value.encode('utf-8', 'replace')
+    if b'\n' in data:
+        return name.encode('ascii') + b'\n' + struct.pack('<Q', len(data)) + data + b'\n'
+    return name.encode('ascii') + b'=' + data + b'\n'
+
+
+def decode_entry(data: bytes) -> Dict[str, str]:
+    """Zerlegt einen Eintrag im nativen Format (z.B. für Tests mit eigenem Socket)"""
+    fields = {}
+    offset = 0
+    while offset < len(data):
+        end = data.index(b'\n', offset)
+        line = data[offset:end]
+        if b'=' in line:
+            name, _, value = line.partition(b'=')
+            offset = end + 1
+        else:
+            name = line
+            (length,) = struct.unpack_from('<Q', data, end + 1)
+            start = end + 1 + 8
+            value = data[start:start + length]
+            offset = start + length + 1
+        fields[name.decode('ascii')] = value.decode('utf-8', 'replace')
+    return fields
+
+
+class JournalHandler(logging.Handler):
+    """
+    Schreibt Records als native journald-Einträge (ein Datagramm pro Eintrag)
+    
+    Gedacht für den Hintergrund-Thread aus logging_setup: Meldungen eines
+    Bursts werden dort nacheinander über denselben verbundenen Socket
+    verschickt. Einträge über der Datagramm-Grenze gehen wie bei
+    sd_journal_send als memfd hinterher.
+    """
+    
+    def __init__(self, socket_path: str = JOURNAL_SOCKET, identifier: str = SYSLOG_IDENTIFIER,
+                 level: int = logging.NOTSET):
+        super().__init__(level)
+        self.socket_path = socket_path
+        self.identifier = identifier
+        self.sent = 0
+        self.failed = 0
+        self._socket: Optional[socket.socket] = None
+        self._common = encode_field('SYSLOG_IDENTIFIER', identifier) + encode_field('SYSLOG_PID', str(os.getpid()))
+    
+    def _connect(self) -> socket.socket:
+        if self._socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.connect(self.socket_path)
+            self._socket = sock
+        return self._socket
+    
+    def build(self, record: logging.LogRecord) -> bytes:
+        """Kodiert einen Record als Journal-Eintrag"""
+        message = self.format(record)
+        parts: List[bytes] = [
+            encode_field('MESSAGE', message),
+            encode_field('PRIORITY', str(PRIORITIES.get(record.levelno, 6))),
+            encode_field('LOGGER', record.name),
+            encode_field('CODE_FILE', record.pathname or ''),
+            encode_field('CODE_LINE', str(record.lineno)),
+            encode_field('CODE_FUNC', record.funcName or ''),
+            encode_field('THREAD_NAME', record.threadName or ''),
+        ]
+        for attribute, name in EXTRA_FIELDS.items():
+            value = getattr(record, attribute, None)
+            if value is not None:
+                parts.append(encode_field(name, str(value)))
+        parts.append(self._common)
+        return b''.join(parts)
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            data = self.build(record)
+            try:
+                self._connect().send(data)
+            except OSError as e:
+                if e.errno not in (errno.EMSGSIZE, errno.ENOBUFS):
+                    raise
+                self._send_memfd(data)
+            self.sent += 1
+        except Exception:
+            self.failed += 1
+            self._close_socket()
+            if self.failed == 1:
+                self.handleError(record)  # Nur beim ersten Fehler melden, danach nur zählen
+    
+    def _send_memfd(self, data: bytes):
+        """Großer Eintrag: Inhalt in ein memfd schreiben und den Deskriptor senden"""
+        fd = os.memfd_create('raspi-app-journal', os.MFD_ALLOW_SEALING)
+        try:
+            os.write(fd, data)
+            # journald nimmt nur versiegelte memfds an
+            fcntl.fcntl(fd, fcntl.F_ADD_SEALS,
+                        fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_GROW | fcntl.F_SEAL_WRITE | fcntl.F_SEAL_SEAL)
+            socket.send_fds(self._connect(), [b''], [fd])
+        finally:
+            os.close(fd)
+    
+    def _close_socket(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+    
+    def close(self):
+        self._close_socket()
+        super().close()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Zuletzt angezeigtes Bild für den schnellen Start
+Das Bild wird fertig skaliert als PPM gespeichert, das Tk ohne PIL lesen
+kann. Position in der Bildliste und Herkunft des Bildes stehen im
+Zustands-Snapshot (siehe state).
+"""
+
+import os
+import logging
+import tkinter as tk
+from pathlib import Path
+from typing import Any, List, Optional
+
+from .config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+LAST_FRAME_FILE = DATA_DIR / 'last_frame.ppm'
+
+
+class LastFrame:
+    """Speichert und lädt das letzte Bild (PPM)"""
+    
+    def __init__(self, path: Path = LAST_FRAME_FILE):
+        self.path = Path(path)
+        self.saved_image: Optional[Path] = None  # Bild in der Datei (dieser oder letzter Lauf)
+        self.saved_size: Optional[List[int]] = None  # Dessen Größe [Breite, Höhe]
+    
+    def is_saved(self, image_path: Path, size: Optional[List[int]] = None) -> bool:
+        """True wenn die Datei genau dieses Bild (in dieser Größe) schon enthält"""
+        return image_path == self.saved_image and (size is None or size == self.saved_size)
+    
+    def save(self, widget: tk.Misc, photo: Any, image_path: Path, size: Optional[List[int]] = None) -> bool:
+        """
+        Schreibt das angezeigte Bild (atomar, nur wenn es sich geändert hat)
+        
+        Ein Vollbild-PPM hat mehrere MB - unverändert wird es nicht erneut
+        auf die SD-Karte geschrieben.
+        
+        Args:
+            widget: Beliebiges Tk-Widget (für den Tk-Interpreter)
+            photo: Angezeigtes Tk-Bild (tk.PhotoImage oder ImageTk.PhotoImage)
+            image_path: Datei, aus der das Bild stammt
+            size: Angezeigte Größe [Breite, Höhe]
+        
+        Returns:
+            True bei Erfolg (auch wenn nichts zu schreiben war)
+        """
+        if self.is_saved(image_path, size):
+            return True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_suffix('.tmp')
+            # Tk schreibt das fertig skalierte Bild selbst (kein PIL nötig)
+            widget.tk.call(str(photo), 'write', str(tmp_file), '-format', 'ppm')
+            # Erst auf der Karte, dann umbenennen (auch bei Stromausfall nie halb)
+            fd = os.open(tmp_file, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, self.path)
+        except (OSError, tk.TclError) as e:
+            logger.warning(f"Letztes Bild konnte nicht gespeichert werden: {e}")
+            return False
+        
+        self.saved_image = image_path
+        self.saved_size = size
+        logger.debug("Letztes Bild gespeichert: %s", image_path.name)
+        return True
+    
+    def load_photo(self, master: tk.Misc) -> Optional[tk.PhotoImage]:
+        """Lädt das gespeicherte Bild als tk.PhotoImage (None wenn keins vorhanden)"""
+        if not self.path.exists():
+            return None
+        try:
+            return tk.PhotoImage(master=master, file=str(self.path))
+        except tk.TclError as e:
+            logger.warning(f"Letztes Bild nicht lesbar: {e}")
+            return None
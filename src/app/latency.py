@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Latenz-Messung für den Weg Bewegung -> Bildschirm an -> erstes Bild
+"""
+
+import time
+import logging
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """Histogramm mit festen, logarithmisch wachsenden Buckets (Millisekunden)"""
+    
+    BOUNDS_MS: Sequence[float] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+    
+    def __init__(self, bounds_ms: Optional[Sequence[float]] = None):
+        self.bounds = tuple(bounds_ms or self.BOUNDS_MS)
+        # Letzter Bucket: alles über der größten Grenze
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def record(self, value_ms: float):
+        """Fügt einen Messwert hinzu"""
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+    
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def percentile(self, p: float) -> float:
+        """
+        Näherungsweises Perzentil (obere Bucket-Grenze)
+        
+        Args:
+            p: Perzentil zwischen 0 und 100
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(self.count * p / 100.0)))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+    
+    def format(self) -> str:
+        """Gibt das Histogramm als Text zurück"""
+        lines = []
+        lower = 0
+        for i, count in enumerate(self.counts):
+            if i < len(self.bounds):
+                label = f"{lower:>6g}-{self.bounds[i]:<6g}ms"
+                lower = self.bounds[i]
+            else:
+                label = f"{lower:>6g}+      ms"
+            bar = '#' * min(count, 50)
+            lines.append(f"  {label} {count:6d} {bar}")
+        return '\n'.join(lines)
+
+
+class MotionLatencyTracker:
+    """
+    Zeitstempel für jede Stufe eines Aufweck-Vorgangs
+    
+    Alle Stufen werden relativ zur Sensor-Flanke gemessen:
+      dispatch    - Event im Tk-Thread angekommen (_on_motion_detected)
+      screen_on   - ScreenController.turn_on() abgeschlossen
+      first_frame - erstes Bild nach dem Einschalten gezeichnet
+    """
+    
+    STAGES = ('dispatch', 'screen_on', 'first_frame')
+    
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {
+            stage: LatencyHistogram() for stage in self.STAGES
+        }
+        self.samples = 0
+        self._edge_time: Optional[float] = None
+        self._marks: Dict[str, float] = {}
+    
+    def begin(self, edge_time: float):
+        """Startet eine Messung (edge_time in time.time()-Sekunden)"""
+        self._edge_time = edge_time
+        self._marks = {}
+        self.mark('dispatch')
+    
+    def mark(self, stage: str):
+        """Setzt den Zeitstempel einer Stufe der laufenden Messung"""
+        if self._edge_time is None or stage in self._marks:
+            return
+        self._marks[stage] = time.time()
+    
+    def finish(self) -> Optional[Dict[str, float]]:
+        """
+        Schließt die laufende Messung ab und trägt sie in die Histogramme ein
+        
+        Returns:
+            Latenzen pro Stufe in ms oder None wenn keine Messung lief
+        """
+        if self._edge_time is None:
+            return None
+        
+        result = {
+            stage: (self._marks[stage] - self._edge_time) * 1000
+            for stage in self.STAGES if stage in self._marks
+        }
+        for stage, value in result.items():
+            self.histograms[stage].record(value)
+        
+        self.samples += 1
+        self._edge_time = None
+        logger.info("Aufweck-Latenz: " + ", ".join(f"{s}={v:.1f}ms" for s, v in result.items()))
+        return result
+    
+    def is_active(self) -> bool:
+        """True wenn gerade eine Messung läuft"""
+        return self._edge_time is not None
+    
+    def summary(self) -> str:
+        """Kurze Zusammenfassung (Median/p95/max pro Stufe)"""
+        parts = []
+        for stage in self.STAGES:
+            hist = self.histograms[stage]
+            if hist.count:
+                parts.append(f"{stage}: p50≤{hist.percentile(50):g}ms p95≤{hist.percentile(95):g}ms "
+                             f"max={hist.max:.1f}ms")
+        return f"{self.samples} Messungen - " + " | ".join(parts) if parts else "keine Messungen"
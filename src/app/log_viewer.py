@@ -4,75 +4,238 @@ Log-Viewer für Crash-Reports und Error-Logs
 Kann als eigenständiges Tool verwendet werden
 """
 
+import os
 import sys
+import json
+import heapq
+import itertools
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
 import argparse
 
+from .error_store import ErrorStore, parse_report_id, render_report
 
-def list_logs(log_dir: Path, log_type: str = 'all'):
+
+class LogEntry(NamedTuple):
+    """Ein Crash- oder Error-Report in der Übersicht"""
+    timestamp: float
+    kind: str  # 'crash' oder 'error'
+    name: str
+    error_hash: str = ''
+    size: int = 0  # Bytes (0 bei Einträgen im Error-Speicher)
+    path: Optional[Path] = None  # Markdown-Datei (Crash-Reports, Error-Reports im alten Format)
+    
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'type': self.kind,
+            'name': self.name,
+            'time': datetime.fromtimestamp(self.timestamp).isoformat(timespec='seconds'),
+            'timestamp': self.timestamp,
+            'hash': self.error_hash or None,
+            'size': self.size or None,
+        }
+
+
+class LogFilter(NamedTuple):
+    """Filter für list (None = kein Filter)"""
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    error_hash: Optional[str] = None
+    text: Optional[str] = None
+    
+    def in_range(self, timestamp: float) -> bool:
+        if self.since and timestamp < self.since.timestamp():
+            return False
+        if self.until and timestamp > self.until.timestamp():
+            return False
+        return True
+
+
+def parse_time(value: str) -> datetime:
+    """Zeitpunkt für --since/--until: '2025-11-26', '2025-11-26 14:30' oder relativ '12h', '7d'"""
+    value = value.strip()
+    units = {'m': 60, 'h': 3600, 'd': 86400}
+    if value[-1:] in units and value[:-1].isdigit():
+        return datetime.now() - timedelta(seconds=int(value[:-1]) * units[value[-1]])
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültige Zeitangabe: {value}")
+
+
+def parse_until(value: str) -> datetime:
+    """Wie parse_time, ein reines Datum ('2025-11-26') meint aber das Ende dieses Tages"""
+    try:
+        day = date.fromisoformat(value.strip())
+    except ValueError:
+        return parse_time(value)
+    return datetime.combine(day, time.max)
+
+
+def _file_entries(directory: Path, kind: str, log_filter: LogFilter) -> List[LogEntry]:
+    """Markdown-Reports eines Verzeichnisses (ein scandir, ein stat pro Datei)"""
+    entries = []
+    try:
+        scan = os.scandir(directory)
+    except OSError:
+        return entries
+    with scan:
+        for item in scan:
+            if not item.name.endswith('.md'):
+                continue
+            parsed = parse_report_id(item.name)
+            error_hash = parsed[1] if parsed else ''
+            if log_filter.error_hash and error_hash != log_filter.error_hash:
+                continue
+            try:
+                stat = item.stat()
+            except OSError:
+                continue
+            # Zeitpunkt aus dem Namen (wie beim Schreiben), sonst Änderungszeit
+            timestamp = parsed[0].timestamp() if parsed else _crash_time(item.name, stat.st_mtime)
+            if not log_filter.in_range(timestamp):
+                continue
+            if log_filter.text and not _file_contains(Path(item.path), log_filter.text):
+                continue
+            entries.append(LogEntry(timestamp, kind, item.name, error_hash, stat.st_size, Path(item.path)))
+    entries.sort(key=lambda e: e.timestamp, reverse=True)
+    return entries
+
+
+def _crash_time(name: str, fallback: float) -> float:
+    """Zeitpunkt aus 'crash-YYYYMMDD-HHMMSS.md'"""
+    try:
+        return datetime.strptime(name[len('crash-'):len('crash-') + 15], '%Y%m%d-%H%M%S').timestamp()
+    except ValueError:
+        return fallback
+
+
+def _file_contains(path: Path, text: str) -> bool:
+    try:
+        return text.lower() in path.read_text(encoding='utf-8', errors='replace').lower()
+    except OSError:
+        return False
+
+
+def _record_matches(raw: bytes, text: str) -> bool:
+    """Textsuche in Typ, Nachricht, Traceback und Kontext eines gespeicherten Fehlers"""
+    needle = text.lower()
+    # Schneller Vorfilter auf der rohen Zeile (nur wenn JSON den Text nicht maskiert)
+    if not any(c in needle for c in '"\\') and needle.isprintable() \
+            and needle not in raw.decode('utf-8', 'replace').lower():
+        return False
+    try:
+        record = json.loads(raw)
+    except ValueError:
+        return False
+    fields = [record.get('error_type'), record.get('error_message'), record.get('traceback')]
+    fields.extend((record.get('context') or {}).values())
+    return any(needle in str(value).lower() for value in fields if value)
+
+
+def _store_entries(store: ErrorStore, log_filter: LogFilter) -> Iterator[LogEntry]:
+    """Einträge des Error-Speichers, neueste zuerst (nur Index, außer bei Textsuche)"""
+    start = log_filter.since.date() if log_filter.since else None
+    end = log_filter.until.date() if log_filter.until else None
+    if log_filter.text:
+        source = ((entry, raw) for entry, raw in store.iter_lines(start, end, log_filter.error_hash, newest_first=True)
+                  if _record_matches(raw, log_filter.text))
+    else:
+        source = ((entry, None) for entry in store.iter_entries(start, end, log_filter.error_hash, newest_first=True))
+    for entry, _ in source:
+        if log_filter.in_range(entry.timestamp):
+            yield LogEntry(entry.timestamp, 'error', entry.report_id, entry.error_hash)
+
+
+def iter_logs(log_dir: Path, log_type: str = 'all', log_filter: LogFilter = LogFilter()) -> Iterator[LogEntry]:
+    """
+    Alle passenden Reports, neueste zuerst (gestreamt)
+    
+    Crash-Reports und Error-Reports im alten Format liegen als einzelne
+    Dateien vor (ein stat pro Datei), Fehler im Error-Speicher werden
+    über den Index tageweise gelesen.
+    """
+    sources = []
+    if log_type in ['crash', 'all'] and not log_filter.error_hash:
+        sources.append(_file_entries(log_dir / 'crashes', 'crash', log_filter))
+    if log_type in ['error', 'all']:
+        sources.append(_file_entries(log_dir / 'errors', 'error', log_filter))
+        sources.append(_store_entries(ErrorStore(log_dir / 'errors'), log_filter))
+    return heapq.merge(*sources, key=lambda e: e.timestamp, reverse=True)
+
+
+def list_logs(log_dir: Path, log_type: str = 'all', log_filter: LogFilter = LogFilter(),
+              limit: int = 20, offset: int = 0, as_json: bool = False):
     """
-    Listet alle Logs auf
+    Listet Logs seitenweise auf (neueste zuerst)
     
     Args:
         log_dir: Log-Verzeichnis
         log_type: 'crash', 'error' oder 'all'
+        log_filter: Zeitraum, Hash und Text
+        limit: Einträge pro Seite (0 = alle)
+        offset: Übersprungene Einträge (für weitere Seiten)
+        as_json: Eine JSON-Zeile pro Eintrag statt Tabelle
     """
-    crash_dir = log_dir / 'crashes'
-    error_dir = log_dir / 'errors'
+    entries = iter_logs(log_dir, log_type, log_filter)
+    stop = offset + limit + 1 if limit else None  # Ein Eintrag mehr: gibt es eine weitere Seite?
+    page = itertools.islice(entries, offset, stop)
     
+    if as_json:
+        for i, entry in enumerate(page):
+            if limit and i == limit:
+                break
+            print(json.dumps(entry.to_json(), ensure_ascii=False))
+        return
+    
+    titles = {'crash': "💥 CRASH-REPORTS", 'error': "⚠️  ERROR-REPORTS", 'all': "💥 CRASH- UND ⚠️  ERROR-REPORTS"}
     print("\n" + "="*70)
     print("📋 LOG-ÜBERSICHT")
     print("="*70 + "\n")
+    print(f"{titles[log_type]}:")
+    print("-" * 70)
     
-    if log_type in ['crash', 'all']:
-        print("💥 CRASH-REPORTS:")
-        print("-" * 70)
-        crashes = sorted(crash_dir.glob('*.md'), key=lambda x: x.stat().st_mtime, reverse=True)
-        
-        if crashes:
-            for i, crash_file in enumerate(crashes, 1):
-                mtime = datetime.fromtimestamp(crash_file.stat().st_mtime)
-                size = crash_file.stat().st_size
-                print(f"{i:3d}. {crash_file.name:50s} {mtime.strftime('%d.%m.%Y %H:%M')} ({size:,} bytes)")
-        else:
-            print("  Keine Crash-Reports gefunden ✓")
-        print()
+    shown = 0
+    more = False
+    for entry in page:
+        if limit and shown == limit:
+            more = True
+            break
+        shown += 1
+        when = datetime.fromtimestamp(entry.timestamp).strftime('%d.%m.%Y %H:%M')
+        icon = '💥' if entry.kind == 'crash' else '⚠️ '
+        size = f" ({entry.size:,} bytes)" if entry.size else ""
+        print(f"{offset + shown:5d}. {icon} {entry.name:44s} {when}{size}")
     
-    if log_type in ['error', 'all']:
-        print("⚠️  ERROR-REPORTS:")
-        print("-" * 70)
-        errors = sorted(error_dir.glob('*.md'), key=lambda x: x.stat().st_mtime, reverse=True)
-        
-        if errors:
-            # Zeige nur die neuesten 20
-            for i, error_file in enumerate(errors[:20], 1):
-                mtime = datetime.fromtimestamp(error_file.stat().st_mtime)
-                size = error_file.stat().st_size
-                print(f"{i:3d}. {error_file.name:50s} {mtime.strftime('%d.%m.%Y %H:%M')} ({size:,} bytes)")
-            
-            if len(errors) > 20:
-                print(f"\n  ... und {len(errors) - 20} weitere Error-Reports")
-        else:
-            print("  Keine Error-Reports gefunden ✓")
-        print()
+    if not shown:
+        print("  Keine passenden Reports gefunden ✓" if offset == 0 else "  Keine weiteren Reports")
+    if more:
+        print(f"\n  ... weitere Reports: --offset {offset + shown}")
+    print()
     
     print("="*70)
     print(f"Log-Verzeichnis: {log_dir}")
     print("="*70 + "\n")
 
 
-def show_log(log_file: Path):
+def show_log(log_file: Path, as_json: bool = False):
     """
     Zeigt den Inhalt eines Logs an
     
     Args:
         log_file: Pfad zur Log-Datei
+        as_json: Name und Inhalt als JSON ausgeben
     """
     if not log_file.exists():
         print(f"❌ Datei nicht gefunden: {log_file}")
         return
     
+    if as_json:
+        print(json.dumps({'name': log_file.name, 'content': log_file.read_text(encoding='utf-8')},
+                         ensure_ascii=False))
+        return
+    
     print("\n" + "="*70)
     print(f"📄 {log_file.name}")
     print("="*70 + "\n")
@@ -84,7 +247,32 @@ def show_log(log_file: Path):
     print("\n" + "="*70 + "\n")
 
 
-def cleanup_logs(log_dir: Path, days: int = 30, dry_run: bool = False):
+def show_error(store: ErrorStore, name: str, as_json: bool = False) -> bool:
+    """
+    Zeigt einen Error-Report aus dem Speicher an (als Markdown erzeugt)
+    
+    Args:
+        store: Error-Speicher
+        name: Report-Name (error-YYYYMMDD-HHMMSS-HASH, .md optional)
+        as_json: Gespeicherte Datensätze als JSON ausgeben (eine Zeile pro Datensatz)
+    
+    Returns:
+        True wenn der Report gefunden wurde
+    """
+    records = store.find(name)
+    for record in records:
+        if as_json:
+            print(json.dumps(record, ensure_ascii=False))
+            continue
+        print("\n" + "="*70)
+        print(f"📄 {name}")
+        print("="*70 + "\n")
+        print(render_report(record))
+        print("\n" + "="*70 + "\n")
+    return bool(records)
+
+
+def cleanup_logs(log_dir: Path, days: int = 30, dry_run: bool = False, as_json: bool = False):
     """
     Löscht alte Logs
     
@@ -92,38 +280,55 @@ def cleanup_logs(log_dir: Path, days: int = 30, dry_run: bool = False):
         log_dir: Log-Verzeichnis
         days: Alter in Tagen
         dry_run: Wenn True, nur anzeigen ohne zu löschen
+        as_json: Nur eine Zusammenfassung als JSON ausgeben
     """
-    from datetime import timedelta
-    
     cutoff_time = datetime.now() - timedelta(days=days)
+    out = (lambda *args, **kwargs: None) if as_json else print
     
-    print("\n" + "="*70)
-    print(f"🗑️  LOG-CLEANUP (älter als {days} Tage)")
-    print("="*70 + "\n")
+    out("\n" + "="*70)
+    out(f"🗑️  LOG-CLEANUP (älter als {days} Tage)")
+    out("="*70 + "\n")
     
     deleted_count = 0
     total_size = 0
     
     for log_type, subdir in [('Crash', 'crashes'), ('Error', 'errors')]:
-        log_subdir = log_dir / subdir
         old_logs = []
-        
-        for log_file in log_subdir.glob('*.md'):
-            mtime = datetime.fromtimestamp(log_file.stat().st_mtime)
-            if mtime < cutoff_time:
-                size = log_file.stat().st_size
-                old_logs.append((log_file, mtime, size))
+        try:
+            with os.scandir(log_dir / subdir) as scan:
+                for item in scan:
+                    if not item.name.endswith('.md'):
+                        continue
+                    stat = item.stat()  # Ein stat pro Datei
+                    if stat.st_mtime < cutoff_time.timestamp():
+                        old_logs.append((Path(item.path), datetime.fromtimestamp(stat.st_mtime), stat.st_size))
+        except OSError:
+            pass
         
         if old_logs:
-            print(f"{log_type}-Reports:")
-            for log_file, mtime, size in old_logs:
-                print(f"  - {log_file.name} ({mtime.strftime('%d.%m.%Y')}, {size:,} bytes)")
+            out(f"{log_type}-Reports:")
+            for log_file, mtime, size in sorted(old_logs, key=lambda x: x[1]):
+                out(f"  - {log_file.name} ({mtime.strftime('%d.%m.%Y')}, {size:,} bytes)")
                 total_size += size
                 deleted_count += 1
                 
                 if not dry_run:
                     log_file.unlink()
-            print()
+            out()
+    
+    # Fehler werden tageweise gespeichert und als ganze Segmente gelöscht
+    dropped = ErrorStore(log_dir / 'errors').drop_before(cutoff_time.date(), dry_run=dry_run)
+    if dropped:
+        out("Error-Segmente:")
+        for day, entries, size in dropped:
+            out(f"  - {day.strftime('%d.%m.%Y')}: {entries} Fehler ({size:,} bytes)")
+            total_size += size
+            deleted_count += 1
+        out()
+    
+    if as_json:
+        print(json.dumps({'dry_run': dry_run, 'days': days, 'deleted': deleted_count, 'bytes': total_size}))
+        return
     
     if deleted_count > 0:
         action = "Würden gelöscht werden" if dry_run else "Gelöscht"
@@ -143,7 +348,11 @@ def main():
 Beispiele:
   %(prog)s list                    # Alle Logs auflisten
   %(prog)s list --type crash       # Nur Crash-Reports
+  %(prog)s list --offset 20        # Nächste Seite
+  %(prog)s list --since 7d --grep Timeout   # Letzte 7 Tage, Text in Fehlermeldung
+  %(prog)s list --hash 0123456789ab --limit 0 --json   # Alle Vorkommen als JSON-Zeilen
   %(prog)s show crash-*.md         # Crash-Report anzeigen
+  %(prog)s show error-*            # Error-Report anzeigen
   %(prog)s cleanup --days 30       # Logs älter als 30 Tage löschen
   %(prog)s cleanup --dry-run       # Zeige was gelöscht würde
         """
@@ -168,6 +377,48 @@ Beispiele:
         help='Log-Typ (Standard: all)'
     )
     
+    parser.add_argument(
+        '--since',
+        type=parse_time,
+        help='Nur Reports ab diesem Zeitpunkt (z.B. 2025-11-26, "2025-11-26 14:00", 12h, 7d)'
+    )
+    
+    parser.add_argument(
+        '--until',
+        type=parse_until,
+        help='Nur Reports bis zu diesem Zeitpunkt (ein Datum schließt den ganzen Tag ein)'
+    )
+    
+    parser.add_argument(
+        '--hash',
+        help='Nur Error-Reports mit diesem Fehler-Hash'
+    )
+    
+    parser.add_argument(
+        '--grep',
+        help='Nur Reports, die diesen Text enthalten (Groß-/Kleinschreibung egal)'
+    )
+    
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=20,
+        help='Einträge pro Seite (Standard: 20, 0 = alle)'
+    )
+    
+    parser.add_argument(
+        '--offset',
+        type=int,
+        default=0,
+        help='Einträge überspringen (nächste Seiten)'
+    )
+    
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Ausgabe als JSON (list: eine Zeile pro Report)'
+    )
+    
     parser.add_argument(
         '--days',
         type=int,
@@ -196,9 +447,19 @@ Beispiele:
         print("Tipp: Starte die Anwendung mindestens einmal um Logs zu erstellen.")
         sys.exit(1)
     
-    # Führe Befehl aus
+    try:
+        run_command(args)
+    except BrokenPipeError:
+        # Ausgabe wurde vorzeitig geschlossen (z.B. "list --json | head")
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+def run_command(args: argparse.Namespace):
+    """Führt den Befehl aus main() aus"""
     if args.command == 'list':
-        list_logs(args.log_dir, args.type)
+        log_filter = LogFilter(args.since, args.until, args.hash, args.grep)
+        list_logs(args.log_dir, args.type, log_filter, args.limit, args.offset, args.json)
     
     elif args.command == 'show':
         if not args.file:
@@ -215,13 +476,13 @@ Beispiele:
                 break
         
         if log_file:
-            show_log(log_file)
-        else:
+            show_log(log_file, args.json)
+        elif not show_error(ErrorStore(args.log_dir / 'errors'), args.file, args.json):
             print(f"❌ Log-Datei nicht gefunden: {args.file}")
             sys.exit(1)
     
     elif args.command == 'cleanup':
-        cleanup_logs(args.log_dir, args.days, args.dry_run)
+        cleanup_logs(args.log_dir, args.days, args.dry_run, args.json)
 
 
 if __name__ == '__main__':
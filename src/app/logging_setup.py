@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Logging über eine Warteschlange
+Aufrufer (Tk-Thread, Sensor-Threads) legen Records nur in eine begrenzte
+Queue; formatiert und geschrieben wird in einem Hintergrund-Thread.
+Log-Level pro Logger über config.json (log_levels) oder die
+Umgebungsvariable RASPI_APP_LOG_LEVELS. Unter systemd wird direkt ins
+Journal geschrieben (siehe journal_handler).
+"""
+
+import os
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+from typing import Dict, Iterable, Optional, TextIO
+
+from .journal_handler import JournalHandler, journal_available
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_LEVELS_ENV = 'RASPI_APP_LOG_LEVELS'  # z.B. "app.slideshow_window=DEBUG,app.config_watch=WARNING"
+QUEUE_SIZE = 10000
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional['DeferredQueueHandler'] = None
+_atexit_registered = False
+_root_level = logging.INFO  # Level des Root-Loggers aus setup_logging
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Legt Records unformatiert in die Queue und blockiert nie
+    
+    Der QueueHandler der Standardbibliothek formatiert die Nachricht schon
+    im aufrufenden Thread. Da Queue und Listener im selben Prozess laufen,
+    reicht es, den Record weiterzugeben. Ist die Queue voll (z.B. hängt
+    stdout), wird der Record verworfen und gezählt.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """Zerlegt "name=LEVEL,name2=LEVEL" (z.B. aus RASPI_APP_LOG_LEVELS)"""
+    levels = {}
+    for item in spec.split(','):
+        name, sep, level = item.partition('=')
+        if sep and level.strip():
+            levels[name.strip() or 'root'] = level.strip()
+    return levels
+
+
+def apply_log_levels(levels: Dict[str, str]):
+    """
+    Setzt Log-Level pro Logger
+    
+    Args:
+        levels: Logger-Name -> Level (z.B. {"app.slideshow_window": "DEBUG"}),
+                "root" für den Root-Logger
+    """
+    for name, level in levels.items():
+        value = logging.getLevelName(str(level).upper())
+        if not isinstance(value, int):
+            logger.warning(f"Unbekanntes Log-Level für {name}: {level}")
+            continue
+        logging.getLogger(None if name == 'root' else name).setLevel(value)
+
+
+def reset_log_levels(names: Iterable[str]):
+    """
+    Setzt Logger auf den Stand beim Start zurück (z.B. aus log_levels entfernt)
+    
+    Es gilt wieder RASPI_APP_LOG_LEVELS, sonst erbt der Logger vom
+    übergeordneten (Root-Logger: Level aus setup_logging).
+    """
+    defaults = parse_levels(os.environ.get(LOG_LEVELS_ENV, ''))
+    fallback = {'root': logging.getLevelName(_root_level)}
+    apply_log_levels({name: defaults.get(name, fallback.get(name, 'NOTSET')) for name in names})
+
+
+def setup_logging(level: int = logging.INFO, stream: TextIO = sys.stdout,
+                  queue_size: int = QUEUE_SIZE, journal: Optional[bool] = None) -> DeferredQueueHandler:
+    """
+    Richtet das Logging ein (ersetzt vorhandene Root-Handler)
+    
+    Args:
+        level: Level des Root-Loggers
+        stream: Ausgabe des Hintergrund-Threads (wenn nicht ins Journal)
+        queue_size: Maximal wartende Records
+        journal: Strukturiert an journald statt in stream (None = automatisch unter systemd)
+    
+    Returns:
+        Der Queue-Handler (dropped zählt verworfene Records)
+    """
+    global _listener, _queue_handler, _atexit_registered, _root_level
+    shutdown_logging()
+    
+    if journal is None:
+        journal = journal_available()
+    if journal:
+        output: logging.Handler = JournalHandler()  # Zeitstempel und Level führt das Journal selbst
+    else:
+        output = logging.StreamHandler(stream)
+        output.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    _queue_handler = DeferredQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    _root_level = level
+    
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+    
+    apply_log_levels(parse_levels(os.environ.get(LOG_LEVELS_ENV, '')))
+    return _queue_handler
+
+
+def queue_depth() -> int:
+    """Anzahl wartender Log-Records (0 ohne Queue)"""
+    handler = _queue_handler
+    return handler.queue.qsize() if handler is not None else 0
+
+
+def shutdown_logging():
+    """
+    Schreibt wartende Records und beendet den Hintergrund-Thread
+    
+    Spätere Meldungen (z.B. aus anderen atexit-Funktionen) gehen danach
+    direkt an die Ausgabe-Handler.
+    """
+    global _listener, _queue_handler
+    listener, _listener = _listener, None
+    handler, _queue_handler = _queue_handler, None
+    if listener is None:
+        return
+    listener.stop()  # Arbeitet die Queue vorher ab
+    
+    root = logging.getLogger()
+    root.removeHandler(handler)
+    for output in listener.handlers:
+        root.addHandler(output)
+    if handler.dropped:
+        logger.warning(f"{handler.dropped} Log-Meldungen verworfen (Queue voll)")
@@ -4,54 +4,57 @@ Hauptanwendung für Raspberry Pi Eingangsbereich Display
 Diese Anwendung zeigt eine Slideshow mit PIR-Bewegungssensor-Steuerung
 """
 
+import os
 import sys
+import time
 import signal
 import logging
+import tkinter as tk
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .config import ConfigManager
-from .gui import ConfigGUI
-from .slideshow_window import SlideshowWindow
+from .event_bus import ConfigChangedEvent
 from .error_logger import get_error_logger, setup_crash_handler
+from .flight_recorder import get_flight_recorder
+from .last_frame import LastFrame
+from .logging_setup import apply_log_levels, reset_log_levels, setup_logging
+from .state import StateSnapshot
 from .sensor_detector import get_sensor_detector
+from .utils import get_process_uptime
 
-# Logging konfigurieren
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Config-GUI und Slideshow (mit PIL) werden erst bei Bedarf importiert
+if TYPE_CHECKING:
+    from .gui import ConfigGUI
 
 logger = logging.getLogger(__name__)
 
-# Richte Crash-Handler ein
-setup_crash_handler()
-
 
 class EntranceDisplayApp:
     """Hauptklasse für die Eingangsbereich Display Anwendung"""
     
     def __init__(self):
         self.config_manager = ConfigManager()
-        self.config_gui = None
+        apply_log_levels(getattr(self.config_manager.get(), 'log_levels', {}))
+        self.root = None  # Verstecktes Tk-Hauptfenster
+        self.config_gui = None  # Wird erst bei Bedarf erstellt (siehe _show_config_gui)
         self.slideshow_window = None
+        self.splash = None  # Letztes Bild, bis die Slideshow das erste Bild zeigt
         self.running = False
         self.error_logger = get_error_logger()
+        
+        # Zustand vom letzten Lauf (Bildliste, Position, Rate-Limiter)
+        self.state = StateSnapshot()
+        if self.state.load():
+            self.error_logger.restore_rate_limits(self.state.get('errors').get('rate_limits', {}))
+        # PIR-Prüfung erst wenn ein Modus sie braucht (beim Start oder in der GUI)
         self.sensor_detector = get_sensor_detector()
+        self._booted = False
+        self._signal_fds = None
+        self._init_time = time.monotonic()
+        self._start_time = 0.0
         
         logger.info("Eingangsbereich Display App wird initialisiert...")
-        
-        # Prüfe Sensor-Verfügbarkeit
-        pir_available = self.sensor_detector.is_pir_available()
-        logger.info(f"PIR-Sensor verfügbar: {pir_available}")
-        
-        # Cleanup alte Logs (beim Start)
-        try:
-            self.error_logger.cleanup_old_logs(days=30)
-        except Exception as e:
-            logger.warning(f"Fehler beim Log-Cleanup: {e}")
     
     def setup(self):
         """Initialisierung der Anwendung"""
@@ -63,11 +66,16 @@ class EntranceDisplayApp:
                 image_folder.mkdir(parents=True, exist_ok=True)
                 logger.info(f"Bildordner erstellt: {image_folder}")
             
-            # GUI erstellen
-            self.config_gui = ConfigGUI(
-                config_manager=self.config_manager,
-                on_start_callback=self._start_slideshow
-            )
+            # Verstecktes Hauptfenster: Slideshow und Config-GUI sind Toplevels davon
+            self.root = tk.Tk()
+            self.root.withdraw()
+            
+            # Config-GUI nur ohne Autostart sofort erstellen
+            if not config.autostart:
+                self._get_config_gui()
+            
+            # Änderungen an config.json (z.B. per SSH) ohne Neustart übernehmen
+            self.config_manager.start_watching(self._on_config_changed)
             
             logger.info("Setup abgeschlossen")
             return True
@@ -104,24 +112,32 @@ class EntranceDisplayApp:
                         f"Grund: PIR-Sensor nicht verfügbar.\n"
                         f"Bitte wähle Modus 2 (Zeit) oder Modus 3 (24/7)."
                     )
-                    self.config_gui.show()
+                    self._show_config_gui()
                     return
             
-            # Erstelle Slideshow-Fenster NEU (mit aktueller Config!)
-            logger.info("Erstelle Slideshow-Fenster...")
-            self.slideshow_window = SlideshowWindow(
-                config=config,
-                on_exit_callback=self._stop_slideshow
-            )
-            
-            logger.info("Slideshow-Fenster erstellt")
+            if self.slideshow_window is None:
+                logger.info("Erstelle Slideshow-Fenster...")
+                from .slideshow_window import SlideshowWindow
+                self.slideshow_window = SlideshowWindow(
+                    config=config,
+                    on_exit_callback=self._stop_slideshow,
+                    master=self.root,
+                    state=self.state
+                )
+                self.slideshow_window.on_first_frame = self._on_first_frame
+                logger.info("Slideshow-Fenster erstellt")
+            else:
+                # Fenster, Bildliste und Sensor wiederverwenden - nur Änderungen übernehmen
+                self.slideshow_window.apply_config(config)
             
             # Verstecke Config-GUI
-            logger.info("Verstecke Config-GUI...")
-            self.config_gui.hide()
+            if self.config_gui:
+                logger.info("Verstecke Config-GUI...")
+                self.config_gui.hide()
             
             # Starte Slideshow (zeigt Fenster automatisch)
             logger.info("Starte Slideshow...")
+            self._start_time = time.monotonic()
             self.slideshow_window.start()
             
             logger.info("Slideshow erfolgreich gestartet!")
@@ -140,7 +156,80 @@ class EntranceDisplayApp:
                 traceback_str=traceback.format_exc(),
                 context={'phase': 'start_slideshow'}
             )
-            self.config_gui.show()
+            self._show_config_gui()
+    
+    def _on_first_frame(self):
+        """Erstes Bild nach dem Start ist gezeichnet: Startzeit protokollieren"""
+        start_ms = (time.monotonic() - self._start_time) * 1000.0
+        self._close_splash()
+        if self._booted:
+            logger.info(f"Start bis erstes Bild: {start_ms:.0f} ms")
+            return
+        
+        self._booted = True
+        uptime = get_process_uptime()
+        if uptime is None:
+            # Ohne /proc: ab Erstellung der App gemessen
+            uptime = time.monotonic() - self._init_time
+        logger.info(f"Boot bis erstes Bild: {uptime * 1000.0:.0f} ms seit Prozessstart "
+                    f"(davon Start der Slideshow {start_ms:.0f} ms)")
+        
+        # Aufräumarbeiten erst nach dem ersten Bild
+        self.root.after_idle(self._cleanup_old_logs)
+    
+    def _cleanup_old_logs(self):
+        try:
+            self.error_logger.cleanup_old_logs(days=30)
+        except Exception as e:
+            logger.warning(f"Fehler beim Log-Cleanup: {e}")
+    
+    def _get_config_gui(self) -> 'ConfigGUI':
+        """Erstellt die Config-GUI beim ersten Bedarf (als Toplevel des Hauptfensters)"""
+        if self.config_gui is None:
+            from .gui import ConfigGUI
+            self.config_gui = ConfigGUI(
+                config_manager=self.config_manager,
+                on_start_callback=self._start_slideshow,
+                master=self.root
+            )
+        return self.config_gui
+    
+    def _show_config_gui(self):
+        self._close_splash()
+        self._get_config_gui().show()
+    
+    def _show_last_frame(self, config):
+        """Zeigt sofort das zuletzt angezeigte Bild (nur Tk, ohne PIL und Slideshow)"""
+        photo = LastFrame().load_photo(self.root)
+        if photo is None:
+            return
+        
+        self.splash = tk.Toplevel(self.root, bg='black')
+        self.splash.geometry("1920x1080")
+        self.splash.configure(cursor='none' if getattr(config, 'hide_cursor', True) else '')
+        if config.fullscreen:
+            self.splash.attributes('-fullscreen', True)
+            self.splash.overrideredirect(True)
+        label = tk.Label(self.splash, image=photo, bg='black')
+        label.image = photo  # Referenz behalten!
+        label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        self.splash.update()
+        logger.info(f"Letztes Bild angezeigt ({photo.width()}x{photo.height()})")
+    
+    def _close_splash(self):
+        if self.splash is not None:
+            self.splash.destroy()
+            self.splash = None
+    
+    def _on_config_changed(self, diff):
+        """config.json wurde extern geändert (läuft im Watcher-Thread)"""
+        if diff.touches('log_levels'):
+            reset_log_levels(name for name in diff.old.log_levels if name not in diff.new.log_levels)
+            apply_log_levels(diff.new.log_levels)
+        window = self.slideshow_window
+        if window:
+            # Übernahme im Tk-Thread über den Event-Bus
+            window.event_bus.publish(ConfigChangedEvent(diff=diff))
     
     def _stop_slideshow(self):
         """Stoppt die Slideshow und zeigt Config-GUI"""
@@ -151,8 +240,8 @@ class EntranceDisplayApp:
                 self.slideshow_window.stop()
                 self.slideshow_window.hide()
             
-            # Zeige Config-GUI
-            self.config_gui.show()
+            # Zeige Config-GUI (beim ersten ESC nach Autostart wird sie jetzt erstellt)
+            self._show_config_gui()
             
             logger.info("Slideshow gestoppt")
             
@@ -169,11 +258,17 @@ class EntranceDisplayApp:
             config = self.config_manager.get()
             if config.autostart:
                 logger.info("Autostart aktiviert - starte Slideshow automatisch")
-                # Verzögert starten damit GUI Zeit hat sich zu initialisieren
-                self.config_gui.root.after(1000, self._start_slideshow)
+                if getattr(config, 'resume_last_frame', True):
+                    self._show_last_frame(config)
+                # Direkt beim Eintritt in die Hauptschleife, ohne Config-GUI
+                self.root.after_idle(self._start_slideshow)
+            else:
+                self._show_config_gui()
+                self.root.after_idle(self._cleanup_old_logs)
             
-            # Starte GUI-Hauptschleife
-            self.config_gui.run()
+            # Starte Tk-Hauptschleife
+            self._watch_signals()
+            self.root.mainloop()
             
         except KeyboardInterrupt:
             logger.info("Anwendung wird durch Benutzer beendet...")
@@ -182,13 +277,67 @@ class EntranceDisplayApp:
         finally:
             self.cleanup()
     
+    def _watch_signals(self):
+        """Weckt die Tk-Hauptschleife bei Signalen (SIGTERM wirkt so auch im Deep-Idle sofort)"""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        try:
+            signal.set_wakeup_fd(write_fd)
+            # Der Python-Signal-Handler läuft, sobald Tk diesen Callback aufruft
+            self.root.tk.createfilehandler(read_fd, tk.READABLE, lambda *args: os.read(read_fd, 512))
+        except (ValueError, AttributeError, tk.TclError) as e:
+            logger.warning(f"Signale werden erst beim nächsten Tk-Event verarbeitet: {e}")
+            signal.set_wakeup_fd(-1)
+            os.close(read_fd)
+            os.close(write_fd)
+            return
+        self._signal_fds = (read_fd, write_fd)
+    
+    def _unwatch_signals(self):
+        if self._signal_fds is None:
+            return
+        signal.set_wakeup_fd(-1)
+        if self.root:
+            try:
+                self.root.tk.deletefilehandler(self._signal_fds[0])
+            except tk.TclError:
+                pass
+        for fd in self._signal_fds:
+            os.close(fd)
+        self._signal_fds = None
+    
+    def _save_state(self):
+        """Schreibt den Zustands-Snapshot (den Slideshow-Teil ergänzt SlideshowWindow.stop())"""
+        self.state.set('errors', {'rate_limits': self.error_logger.get_rate_limits()})
+        if self.state.save():
+            logger.info(f"Zustand gespeichert: {self.state.path}")
+    
     def cleanup(self):
         """Aufräumen und Ressourcen freigeben"""
         logger.info("Cleanup wird durchgeführt...")
         self.running = False
+        self.config_manager.stop_watching()
+        self._unwatch_signals()
         
         if self.slideshow_window:
-            self.slideshow_window.stop()
+            try:
+                self.slideshow_window.destroy()
+            except Exception as e:
+                logger.warning(f"Fehler beim Schließen des Slideshow-Fensters: {e}")
+            self.slideshow_window = None
+        
+        # Zustand für den nächsten Start sichern (auch bei SIGTERM, z.B. durch update.sh)
+        self._save_state()
+        self.error_logger.close()
+        
+        if self.root:
+            try:
+                self.root.destroy()
+            except tk.TclError:
+                pass  # Bereits geschlossen
+            self.root = None
+            self.config_gui = None
         
         # Zeige Fehler-Statistiken
         try:
@@ -210,13 +359,22 @@ class EntranceDisplayApp:
 
 
 def signal_handler(signum, frame):
-    """Signal-Handler für sauberes Beenden"""
+    """Signal-Handler für sauberes Beenden (cleanup() sichert dabei den Zustand)"""
     logger.info(f"Signal {signum} empfangen")
     sys.exit(0)
 
 
 def main():
     """Haupteinstiegspunkt der Anwendung"""
+    # Logging konfigurieren (erst hier, damit ein Import des Moduls nichts verändert);
+    # geschrieben wird im Hintergrund, der Tk-Thread legt Meldungen nur in eine Queue
+    setup_logging(logging.INFO, sys.stdout)
+    # Letzte Meldungen für Crash- und Error-Reports mitschreiben
+    get_flight_recorder().install()
+    
+    # Richte Crash-Handler ein
+    setup_crash_handler()
+    
     # Signal-Handler registrieren
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
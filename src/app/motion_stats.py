@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Gelernte Bewegungsstatistik pro Wochentag und 15-Minuten-Slot
+Grundlage für das vorausschauende Einschalten (Predictive Wake)
+"""
+
+import os
+import time
+import struct
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOT_COUNT = 7 * SLOTS_PER_DAY
+
+# Datei: Magic, Version, Anzahl Slots, danach zwei uint16-Arrays
+STATS_MAGIC = b'MSTA'
+STATS_VERSION = 1
+STATS_HEADER_FORMAT = '<4sHH'
+
+# Ab dieser Anzahl Beobachtungen werden alte Wochen schrittweise vergessen
+MAX_OBSERVATIONS = 52
+
+# Speichern nach so vielen abgeschlossenen Slots (stündlich, schont die SD-Karte)
+SAVE_EVERY_SLOTS = 4
+
+
+class MotionStatistics:
+    """
+    Kompaktes Histogramm der Bewegungsaktivität (7 x 96 Slots)
+    
+    Pro Slot wird gezählt, wie oft er beobachtet wurde und in wie vielen
+    dieser Beobachtungen mindestens eine Bewegung auftrat. Der Quotient ist
+    die Wahrscheinlichkeit für Besuch in diesem Slot. Beide Zähler liegen in
+    array('H') (zusammen 2,7 KB).
+    """
+    
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: Datei zum Laden/Speichern (optional)
+        """
+        self.path = Path(path) if path else None
+        self.observed = array('H', bytes(2 * SLOT_COUNT))
+        self.active = array('H', bytes(2 * SLOT_COUNT))
+        self.dirty = False
+        self._unsaved_slots = 0
+        
+        self._slot: Optional[int] = None
+        self._slot_end = 0.0
+        self._slot_active = False
+        
+        if self.path and self.path.exists():
+            self.load()
+    
+    @staticmethod
+    def slot_of(timestamp: float) -> int:
+        """Slot-Index (0..671) für einen Zeitstempel (Lokalzeit)"""
+        t = time.localtime(timestamp)
+        return t.tm_wday * SLOTS_PER_DAY + (t.tm_hour * 60 + t.tm_min) // SLOT_MINUTES
+    
+    @staticmethod
+    def _slot_end_of(timestamp: float) -> float:
+        t = time.localtime(timestamp)
+        seconds_into_slot = (t.tm_min % SLOT_MINUTES) * 60 + t.tm_sec
+        return timestamp - seconds_into_slot - (timestamp % 1) + SLOT_MINUTES * 60
+    
+    def tick(self, now: float):
+        """
+        Schließt abgelaufene Slots ab (aus der Update-Schleife aufrufen)
+        
+        Nur der zuletzt laufende Slot zählt als beobachtet. Lücken (App aus)
+        werden nicht als "keine Bewegung" gewertet.
+        """
+        if self._slot is not None and now < self._slot_end:
+            return
+        
+        if self._slot is not None:
+            self._finish_slot()
+        
+        self._slot = self.slot_of(now)
+        self._slot_end = self._slot_end_of(now)
+        self._slot_active = False
+    
+    def record_motion(self, now: float):
+        """Registriert eine Bewegung (steigende Flanke)"""
+        self.tick(now)
+        self._slot_active = True
+    
+    def _finish_slot(self):
+        slot = self._slot
+        if self.observed[slot] >= MAX_OBSERVATIONS:
+            # Exponentielles Vergessen: ältere Wochen verlieren Gewicht
+            self.observed[slot] //= 2
+            self.active[slot] //= 2
+        self.observed[slot] += 1
+        if self._slot_active:
+            self.active[slot] += 1
+        self.dirty = True
+        
+        self._unsaved_slots += 1
+        if self._unsaved_slots >= SAVE_EVERY_SLOTS:
+            self.save()
+    
+    def probability(self, timestamp: float) -> Optional[float]:
+        """
+        Wahrscheinlichkeit für Bewegung im Slot des Zeitstempels
+        
+        Returns:
+            Wert zwischen 0 und 1 oder None wenn noch keine Beobachtung vorliegt
+        """
+        slot = self.slot_of(timestamp)
+        observed = self.observed[slot]
+        if not observed:
+            return None
+        return self.active[slot] / observed
+    
+    def observations(self, timestamp: float) -> int:
+        """Anzahl Beobachtungen des Slots"""
+        return self.observed[self.slot_of(timestamp)]
+    
+    def load(self) -> bool:
+        """Lädt die Statistik aus der Datei"""
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(struct.calcsize(STATS_HEADER_FORMAT))
+                magic, version, slots = struct.unpack(STATS_HEADER_FORMAT, header)
+                if magic != STATS_MAGIC or version != STATS_VERSION or slots != SLOT_COUNT:
+                    raise ValueError("Unbekanntes Format")
+                observed = array('H')
+                active = array('H')
+                observed.fromfile(f, SLOT_COUNT)
+                active.fromfile(f, SLOT_COUNT)
+            self.observed, self.active = observed, active
+            logger.info(f"Bewegungsstatistik geladen: {self.path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Bewegungsstatistik konnte nicht geladen werden: {e}")
+            return False
+    
+    def save(self) -> bool:
+        """Speichert die Statistik atomar (nur wenn geändert)"""
+        if not self.path or not self.dirty:
+            return False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(struct.pack(STATS_HEADER_FORMAT, STATS_MAGIC, STATS_VERSION, SLOT_COUNT))
+                self.observed.tofile(f)
+                self.active.tofile(f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+            self._unsaved_slots = 0
+            return True
+        except OSError as e:
+            logger.warning(f"Bewegungsstatistik konnte nicht gespeichert werden: {e}")
+            return False
+
+
+class PredictiveWake:
+    """
+    Entscheidet anhand der Statistik über Vorwärmen und Timeout
+    
+    - "hot":    hohe Besuchswahrscheinlichkeit (jetzt oder im nächsten Slot)
+                -> Bildschirm an lassen bzw. vorab einschalten, Bild vordekodieren
+    - "dead":   fast nie Besuch -> verkürzter Timeout
+    - "normal": fester screen_timeout
+    
+    Zusätzlich wird gegen den festen Timeout abgerechnet: eingesparte
+    Bildschirm-Sekunden, zusätzliche Sekunden durch Warmhalten und Fehlgriffe
+    (Besucher kam innerhalb des normalen Timeouts nach verkürzter Abschaltung).
+    Als Warmhalten zählt jede Sekunde, die der Bildschirm wegen eines "hot"
+    Slots über last_motion + base_timeout hinaus an bleibt - auch wenn er
+    schon vorher an war.
+    
+    Die Einstufung ändert sich nur an Slot-Grenzen und wird bis dahin
+    zwischengespeichert (timeout_for läuft in jedem Tick der Update-Schleife).
+    """
+    
+    def __init__(self, stats: MotionStatistics, base_timeout: float,
+                 min_timeout: float = 30, hot_threshold: float = 0.6,
+                 dead_threshold: float = 0.05, min_observations: int = 3):
+        self.stats = stats
+        self.base_timeout = base_timeout
+        self.min_timeout = min(min_timeout, base_timeout)
+        self.hot_threshold = hot_threshold
+        self.dead_threshold = dead_threshold
+        self.min_observations = min_observations
+        
+        # Abrechnung gegen festen Timeout
+        self.saved_seconds = 0.0
+        self.warm_seconds = 0.0
+        self.predictive_wakes = 0
+        self.hits = 0
+        self.misses = 0
+        self._short_off: Optional[tuple] = None  # (Aus-Zeitpunkt, Aus-Zeitpunkt bei festem Timeout)
+        self._warm_since: Optional[float] = None  # Beginn der laufenden Warmphase
+        self._warm_from = 0.0  # Ab hier zählt sie (Ende des festen Timeouts)
+        self._woke = False  # Vorab eingeschaltet, noch kein Besucher
+        
+        # Einstufung des aktuellen Slots: (Slot-Beginn, Slot-Ende, Ergebnis)
+        self._state_cache = (0.0, 0.0, "normal")
+    
+    def classify(self, now: float) -> str:
+        """Gibt "hot", "dead" oder "normal" zurück"""
+        lookahead = now + SLOT_MINUTES * 60
+        probabilities = []
+        for timestamp in (now, lookahead):
+            if self.stats.observations(timestamp) >= self.min_observations:
+                probabilities.append(self.stats.probability(timestamp))
+        if not probabilities:
+            return "normal"
+        if max(probabilities) >= self.hot_threshold:
+            return "hot"
+        if self.stats.observations(now) >= self.min_observations and \
+                self.stats.probability(now) <= self.dead_threshold:
+            return "dead"
+        return "normal"
+    
+    def timeout_for(self, now: float) -> Optional[float]:
+        """
+        Effektiver Timeout
+        
+        Returns:
+            Sekunden oder None wenn der Bildschirm warm bleiben soll
+        """
+        slot_start, slot_end, state = self._state_cache
+        if not slot_start <= now < slot_end:
+            state = self.classify(now)
+            slot_end = MotionStatistics._slot_end_of(now)
+            self._state_cache = (slot_end - SLOT_MINUTES * 60, slot_end, state)
+        if state == "hot":
+            return None
+        if state == "dead":
+            return self.min_timeout
+        return self.base_timeout
+    
+    def note_screen_off(self, now: float, last_motion: float):
+        """Bildschirm wurde per (ggf. verkürztem) Timeout ausgeschaltet"""
+        self._end_warm(now)
+        self._woke = False
+        fixed_off = last_motion + self.base_timeout
+        if fixed_off > now:
+            self._short_off = (now, fixed_off)
+    
+    def note_warm(self, now: float, last_motion: float, woke: bool) -> bool:
+        """
+        Bildschirm bleibt wegen eines "hot" Slots an (in jedem warmen Tick aufrufen)
+        
+        Args:
+            now: Aktuelle Zeit
+            last_motion: Zeitpunkt der letzten Bewegung
+            woke: Bildschirm wurde dafür ohne Bewegung vorab eingeschaltet
+        
+        Returns:
+            True wenn damit eine neue Warmphase beginnt
+        """
+        if woke:
+            self.predictive_wakes += 1
+            self._woke = True
+        if self._warm_since is not None:
+            return False
+        self._warm_since = now
+        self._warm_from = max(now, last_motion + self.base_timeout)
+        return True
+    
+    def end_warm(self, now: float):
+        """Der Slot ist nicht mehr "hot" (oder der Bildschirm ging aus)"""
+        self._end_warm(now)
+    
+    def note_motion(self, now: float, screen_was_on: bool):
+        """Bewegung erkannt - wertet die letzte Entscheidung aus"""
+        if self._short_off:
+            off_at, fixed_off = self._short_off
+            if now < fixed_off:
+                # Mit festem Timeout wäre der Bildschirm noch an gewesen
+                self.misses += 1
+                self.saved_seconds += now - off_at
+            else:
+                self.saved_seconds += fixed_off - off_at
+            self._short_off = None
+        
+        if self._woke:
+            if screen_was_on:
+                self.hits += 1
+            self._woke = False
+        
+        if self._warm_since is not None:
+            # Der feste Timeout läuft ab jetzt neu - die Warmphase zählt erst danach wieder
+            self._end_warm(now)
+            self._warm_since = now
+            self._warm_from = now + self.base_timeout
+    
+    def _end_warm(self, now: float):
+        self.warm_seconds += self._pending_warm(now)
+        self._warm_since = None
+    
+    def _pending_warm(self, now: float) -> float:
+        """Warm gehaltene Sekunden der laufenden Warmphase"""
+        if self._warm_since is None:
+            return 0.0
+        return max(0.0, now - self._warm_from)
+    
+    def get_report(self, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Einsparungen und Fehlgriffe gegenüber festem screen_timeout
+        
+        Args:
+            now: Aktuelle Zeit, um eine laufende Warmphase mitzuzählen (optional)
+        """
+        warm_seconds = self.warm_seconds + (self._pending_warm(now) if now is not None else 0.0)
+        return {
+            'saved_seconds': self.saved_seconds,
+            'warm_seconds': warm_seconds,
+            'net_saved_seconds': self.saved_seconds - warm_seconds,
+            'predictive_wakes': self.predictive_wakes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Aufzeichnung von Bewegungs-Flanken in einer kompakten Binärdatei
+Die Traces können mit app.replay beschleunigt abgespielt werden
+"""
+
+import os
+import time
+import struct
+import logging
+import threading
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Datei-Header: Magic, Version, Record-Größe
+TRACE_MAGIC = b'MTRC'
+TRACE_VERSION = 1
+HEADER_FORMAT = '<4sHH'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+# Record: Zeitstempel (time.time()), Zustand (1 = Bewegung, 0 = keine Bewegung)
+RECORD_FORMAT = '<dB'
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+
+class MotionTraceWriter:
+    """Hängt Bewegungs-Flanken an eine Trace-Datei an (thread-sicher)"""
+    
+    def __init__(self, path: Union[str, Path], flush_interval: float = 60.0):
+        """
+        Args:
+            path: Pfad zur Trace-Datei (wird angelegt oder fortgesetzt)
+            flush_interval: Sekunden zwischen zwei Schreibvorgängen auf die SD-Karte
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.records = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._prepare_file()
+        self._file = open(self.path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(struct.pack(HEADER_FORMAT, TRACE_MAGIC, TRACE_VERSION, RECORD_SIZE))
+            self._file.flush()
+        
+        logger.info(f"Bewegungs-Trace wird aufgezeichnet: {self.path}")
+    
+    def _prepare_file(self):
+        """
+        Prüft eine vorhandene Trace-Datei vor dem Fortsetzen
+        
+        Ein unvollständiger letzter Record (z.B. nach Stromausfall) wird
+        abgeschnitten, sonst wären alle neuen Records verschoben. Dateien
+        mit fremdem oder kaputtem Header werden beiseitegelegt (.invalid).
+        """
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == 0:
+            return
+        
+        with open(self.path, 'r+b') as f:
+            header = f.read(HEADER_SIZE)
+            valid = len(header) == HEADER_SIZE and \
+                struct.unpack(HEADER_FORMAT, header) == (TRACE_MAGIC, TRACE_VERSION, RECORD_SIZE)
+            torn = (size - HEADER_SIZE) % RECORD_SIZE if valid else 0
+            if torn:
+                f.truncate(size - torn)
+                logger.warning(f"Bewegungs-Trace {self.path.name}: {torn} Bytes unvollständiger Record entfernt")
+        
+        if not valid:
+            invalid = self.path.with_name(self.path.name + '.invalid')
+            os.replace(self.path, invalid)
+            logger.warning(f"Bewegungs-Trace {self.path.name} hat keinen gültigen Header - "
+                           f"verschoben nach {invalid.name}, beginne neu")
+    
+    def record(self, timestamp: float, motion: bool):
+        """Schreibt eine Flanke"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(struct.pack(RECORD_FORMAT, timestamp, 1 if motion else 0))
+            self.records += 1
+            
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+    
+    def close(self):
+        """Schreibt gepufferte Daten und schließt die Datei"""
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                logger.warning(f"Fehler beim Schreiben des Traces: {e}")
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path: Union[str, Path]) -> Iterator[Tuple[float, bool]]:
+    """
+    Liest eine Trace-Datei
+    
+    Yields:
+        (Zeitstempel, Bewegung) pro Flanke
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            return
+        magic, version, record_size = struct.unpack(HEADER_FORMAT, header)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"Keine gültige Trace-Datei: {path}")
+        
+        while True:
+            chunk = f.read(RECORD_SIZE * 4096)
+            if not chunk:
+                break
+            # Unvollständiger letzter Record (z.B. nach Stromausfall) wird ignoriert
+            usable = len(chunk) - len(chunk) % RECORD_SIZE
+            for timestamp, state in struct.iter_unpack(RECORD_FORMAT, chunk[:usable]):
+                yield timestamp, bool(state)
@@ -8,11 +8,11 @@ from typing import Callable, Optional
 import threading
 import time
 
-try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-except (ImportError, RuntimeError):
-    GPIO_AVAILABLE = False
+from .gpio_backend import GPIO_AVAILABLE, GPIOBackend, get_gpio_backend
+from .motion_trace import MotionTraceWriter
+from .event_store import EventStore, EVENT_MOTION_ON, EVENT_MOTION_OFF
+
+if not GPIO_AVAILABLE:
     print("WARNUNG: RPi.GPIO nicht verfügbar - Sensor-Simulation aktiv")
 
 logger = logging.getLogger(__name__)
@@ -21,28 +21,49 @@ logger = logging.getLogger(__name__)
 class PIRSensor:
     """Klasse für PIR Motion Sensor"""
     
-    def __init__(self, pin: int, callback: Optional[Callable] = None):
+    POLL_INTERVAL = 0.1  # 100ms Polling-Intervall (nur Fallback)
+    
+    def __init__(self, pin: int, callback: Optional[Callable] = None,
+                 backend: Optional[GPIOBackend] = None,
+                 use_interrupts: bool = True,
+                 debounce_ms: int = 50,
+                 trace: Optional[MotionTraceWriter] = None,
+                 events: Optional[EventStore] = None):
         """
         Initialisiert den PIR Sensor
         
         Args:
             pin: GPIO Pin-Nummer (BCM)
             callback: Funktion die bei Bewegung aufgerufen wird
+            backend: GPIO-Backend (Standard: RPi.GPIO falls verfügbar)
+            use_interrupts: Flankenerkennung statt Polling verwenden
+            debounce_ms: Software-Entprellung in Millisekunden
+            trace: Zeichnet jede Flanke in einer Trace-Datei auf (optional)
+            events: Event-Speicher für Auswertungen pro Eingang (optional)
         """
         self.pin = pin
+        self.trace = trace
+        self.events = events
         self.callback = callback
         self.enabled = False
         self.motion_detected = False
         self.last_motion_time = 0
+        self.last_edge_time = 0.0  # Zeitpunkt der letzten Flanke (time.time())
+        self.use_interrupts = use_interrupts
+        self.debounce = max(debounce_ms, 0) / 1000.0
+        self.mode = "simulation"  # "interrupt", "polling" oder "simulation"
         self._monitoring = False
         self._monitor_thread = None
+        self._edge_event = threading.Event()
+        self._last_change = 0.0
         self.initialization_failed = False
         
-        if GPIO_AVAILABLE:
+        self.backend = backend if backend is not None else get_gpio_backend()
+        
+        if self.backend is not None:
             try:
-                GPIO.setmode(GPIO.BCM)
-                GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-                logger.info(f"PIR Sensor initialisiert auf Pin {self.pin}")
+                self.backend.setup_input(self.pin)
+                logger.info(f"PIR Sensor initialisiert auf Pin {self.pin} ({self.backend.name})")
             except Exception as e:
                 logger.error(f"Fehler beim Initialisieren des PIR Sensors: {e}")
                 self.initialization_failed = True
@@ -57,49 +78,111 @@ class PIRSensor:
         
         self.enabled = True
         self._monitoring = True
-        self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._edge_event.clear()
+        
+        target = self._monitor_loop
+        if self.backend is not None and not self.initialization_failed:
+            if self.use_interrupts and self.backend.add_edge_callback(self.pin, self._on_edge):
+                self.mode = "interrupt"
+                target = self._interrupt_loop
+            else:
+                self.mode = "polling"
+        
+        self._monitor_thread = threading.Thread(target=target, daemon=True)
         self._monitor_thread.start()
-        logger.info("PIR Sensor Überwachung gestartet")
+        logger.info(f"PIR Sensor Überwachung gestartet (Modus: {self.mode})")
     
     def stop_monitoring(self):
         """Stoppt die Überwachung des Sensors"""
         self.enabled = False
         self._monitoring = False
+        self._edge_event.set()
+        if self.mode == "interrupt" and self.backend is not None:
+            self.backend.remove_edge_callback(self.pin)
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2)
         logger.info("PIR Sensor Überwachung gestoppt")
     
+    def _on_edge(self, pin: int, level: int):
+        """Flanken-Callback des Backends (läuft im Backend-Thread)"""
+        self.last_edge_time = time.time()
+        self._edge_event.set()
+    
+    def _interrupt_loop(self):
+        """
+        Wartet blockierend auf Flanken
+        
+        Die erste Flanke nach einer Ruhephase wird sofort übernommen. Flanken
+        innerhalb des Entprell-Fensters werden erst nach Ablauf des Fensters
+        erneut gelesen, damit Störimpulse keinen Zustandswechsel auslösen.
+        """
+        while self._monitoring:
+            self._edge_event.wait()
+            if not self._monitoring:
+                break
+            self._edge_event.clear()
+            
+            try:
+                remaining = self._last_change + self.debounce - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                    self._edge_event.clear()
+                
+                self._apply_level(self.backend.read(self.pin))
+            
+            except Exception as e:
+                logger.error(f"Fehler in der Sensor-Überwachung: {e}")
+                time.sleep(1)
+    
     def _monitor_loop(self):
-        """Überwachungsschleife für den Sensor"""
+        """Überwachungsschleife für den Sensor (Polling-Fallback)"""
         while self._monitoring:
             try:
-                if GPIO_AVAILABLE:
+                if self.mode == "polling":
                     # Lese GPIO Pin
-                    state = GPIO.input(self.pin)
-                    
-                    if state == GPIO.HIGH and not self.motion_detected:
-                        # Bewegung erkannt
-                        self.motion_detected = True
-                        self.last_motion_time = time.time()
-                        logger.info("Bewegung erkannt!")
-                        
-                        if self.callback:
-                            self.callback(True)
-                    
-                    elif state == GPIO.LOW and self.motion_detected:
-                        # Keine Bewegung mehr
-                        self.motion_detected = False
-                        logger.info("Keine Bewegung mehr")
-                        
-                        if self.callback:
-                            self.callback(False)
-                
-                time.sleep(0.1)  # 100ms Polling-Intervall
+                    self._apply_level(self.backend.read(self.pin))
                 
+                time.sleep(self.POLL_INTERVAL)
+            
             except Exception as e:
                 logger.error(f"Fehler in der Sensor-Überwachung: {e}")
                 time.sleep(1)
     
+    def _apply_level(self, level: int):
+        """Übernimmt einen gelesenen Pegel und ruft bei Änderung den Callback auf"""
+        if self.mode != "interrupt" and bool(level) != self.motion_detected:
+            # Beim Polling ist der Erkennungszeitpunkt die beste Schätzung
+            self.last_edge_time = time.time()
+        
+        if level and not self.motion_detected:
+            # Bewegung erkannt
+            self.motion_detected = True
+            self.last_motion_time = time.time()
+            self._last_change = time.monotonic()
+            logger.debug("Bewegung erkannt!")
+            
+            if self.trace:
+                self.trace.record(self.last_edge_time, True)
+            if self.events:
+                self.events.append(EVENT_MOTION_ON, self.last_edge_time, source=self.pin)
+            
+            if self.callback:
+                self.callback(True)
+        
+        elif not level and self.motion_detected:
+            # Keine Bewegung mehr
+            self.motion_detected = False
+            self._last_change = time.monotonic()
+            logger.debug("Keine Bewegung mehr")
+            
+            if self.trace:
+                self.trace.record(self.last_edge_time, False)
+            if self.events:
+                self.events.append(EVENT_MOTION_OFF, self.last_edge_time, source=self.pin)
+            
+            if self.callback:
+                self.callback(False)
+    
     def is_motion_detected(self) -> bool:
         """Gibt zurück ob aktuell Bewegung erkannt wird"""
         return self.motion_detected
@@ -111,10 +194,9 @@ class PIRSensor:
     def cleanup(self):
         """Räumt die GPIO-Ressourcen auf"""
         self.stop_monitoring()
-        if GPIO_AVAILABLE:
+        if self.backend is not None:
             try:
-                GPIO.cleanup(self.pin)
+                self.backend.cleanup(self.pin)
                 logger.info("PIR Sensor GPIO aufgeräumt")
             except Exception as e:
                 logger.error(f"Fehler beim GPIO Cleanup: {e}")
-
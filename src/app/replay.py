@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Replay-Harness für aufgezeichnete Bewegungs-Traces
+Spielt Traces mit virtueller Uhr durch die Display-Policy (wie die
+Update-Schleife des SlideshowWindow, aber ohne Tk) und berichtet
+Einschaltdauer, Schaltzyklen und Besucher, die vor einem dunklen
+Bildschirm standen.
+
+Beispiele:
+  python3 -m app.replay motion.trace
+  python3 -m app.replay motion.trace --timeout 60 --mode time_pir
+  python3 -m app.replay woche1.trace woche2.trace --speed 0
+  python3 -m app.replay motion.trace --predictive --pretrain
+"""
+
+import sys
+import time
+import heapq
+import logging
+import argparse
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .config import AppConfig, ConfigManager
+from .display_policy import REASON_TIMEOUT, REASON_WARM, DisplayPolicy, VirtualClock
+from .motion_trace import read_trace
+from .motion_stats import SLOT_MINUTES, MotionStatistics, PredictiveWake
+from .time_control import TimeController
+
+
+class RecordingScreenController:
+    """Bildschirm-Ersatz, der Einschaltdauer und Schaltzyklen zählt"""
+    
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.is_on = True
+        self.on_seconds = 0.0
+        self.power_cycles = 0
+        self._on_since: Optional[float] = None
+    
+    def start(self):
+        self._on_since = self.clock.time()
+    
+    def turn_on(self) -> bool:
+        if not self.is_on:
+            self.is_on = True
+            self.power_cycles += 1
+            self._on_since = self.clock.time()
+        return True
+    
+    def turn_off(self) -> bool:
+        if self.is_on:
+            self.is_on = False
+            self._account()
+        return True
+    
+    def finish(self):
+        if self.is_on:
+            self._account()
+            self._on_since = self.clock.time()
+    
+    def _account(self):
+        if self._on_since is not None:
+            self.on_seconds += self.clock.time() - self._on_since
+        self._on_since = None
+    
+    def get_status(self) -> bool:
+        return self.is_on
+
+
+class ReplaySession:
+    """
+    Zustand und Update-Schritt des Fensters ohne Tk
+    
+    Setzt die Entscheidungen der DisplayPolicy so um wie
+    SlideshowWindow._apply_policy und _on_motion_detected (Bildschirm,
+    Bildwechsel, vorausschauendes Einschalten), ohne Bilder zu laden.
+    """
+    
+    def __init__(self, config: AppConfig, clock: VirtualClock,
+                 stats: Optional[MotionStatistics] = None):
+        """
+        Args:
+            config: Konfiguration (Modus, Timeout, Arbeitszeiten, predictive_wake)
+            clock: Virtuelle Uhr des Replays
+            stats: Vorab gelernte Statistik (Standard: lernt während des Replays)
+        """
+        self.clock = clock
+        self.screen_controller = RecordingScreenController(clock)
+        self.policy = DisplayPolicy(config.display_mode, config.screen_timeout, config.image_duration)
+        self.time_controller = TimeController(
+            enabled=self.policy.uses_schedule,
+            work_start=config.work_start_time,
+            work_end=config.work_end_time,
+            clock=clock.datetime
+        )
+        self.predictive: Optional[PredictiveWake] = None
+        if config.predictive_wake and self.policy.uses_pir:
+            self.predictive = PredictiveWake(
+                stats or MotionStatistics(),
+                base_timeout=config.screen_timeout,
+                min_timeout=config.predictive_min_timeout,
+                hot_threshold=config.predictive_hot_threshold,
+                dead_threshold=config.predictive_dead_threshold
+            )
+            self.policy.timeout_for = self.predictive.timeout_for
+        self.screen_active = True
+        self.last_motion_time = clock.time()
+        self.current_image_time = clock.time()
+        self.slides_shown = 0
+    
+    def tick(self):
+        """Ein Durchlauf der Update-Schleife zur aktuellen virtuellen Zeit"""
+        current_time = self.clock.time()
+        if self.predictive:
+            self.predictive.stats.tick(current_time)
+        
+        work_time = self.policy.uses_schedule and self.time_controller.is_work_time()
+        decision = self.policy.evaluate(current_time, work_time, self.screen_active,
+                                        self.last_motion_time, self.current_image_time)
+        
+        if self.predictive and decision.reason != REASON_WARM:
+            self.predictive.end_warm(current_time)
+        
+        if decision.reason == REASON_WARM:
+            if decision.screen is True:
+                self._set_screen(True)
+            self.predictive.note_warm(current_time, self.last_motion_time, woke=decision.screen is True)
+        elif decision.screen is not None:
+            self._set_screen(decision.screen)
+            if decision.reason == REASON_TIMEOUT and self.predictive:
+                self.predictive.note_screen_off(current_time, self.last_motion_time)
+        
+        if decision.advance:
+            self.slides_shown += 1
+            self.current_image_time = current_time
+    
+    def motion(self, motion: bool, timestamp: float):
+        """Bewegungsflanke aus dem Trace"""
+        if not motion:
+            return
+        self.last_motion_time = timestamp
+        if self.predictive:
+            self.predictive.stats.record_motion(timestamp)
+            self.predictive.note_motion(timestamp, self.screen_active)
+        if not self.screen_active:
+            self._set_screen(True)
+    
+    def _set_screen(self, on: bool):
+        if on:
+            self.screen_controller.turn_on()
+        else:
+            self.screen_controller.turn_off()
+        self.screen_active = on
+
+
+@dataclass
+class ReplayReport:
+    """Ergebnis eines Replays"""
+    
+    simulated_seconds: float = 0.0
+    screen_on_seconds: float = 0.0
+    power_cycles: int = 0
+    arrivals: int = 0
+    dark_arrivals: int = 0
+    slides_shown: int = 0
+    wall_seconds: float = 0.0
+    predictive: Dict[str, float] = field(default_factory=dict)
+    
+    @property
+    def screen_on_hours(self) -> float:
+        return self.screen_on_seconds / 3600.0
+    
+    @property
+    def dark_arrival_rate(self) -> float:
+        return self.dark_arrivals / self.arrivals if self.arrivals else 0.0
+    
+    def format(self) -> str:
+        days = self.simulated_seconds / 86400.0
+        on_ratio = self.screen_on_seconds / self.simulated_seconds if self.simulated_seconds else 0.0
+        speed = self.simulated_seconds / self.wall_seconds if self.wall_seconds else 0.0
+        lines = [
+            f"Simulierte Dauer:     {days:.2f} Tage ({speed:,.0f}x Echtzeit)",
+            f"Bildschirm an:        {self.screen_on_hours:.1f} h ({on_ratio:.1%})",
+            f"Schaltzyklen:         {self.power_cycles}",
+            f"Besucher (Flanken):   {self.arrivals}",
+            f"Dunkler Bildschirm:   {self.dark_arrivals} ({self.dark_arrival_rate:.1%})",
+            f"Angezeigte Bilder:    {self.slides_shown}",
+        ]
+        if self.predictive:
+            p = self.predictive
+            lines += [
+                f"Vorab eingeschaltet:  {p['predictive_wakes']} (davon {p['hits']} mit Besucher)",
+                f"Verkürzte Timeouts:   {p['saved_seconds'] / 3600:.1f} h gespart, {p['misses']} Fehlgriffe",
+                f"Warmhalten:           {p['warm_seconds'] / 3600:.1f} h zusätzlich",
+            ]
+        return "\n".join(lines)
+    
+    def format_comparison(self, baseline: 'ReplayReport') -> str:
+        """Vergleich gegenüber einem Replay mit festem screen_timeout"""
+        delta = self.screen_on_seconds - baseline.screen_on_seconds
+        delta_ratio = delta / baseline.screen_on_seconds if baseline.screen_on_seconds else 0.0
+        return "\n".join([
+            f"Bildschirm an:        {baseline.screen_on_hours:.1f} h -> {self.screen_on_hours:.1f} h "
+            f"({delta / 3600:+.1f} h, {delta_ratio:+.1%})",
+            f"Dunkler Bildschirm:   {baseline.dark_arrivals} -> {self.dark_arrivals} "
+            f"({self.dark_arrivals - baseline.dark_arrivals:+d})",
+            f"Schaltzyklen:         {baseline.power_cycles} -> {self.power_cycles}",
+        ])
+
+
+def merge_traces(paths: Iterable[Path]) -> Iterable[Tuple[float, bool]]:
+    """Führt mehrere Traces zeitlich sortiert zusammen"""
+    return heapq.merge(*(read_trace(path) for path in paths), key=lambda record: record[0])
+
+
+def train_statistics(stats: MotionStatistics, events: Iterable[Tuple[float, bool]]):
+    """Lernt die Bewegungsstatistik vorab aus einem kompletten Trace"""
+    slot_seconds = SLOT_MINUTES * 60
+    last = None
+    for timestamp, motion in events:
+        if last is not None:
+            # Jeder Slot zwischen zwei Flanken gilt als beobachtet
+            t = last + slot_seconds
+            while t < timestamp:
+                stats.tick(t)
+                t += slot_seconds
+        if motion:
+            stats.record_motion(timestamp)
+        else:
+            stats.tick(timestamp)
+        last = timestamp
+
+
+def replay(events: Iterable[Tuple[float, bool]], config: AppConfig,
+           tick: float = 1.0, speed: float = 1000.0,
+           stats: Optional[MotionStatistics] = None) -> ReplayReport:
+    """
+    Spielt Bewegungs-Flanken durch die Modus-Logik
+    
+    Args:
+        events: (Zeitstempel, Bewegung), zeitlich sortiert
+        config: Konfiguration (Modus, Timeout, Arbeitszeiten)
+        tick: Abstand der Update-Schleife in virtuellen Sekunden
+        speed: Beschleunigungsfaktor gegenüber Echtzeit (0 = so schnell wie möglich)
+        stats: Vorab gelernte Statistik für predictive_wake (Standard: lernt während des Replays)
+    """
+    report = ReplayReport()
+    iterator = iter(events)
+    first = next(iterator, None)
+    if first is None:
+        return report
+    
+    clock = VirtualClock(first[0])
+    session = ReplaySession(config, clock, stats)
+    screen = session.screen_controller
+    screen.start()
+    
+    wall_start = time.monotonic()
+    sim_start = clock.time()
+    
+    def advance_to(target: float):
+        # Update-Schleife wie im echten Fenster, nur mit virtueller Zeit
+        next_tick = clock.time() + tick
+        while next_tick <= target:
+            clock.set(next_tick)
+            session.tick()
+            next_tick += tick
+        clock.set(target)
+        
+        if speed > 0:
+            ahead = (clock.time() - sim_start) / speed - (time.monotonic() - wall_start)
+            if ahead > 0:
+                time.sleep(ahead)
+    
+    def handle(timestamp: float, motion: bool):
+        advance_to(timestamp)
+        if motion:
+            report.arrivals += 1
+            if not session.screen_active:
+                report.dark_arrivals += 1
+        session.motion(motion, timestamp)
+    
+    handle(*first)
+    for timestamp, motion in iterator:
+        handle(timestamp, motion)
+    
+    # Nachlauf bis zum letzten möglichen Timeout
+    advance_to(clock.time() + max(config.screen_timeout, tick) + tick)
+    screen.finish()
+    
+    report.simulated_seconds = clock.time() - sim_start
+    report.screen_on_seconds = screen.on_seconds
+    report.power_cycles = screen.power_cycles
+    report.slides_shown = session.slides_shown
+    if session.predictive:
+        report.predictive = session.predictive.get_report(clock.time())
+    report.wall_seconds = time.monotonic() - wall_start
+    return report
+
+
+def main():
+    """Hauptfunktion für das Replay-CLI"""
+    parser = argparse.ArgumentParser(
+        description='Beschleunigter Replay von Bewegungs-Traces',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Beispiele:
+  %(prog)s motion.trace                        # Modus/Timeout aus config.json
+  %(prog)s motion.trace --timeout 60           # Kürzeren Timeout testen
+  %(prog)s woche1.trace woche2.trace --speed 0 # So schnell wie möglich
+        """
+    )
+    parser.add_argument('traces', nargs='+', type=Path, help='Trace-Dateien (motion_trace_file)')
+    parser.add_argument('--mode', choices=['pir', 'time', 'continuous', 'time_pir'],
+                        help='Display-Modus (Standard: aus config.json)')
+    parser.add_argument('--timeout', type=int, help='screen_timeout in Sekunden')
+    parser.add_argument('--work-start', help='Arbeitsbeginn HH:MM')
+    parser.add_argument('--work-end', help='Feierabend HH:MM')
+    parser.add_argument('--tick', type=float, default=1.0, help='Virtuelle Sekunden pro Update (Standard: 1)')
+    parser.add_argument('--speed', type=float, default=1000.0,
+                        help='Beschleunigung gegenüber Echtzeit (Standard: 1000, 0 = unbegrenzt)')
+    parser.add_argument('--predictive', action='store_true',
+                        help='Vorausschauendes Einschalten gegen festen Timeout vergleichen')
+    parser.add_argument('--pretrain', action='store_true',
+                        help='Statistik vorab aus dem kompletten Trace lernen (mit --predictive)')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING)
+    
+    missing = [str(path) for path in args.traces if not path.exists()]
+    if missing:
+        print(f"❌ Trace-Datei nicht gefunden: {', '.join(missing)}")
+        sys.exit(1)
+    
+    config = ConfigManager().get()
+    overrides = {}
+    if args.mode:
+        overrides['display_mode'] = args.mode
+    if args.timeout is not None:
+        overrides['screen_timeout'] = args.timeout
+    if args.work_start:
+        overrides['work_start_time'] = args.work_start
+    if args.work_end:
+        overrides['work_end_time'] = args.work_end
+    config = replace(config, **overrides)
+    
+    print("\n" + "="*60)
+    print(f"🔁 REPLAY: Modus {config.display_mode}, Timeout {config.screen_timeout}s")
+    print("="*60 + "\n")
+    
+    if not args.predictive:
+        report = replay(merge_traces(args.traces), config, tick=args.tick, speed=args.speed)
+        print(report.format())
+        print("\n" + "="*60 + "\n")
+        return
+    
+    stats = None
+    if args.pretrain:
+        stats = MotionStatistics()
+        train_statistics(stats, merge_traces(args.traces))
+    
+    baseline = replay(merge_traces(args.traces), replace(config, predictive_wake=False),
+                      tick=args.tick, speed=args.speed)
+    report = replay(merge_traces(args.traces), replace(config, predictive_wake=True),
+                    tick=args.tick, speed=args.speed, stats=stats)
+    print(report.format())
+    print("\nGegenüber festem screen_timeout:")
+    print(report.format_comparison(baseline))
+    print("\n" + "="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,105 +3,281 @@
 Bildschirm-Steuerung für HDMI Display
 """
 
-import subprocess
 import logging
-import os
+import threading
 import time
+from typing import Dict, List, Optional
+
+from .latency import LatencyHistogram
+from .display_backends import DisplayBackend, detect_backends
+from .energy import EnergyMeter
 
 logger = logging.getLogger(__name__)
 
 
 class ScreenController:
-    """Klasse zur Steuerung des HDMI-Bildschirms"""
+    """
+    Klasse zur Steuerung des HDMI-Bildschirms
+    
+    turn_on()/turn_off() setzen nur den gewünschten Zustand und kehren sofort
+    zurück. Ein Worker-Thread führt die Befehle aus: Bei schnellen Wechseln
+    zählt nur der letzte Wunsch, fehlgeschlagene Befehle werden mit
+    wachsendem Abstand wiederholt, bis der Bildschirm dem Wunsch entspricht.
+    """
     
-    def __init__(self):
-        self.is_on = True
-        self.last_command_time = 0
+    RETRY_DELAY = 1.0  # Erste Wartezeit nach einem Fehler
+    MAX_RETRY_DELAY = 30.0
+    VERIFY_INTERVAL = 60.0  # Regelmäßige Rückmeldung des echten Zustands
+    
+    def __init__(self, asynchronous: bool = True, backends: Optional[List[DisplayBackend]] = None,
+                 energy: Optional[EnergyMeter] = None):
+        """
+        Args:
+            asynchronous: Befehle im Worker-Thread ausführen (False = direkt im Aufrufer)
+            backends: Eigene Backends (Standard: einmalig ermittelt, siehe display_backends)
+            energy: Zählt Einschaltdauer und Schaltvorgänge (optional)
+        """
+        self.is_on = True  # Gewünschter Zustand (sofort gültig)
+        self.actual_on: Optional[bool] = None  # Echter Zustand (Rückmeldung oder letzter Erfolg)
+        self.asynchronous = asynchronous
+        self.energy = energy
+        self._backends = backends
+        self._detect_backends = backends is None
+        
+        # Statistik
+        self.commands = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.readback_mismatches = 0
+        self.command_times = LatencyHistogram()
+        
+        self._cond = threading.Condition()
+        self._pending = False
+        self._worker: Optional[threading.Thread] = None
+        self._closing = False
         logger.info("ScreenController initialisiert")
     
     def turn_on(self) -> bool:
-        """Schaltet den Bildschirm ein"""
-        try:
-            # Verhindere zu häufige Befehle
-            current_time = time.time()
-            if current_time - self.last_command_time < 1:
-                return True
-            
-            self.last_command_time = current_time
-            
-            # HDMI einschalten
-            # Methode 1: vcgencmd (Raspberry Pi spezifisch)
-            result = subprocess.run(
-                ['vcgencmd', 'display_power', '1'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            # Methode 2: xset (für X11)
-            if os.environ.get('DISPLAY'):
-                subprocess.run(
-                    ['xset', 'dpms', 'force', 'on'],
-                    capture_output=True,
-                    timeout=5
-                )
-            
-            self.is_on = True
-            logger.info("Bildschirm eingeschaltet")
-            return True
-            
-        except subprocess.TimeoutExpired:
-            logger.error("Timeout beim Einschalten des Bildschirms")
-            return False
-        except FileNotFoundError:
-            logger.warning("vcgencmd nicht gefunden - möglicherweise kein Raspberry Pi")
-            self.is_on = True
-            return True
-        except Exception as e:
-            logger.error(f"Fehler beim Einschalten des Bildschirms: {e}")
-            return False
+        """Schaltet den Bildschirm ein (kehrt sofort zurück)"""
+        return self._request(True)
     
     def turn_off(self) -> bool:
-        """Schaltet den Bildschirm aus"""
-        try:
-            # Verhindere zu häufige Befehle
-            current_time = time.time()
-            if current_time - self.last_command_time < 1:
-                return True
-            
-            self.last_command_time = current_time
+        """Schaltet den Bildschirm aus (kehrt sofort zurück)"""
+        return self._request(False)
+    
+    def _request(self, on: bool) -> bool:
+        """Setzt den gewünschten Zustand und weckt den Worker"""
+        if not self.asynchronous:
+            self.is_on = on
+            return self._reconcile_once()
+        
+        with self._cond:
+            if self._pending and self.is_on != on:
+                # Vorheriger Wunsch wurde noch nicht ausgeführt
+                self.coalesced += 1
+            self.is_on = on
+            self._pending = True
+            self._closing = False
+            self._ensure_worker()
+            self._cond.notify()
+        return True
+    
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._worker_loop, name="screen-control", daemon=True)
+            self._worker.start()
+    
+    def _worker_loop(self):
+        """Gleicht den tatsächlichen Zustand an den gewünschten an"""
+        retry_delay = self.RETRY_DELAY
+        while True:
+            with self._cond:
+                if not self._pending and not self._closing:
+                    self._cond.wait(self.VERIFY_INTERVAL)
+                if not self._pending and self._closing:
+                    backends = self._detach_worker()
+                    break
+                run = self._pending
+                self._pending = False
             
-            # HDMI ausschalten
-            # Methode 1: vcgencmd (Raspberry Pi spezifisch)
-            result = subprocess.run(
-                ['vcgencmd', 'display_power', '0'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            if not run:
+                # Kein neuer Wunsch: prüfen ob der Bildschirm noch stimmt
+                self._verify()
+                continue
             
-            # Methode 2: xset (für X11)
-            if os.environ.get('DISPLAY'):
-                subprocess.run(
-                    ['xset', 'dpms', 'force', 'off'],
-                    capture_output=True,
-                    timeout=5
-                )
+            if self._reconcile_once():
+                retry_delay = self.RETRY_DELAY
+                continue
             
-            self.is_on = False
-            logger.info("Bildschirm ausgeschaltet")
+            # Fehlgeschlagen: später erneut versuchen (neuer Wunsch weckt sofort)
+            with self._cond:
+                self._pending = True
+                if self._closing:
+                    backends = self._detach_worker()
+                    break
+                self._cond.wait(retry_delay)
+            retry_delay = min(retry_delay * 2, self.MAX_RETRY_DELAY)
+        
+        for backend in backends or []:
+            backend.close()
+        if self.energy:
+            self.energy.save()
+    
+    def _detach_worker(self) -> Optional[List[DisplayBackend]]:
+        """
+        Meldet den Worker ab (nur mit gehaltenem _cond aufrufen)
+        
+        Muss im selben Lock-Abschnitt wie die Entscheidung zum Beenden
+        passieren: Ein Wunsch danach sieht keinen Worker mehr und startet
+        einen neuen, statt bei einem endenden Worker liegen zu bleiben.
+        
+        Returns:
+            Selbst ermittelte Backends, die der Worker freigeben soll
+        """
+        self._worker = None
+        backends = None
+        if self._detect_backends:
+            backends, self._backends = self._backends, None
+        return backends
+    
+    def _reconcile_once(self) -> bool:
+        """Führt den aktuellen Wunsch aus, falls er vom Ist-Zustand abweicht"""
+        target = self.is_on
+        if self.actual_on == target:
             return True
-            
-        except subprocess.TimeoutExpired:
-            logger.error("Timeout beim Ausschalten des Bildschirms")
-            return False
-        except FileNotFoundError:
-            logger.warning("vcgencmd nicht gefunden - möglicherweise kein Raspberry Pi")
-            self.is_on = False
+        
+        start = time.monotonic()
+        ok = self._set_power(target)
+        elapsed_ms = (time.monotonic() - start) * 1000.0
+        
+        self.commands += 1
+        self.command_times.record(elapsed_ms)
+        if ok:
+            readback = self.read_power()
+            if readback is not None and readback != target:
+                self.readback_mismatches += 1
+                ok = False
+                self._set_actual(readback)
+                logger.error(f"Bildschirm meldet {'an' if readback else 'aus'} nach Befehl "
+                             f"{'an' if target else 'aus'}")
+        if ok:
+            self._set_actual(target)
+            logger.info("Bildschirm %s (%.0fms)", 'eingeschaltet' if target else 'ausgeschaltet', elapsed_ms)
+        else:
+            self.failures += 1
+            logger.error(f"Bildschirm konnte nicht {'eingeschaltet' if target else 'ausgeschaltet'} "
+                         f"werden ({elapsed_ms:.0f}ms)")
+        return ok
+    
+    def _set_actual(self, on: bool):
+        if on != self.actual_on:
+            self.actual_on = on
+            if self.energy:
+                self.energy.record_power(on)
+    
+    def read_power(self, allow_fork: bool = True) -> Optional[bool]:
+        """
+        Liest den echten Zustand vom ersten Backend, das ihn kennt
+        
+        Args:
+            allow_fork: Auch Backends verwenden, die dafür einen Prozess starten
+        """
+        for backend in self._backends or []:
+            if backend.forks and not allow_fork:
+                continue
+            try:
+                state = backend.get_power()
+            except Exception as e:
+                logger.debug("Rückmeldung von %s fehlgeschlagen: %s", backend.name, e)
+                continue
+            if state is not None:
+                return state
+        return None
+    
+    def _verify(self):
+        """Gleicht extern geänderten Zustand ab (z.B. Taste am Bildschirm)"""
+        readback = self.read_power(allow_fork=False)
+        if readback is None or readback == self.actual_on:
+            return
+        logger.warning(f"Bildschirm ist unerwartet {'an' if readback else 'aus'} - stelle Wunschzustand her")
+        self.readback_mismatches += 1
+        self._set_actual(readback)
+        with self._cond:
+            self._pending = True
+    
+    def get_actual_state(self) -> Optional[bool]:
+        """Echter Zustand (None = noch unbekannt)"""
+        return self.actual_on
+    
+    def _get_backends(self) -> List[DisplayBackend]:
+        """Ermittelt die Backends beim ersten Befehl (im Worker-Thread)"""
+        if self._backends is None:
+            self._backends = detect_backends()
+        return self._backends
+    
+    def _set_power(self, on: bool) -> bool:
+        """
+        Schaltet den Bildschirm (läuft im Worker-Thread)
+        
+        Die Backends werden in Prioritätsreihenfolge versucht, das erste
+        erfolgreiche gewinnt.
+        
+        Returns:
+            True bei Erfolg oder wenn kein Backend verfügbar ist
+        """
+        backends = self._get_backends()
+        if not backends:
             return True
-        except Exception as e:
-            logger.error(f"Fehler beim Ausschalten des Bildschirms: {e}")
-            return False
+        
+        for backend in backends:
+            try:
+                if backend.set_power(on):
+                    return True
+            except Exception as e:
+                logger.error(f"Backend {backend.name} fehlgeschlagen: {e}")
+        return False
+    
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """
+        Wartet bis der Worker alle Wünsche ausgeführt hat
+        
+        Returns:
+            True wenn der Ist-Zustand dem Wunsch entspricht
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                worker_busy = self._worker is not None and self._worker.is_alive() and self._pending
+            if self.actual_on == self.is_on and not worker_busy:
+                return True
+            time.sleep(0.01)
+        return self.actual_on == self.is_on
+    
+    def close(self, timeout: float = 10.0):
+        """
+        Führt ausstehende Befehle aus und beendet den Worker
+        
+        Der Worker gibt beim Beenden die Backends frei und speichert die
+        Energie-Daten, auch wenn timeout=0 nicht auf ihn wartet.
+        """
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+    
+    def get_statistics(self) -> Dict[str, float]:
+        """Gibt Befehlszeiten und Fehler zurück"""
+        return {
+            'commands': self.commands,
+            'failures': self.failures,
+            'coalesced': self.coalesced,
+            'readback_mismatches': self.readback_mismatches,
+            'mean_ms': self.command_times.mean(),
+            'p95_ms': self.command_times.percentile(95),
+            'max_ms': self.command_times.max or 0.0,
+        }
     
     def get_status(self) -> bool:
         """Gibt den aktuellen Status des Bildschirms zurück"""
@@ -113,4 +289,3 @@ class ScreenController:
             return self.turn_off()
         else:
             return self.turn_on()
-
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Sensor-Manager für mehrere Eingänge (z.B. 2-3 PIR-Sensoren im Foyer)
+Alle Pins werden von einem einzigen Thread per epoll auf dem
+GPIO-Character-Device (/dev/gpiochipN) überwacht
+"""
+
+import os
+import time
+import fcntl
+import select
+import struct
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .gpio_backend import GPIOBackend
+from .motion_trace import MotionTraceWriter
+from .event_store import EventStore, EVENT_MOTION_ON, EVENT_MOTION_OFF
+from .pir_sensor import PIRSensor
+
+logger = logging.getLogger(__name__)
+
+# Linux GPIO Character Device (uAPI v1)
+GPIOHANDLE_REQUEST_INPUT = 1 << 0
+GPIOHANDLE_REQUEST_BIAS_PULL_DOWN = 1 << 6
+GPIOEVENT_REQUEST_BOTH_EDGES = (1 << 0) | (1 << 1)
+# struct gpioevent_request: u32 lineoffset, u32 handleflags, u32 eventflags, char[32] label, int fd
+GPIOEVENT_REQUEST_FORMAT = '=III32si'
+# _IOWR(0xB4, 0x04, struct gpioevent_request)
+GPIO_GET_LINEEVENT_IOCTL = 0xC030B404
+# _IOWR(0xB4, 0x08, struct gpiohandle_data) - 64 Byte Werte
+GPIOHANDLE_GET_LINE_VALUES_IOCTL = 0xC040B408
+# struct gpioevent_data: u64 timestamp, u32 id (+4 Byte Padding)
+GPIOEVENT_DATA_SIZE = 16
+
+SENSOR_LOGIC_MODES = ("or", "and", "priority")
+
+
+@dataclass
+class SensorInput:
+    """Ein Eingang des Sensor-Managers"""
+    
+    pin: int
+    name: str = ""
+    kind: str = "pir"  # "pir" oder später z.B. "door" (Türkontakt)
+    priority: int = 0  # Nur für Logik "priority": höher = wichtiger
+    active_low: bool = False  # True für Kontakte, die bei Aktivität auf LOW gehen
+    
+    def __post_init__(self):
+        if not self.name:
+            self.name = f"{self.kind}-{self.pin}"
+
+
+class GpioChipReader:
+    """
+    Liest Flanken mehrerer GPIO-Leitungen über epoll
+    
+    Verwendet die Line-Event-Schnittstelle des Kernels, d.h. jede Leitung
+    bekommt einen eigenen Dateideskriptor, der bei einer Flanke lesbar wird.
+    """
+    
+    def __init__(self, chip_path: str = "/dev/gpiochip0"):
+        self.chip_path = chip_path
+        self._chip_fd = os.open(chip_path, os.O_RDONLY | os.O_CLOEXEC)
+        self._line_fds: Dict[int, int] = {}
+    
+    def request_line(self, pin: int, label: str = "raspi-app") -> int:
+        """
+        Fordert eine Leitung als Eingang mit Flankenerkennung an
+        
+        Returns:
+            Dateideskriptor für die Flanken-Events
+        """
+        request = bytearray(struct.pack(
+            GPIOEVENT_REQUEST_FORMAT,
+            pin,
+            GPIOHANDLE_REQUEST_INPUT | GPIOHANDLE_REQUEST_BIAS_PULL_DOWN,
+            GPIOEVENT_REQUEST_BOTH_EDGES,
+            label.encode()[:31],
+            0
+        ))
+        try:
+            fcntl.ioctl(self._chip_fd, GPIO_GET_LINEEVENT_IOCTL, request, True)
+        except OSError:
+            # Ältere Kernel kennen keine Bias-Flags
+            request[4:8] = struct.pack('=I', GPIOHANDLE_REQUEST_INPUT)
+            fcntl.ioctl(self._chip_fd, GPIO_GET_LINEEVENT_IOCTL, request, True)
+        
+        line_fd = struct.unpack(GPIOEVENT_REQUEST_FORMAT, request)[4]
+        os.set_blocking(line_fd, False)
+        self._line_fds[pin] = line_fd
+        return line_fd
+    
+    @staticmethod
+    def read_value(line_fd: int) -> int:
+        """Liest den aktuellen Pegel einer angeforderten Leitung"""
+        data = bytearray(64)
+        fcntl.ioctl(line_fd, GPIOHANDLE_GET_LINE_VALUES_IOCTL, data, True)
+        return data[0]
+    
+    @staticmethod
+    def drain_events(line_fd: int):
+        """Verwirft alle anstehenden Flanken-Events (nur der Pegel zählt)"""
+        try:
+            while os.read(line_fd, GPIOEVENT_DATA_SIZE * 16):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+    
+    def close(self):
+        """Gibt alle Leitungen und den Chip frei"""
+        for line_fd in self._line_fds.values():
+            try:
+                os.close(line_fd)
+            except OSError:
+                pass
+        self._line_fds.clear()
+        try:
+            os.close(self._chip_fd)
+        except OSError:
+            pass
+
+
+class SensorManager:
+    """
+    Kombiniert mehrere Eingänge zu einem Bewegungssignal
+    
+    Logik:
+      "or"       - Bewegung sobald irgendein Eingang aktiv ist
+      "and"      - Bewegung nur wenn alle Eingänge aktiv sind
+      "priority" - Nur der funktionsfähige Eingang mit der höchsten
+                   Priorität zählt, die übrigen dienen als Reserve
+    
+    Die Schnittstelle entspricht PIRSensor (callback(bool), start_monitoring,
+    cleanup, ...), damit SlideshowWindow beide gleich behandeln kann.
+    """
+    
+    def __init__(self, inputs: List[SensorInput], callback: Optional[Callable] = None,
+                 logic: str = "or", chip_path: str = "/dev/gpiochip0",
+                 backend: Optional[GPIOBackend] = None, debounce_ms: int = 50,
+                 trace: Optional[MotionTraceWriter] = None,
+                 events: Optional[EventStore] = None):
+        """
+        Args:
+            inputs: Liste der Eingänge
+            callback: Funktion die bei Bewegung aufgerufen wird (callback(bool))
+            logic: "or", "and" oder "priority"
+            chip_path: GPIO-Character-Device
+            backend: GPIO-Backend für den Fallback ohne Character-Device
+            debounce_ms: Software-Entprellung in Millisekunden
+            trace: Zeichnet das kombinierte Signal in einer Trace-Datei auf (optional)
+            events: Event-Speicher, erhält die Flanken jedes einzelnen Eingangs (optional)
+        """
+        if logic not in SENSOR_LOGIC_MODES:
+            logger.warning(f"Unbekannte Sensor-Logik '{logic}' - verwende 'or'")
+            logic = "or"
+        
+        self.inputs = inputs
+        self.callback = callback
+        self.logic = logic
+        self.chip_path = chip_path
+        self.backend = backend
+        self.debounce = max(debounce_ms, 0) / 1000.0
+        self.trace = trace
+        self.events = events
+        self.enabled = False
+        self.motion_detected = False
+        self.last_motion_time = 0
+        self.last_edge_time = 0.0
+        self.mode = "none"  # "epoll", "fallback" oder "none"
+        self.initialization_failed = False
+        
+        self._states: Dict[int, bool] = {inp.pin: False for inp in inputs}
+        self._healthy: Dict[int, bool] = {inp.pin: False for inp in inputs}
+        self._last_change: Dict[int, float] = {inp.pin: 0.0 for inp in inputs}
+        self._lock = threading.Lock()
+        
+        self._reader: Optional[GpioChipReader] = None
+        self._fallback_sensors: List[PIRSensor] = []
+        self._thread: Optional[threading.Thread] = None
+        self._monitoring = False
+        self._stop_r: Optional[int] = None
+        self._stop_w: Optional[int] = None
+        
+        logger.info(f"SensorManager: {len(inputs)} Eingänge, Logik '{logic}'")
+    
+    def start_monitoring(self):
+        """Startet die Überwachung aller Eingänge"""
+        if self._monitoring:
+            return
+        
+        self.enabled = True
+        self._monitoring = True
+        
+        if self._start_epoll():
+            self.mode = "epoll"
+        elif self._start_fallback():
+            self.mode = "fallback"
+        else:
+            self.mode = "none"
+            self.initialization_failed = True
+            logger.warning("SensorManager: keine Eingänge verfügbar")
+        
+        logger.info(f"SensorManager Überwachung gestartet (Modus: {self.mode})")
+    
+    def _start_epoll(self) -> bool:
+        """Fordert alle Leitungen am Character-Device an"""
+        try:
+            self._reader = GpioChipReader(self.chip_path)
+        except OSError as e:
+            logger.info(f"GPIO-Character-Device nicht nutzbar ({self.chip_path}): {e}")
+            return False
+        
+        fd_map: Dict[int, SensorInput] = {}
+        for inp in self.inputs:
+            try:
+                line_fd = self._reader.request_line(inp.pin, f"raspi-app-{inp.name}")
+                fd_map[line_fd] = inp
+                self._healthy[inp.pin] = True
+                self._apply(inp, GpioChipReader.read_value(line_fd))
+            except OSError as e:
+                logger.error(f"Eingang {inp.name} (Pin {inp.pin}) nicht verfügbar: {e}")
+        
+        if not fd_map:
+            self._reader.close()
+            self._reader = None
+            return False
+        
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = threading.Thread(target=self._epoll_loop, args=(fd_map,), daemon=True)
+        self._thread.start()
+        return True
+    
+    def _start_fallback(self) -> bool:
+        """Fallback: ein PIRSensor pro Eingang über das GPIO-Backend"""
+        for inp in self.inputs:
+            sensor = PIRSensor(
+                pin=inp.pin,
+                callback=lambda motion, inp=inp: self._on_level(inp, int(motion)),
+                backend=self.backend,
+                debounce_ms=int(self.debounce * 1000)
+            )
+            if sensor.initialization_failed:
+                continue
+            # PIRSensor meldet "Bewegung" bei HIGH, active_low wird in _apply umgerechnet
+            self._healthy[inp.pin] = True
+            sensor.start_monitoring()
+            self._fallback_sensors.append(sensor)
+        return bool(self._fallback_sensors)
+    
+    def stop_monitoring(self):
+        """Stoppt die Überwachung"""
+        self.enabled = False
+        self._monitoring = False
+        
+        if self._stop_w is not None:
+            try:
+                os.write(self._stop_w, b'\0')
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        
+        for fd in (self._stop_r, self._stop_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._stop_r = self._stop_w = None
+        
+        # Leitungen freigeben, damit ein erneuter Start sauber anfordern kann
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+        for sensor in self._fallback_sensors:
+            sensor.cleanup()
+        self._fallback_sensors = []
+        logger.info("SensorManager Überwachung gestoppt")
+    
+    def cleanup(self):
+        """Gibt alle GPIO-Ressourcen frei"""
+        self.stop_monitoring()
+    
+    def _epoll_loop(self, fd_map: Dict[int, SensorInput]):
+        """Ein Thread, ein epoll für alle Eingänge"""
+        poller = select.epoll()
+        poller.register(self._stop_r, select.EPOLLIN)
+        for line_fd in fd_map:
+            poller.register(line_fd, select.EPOLLIN | select.EPOLLPRI)
+        
+        # Pro Leitung: Zeitpunkt, zu dem der Pegel nach dem Entprellen erneut gelesen wird
+        deadlines: Dict[int, float] = {}
+        
+        try:
+            while self._monitoring:
+                timeout = -1
+                if deadlines:
+                    timeout = max(0.0, min(deadlines.values()) - time.monotonic())
+                
+                for fd, _ in poller.poll(timeout):
+                    if fd == self._stop_r:
+                        return
+                    GpioChipReader.drain_events(fd)
+                    inp = fd_map[fd]
+                    self.last_edge_time = time.time()
+                    settle = self._last_change[inp.pin] + self.debounce
+                    if time.monotonic() >= settle:
+                        self._read_and_apply(fd, inp)
+                    else:
+                        deadlines[fd] = settle
+                
+                now = time.monotonic()
+                for fd in [fd for fd, deadline in deadlines.items() if deadline <= now]:
+                    del deadlines[fd]
+                    self._read_and_apply(fd, fd_map[fd])
+        except Exception as e:
+            logger.error(f"Fehler im SensorManager-Thread: {e}")
+        finally:
+            poller.close()
+    
+    def _read_and_apply(self, line_fd: int, inp: SensorInput):
+        """Liest den Pegel einer Leitung und übernimmt ihn"""
+        try:
+            self._apply(inp, GpioChipReader.read_value(line_fd))
+        except OSError as e:
+            logger.error(f"Lesefehler an Eingang {inp.name}: {e}")
+            self._healthy[inp.pin] = False
+            self._evaluate(inp, rising=False)
+    
+    def _on_level(self, inp: SensorInput, level: int):
+        """Pegel-Callback aus dem Fallback-Modus"""
+        self.last_edge_time = time.time()
+        self._apply(inp, level)
+    
+    def _apply(self, inp: SensorInput, level: int):
+        """Übernimmt den Pegel eines Eingangs und wertet die Logik aus"""
+        active = bool(level) != inp.active_low
+        with self._lock:
+            if self._states[inp.pin] == active:
+                return
+            self._states[inp.pin] = active
+            self._last_change[inp.pin] = time.monotonic()
+        logger.debug("Eingang %s: %s", inp.name, 'aktiv' if active else 'inaktiv')
+        if self.events:
+            self.events.append(EVENT_MOTION_ON if active else EVENT_MOTION_OFF,
+                               self.last_edge_time or time.time(), source=inp.pin)
+        self._evaluate(inp, rising=active)
+    
+    def _primary(self) -> Optional[SensorInput]:
+        """Funktionsfähiger Eingang mit der höchsten Priorität"""
+        healthy = [inp for inp in self.inputs if self._healthy[inp.pin]]
+        return max(healthy, key=lambda inp: inp.priority) if healthy else None
+    
+    def _combined(self) -> bool:
+        """Berechnet das kombinierte Bewegungssignal"""
+        healthy = [inp for inp in self.inputs if self._healthy[inp.pin]]
+        if not healthy:
+            return False
+        
+        if self.logic == "and":
+            return all(self._states[inp.pin] for inp in healthy)
+        if self.logic == "priority":
+            return self._states[self._primary().pin]
+        return any(self._states[inp.pin] for inp in healthy)
+    
+    def _evaluate(self, inp: SensorInput, rising: bool):
+        """Ruft den Callback bei Änderungen des kombinierten Signals auf"""
+        with self._lock:
+            combined = self._combined()
+            changed = combined != self.motion_detected
+            self.motion_detected = combined
+            if self.logic == "priority" and inp is not self._primary():
+                # Reserve-Eingänge lösen keine neue Bewegung aus
+                rising = False
+        
+        if combined and (changed or rising):
+            # Jede neue Aktivität zählt wie eine neue Bewegung
+            self.last_motion_time = time.time()
+            if changed:
+                logger.debug("Bewegung erkannt!")
+            if self.trace:
+                self.trace.record(self.last_edge_time or time.time(), True)
+            if self.callback:
+                self.callback(True)
+        elif changed:
+            logger.debug("Keine Bewegung mehr")
+            if self.trace:
+                self.trace.record(self.last_edge_time or time.time(), False)
+            if self.callback:
+                self.callback(False)
+    
+    def is_motion_detected(self) -> bool:
+        """Gibt zurück ob aktuell Bewegung erkannt wird"""
+        return self.motion_detected
+    
+    def get_last_motion_time(self) -> float:
+        """Gibt den Zeitpunkt der letzten Bewegung zurück"""
+        return self.last_motion_time
+    
+    def get_input_states(self) -> Dict[str, bool]:
+        """Gibt den Zustand jedes Eingangs zurück (für Status-Anzeigen)"""
+        return {inp.name: self._states[inp.pin] for inp in self.inputs}
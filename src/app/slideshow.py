@@ -4,12 +4,16 @@ Slideshow-Verwaltung für Bildanzeige
 """
 
 import os
+import time
 import random
 import logging
 from pathlib import Path
-from typing import List, Optional
-from PIL import Image, ImageTk
-import tkinter as tk
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .flight_recorder import get_flight_recorder
+
+if TYPE_CHECKING:
+    from PIL import ImageTk
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +37,7 @@ class Slideshow:
         self.current_index = 0
         self.current_image = None
         self.current_photo = None
+        self._prefetched = None  # (Pfad, Größe, PhotoImage) des vordekodierten Bildes
         
         self.load_images()
         logger.info(f"Slideshow initialisiert mit {len(self.images)} Bildern")
@@ -67,6 +72,9 @@ class Slideshow:
         else:
             self.images.sort()
         
+        # Position gültig halten, falls inzwischen Bilder entfernt wurden
+        self.current_index = self.current_index % len(self.images) if self.images else 0
+        
         logger.info(f"{len(self.images)} Bilder geladen aus {self.image_folder}")
         
         if len(self.images) == 0:
@@ -92,6 +100,78 @@ class Slideshow:
         
         return image_path
     
+    def seek(self, image_path: Path) -> bool:
+        """Setzt die Position so, dass get_next_image() image_path liefert"""
+        try:
+            self.current_index = self.images.index(image_path)
+        except ValueError:
+            return False
+        return True
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Reihenfolge und Position für den Zustands-Snapshot"""
+        return {
+            'image_folder': str(self.image_folder),
+            'random_order': self.random_order,
+            'playlist': [path.name for path in self.images],
+            'index': self.current_index,
+        }
+    
+    def restore_state(self, state: Dict[str, Any]) -> bool:
+        """
+        Übernimmt Reihenfolge und Position aus einem Snapshot
+        
+        Gilt nur für denselben Ordner und dieselbe Reihenfolge-Einstellung.
+        Inzwischen gelöschte Bilder entfallen, neue kommen ans Ende.
+        
+        Returns:
+            True wenn die Reihenfolge übernommen wurde
+        """
+        if state.get('image_folder') != str(self.image_folder) or state.get('random_order') != self.random_order:
+            return False
+        
+        by_name = {path.name: path for path in self.images}
+        ordered = [by_name.pop(name) for name in state.get('playlist', []) if name in by_name]
+        if not ordered:
+            return False
+        ordered.extend(path for path in self.images if path.name in by_name)
+        
+        self.images = ordered
+        self.current_index = int(state.get('index', 0)) % len(self.images)
+        return True
+    
+    def peek_next_image(self) -> Optional[Path]:
+        """Gibt den Pfad zum nächsten Bild zurück, ohne weiterzuschalten"""
+        if not self.images:
+            return None
+        return self.images[self.current_index % len(self.images)]
+    
+    def prefetch_next(self, width: int, height: int) -> bool:
+        """
+        Dekodiert und skaliert das nächste Bild vorab
+        
+        Der nächste Aufruf von load_image_for_display() mit gleichem Pfad
+        und gleicher Größe liefert das fertige Bild ohne Dekodierzeit.
+        
+        Returns:
+            True wenn ein Bild bereitliegt
+        """
+        image_path = self.peek_next_image()
+        if not image_path:
+            return False
+        if self._prefetched and self._prefetched[:2] == (image_path, (width, height)):
+            return True
+        
+        photo = self._decode(image_path, width, height)
+        self._prefetched = (image_path, (width, height), photo) if photo else None
+        return photo is not None
+    
+    def release_frames(self):
+        """Gibt dekodierte Bilder frei (z.B. während der Bildschirm aus ist)"""
+        self.current_image = None
+        self.current_photo = None
+        self._prefetched = None
+    
     def get_previous_image(self) -> Optional[Path]:
         """Gibt den Pfad zum vorherigen Bild zurück"""
         if not self.images:
@@ -100,7 +180,7 @@ class Slideshow:
         self.current_index = (self.current_index - 2) % len(self.images)
         return self.get_next_image()
     
-    def load_image_for_display(self, image_path: Path, width: int, height: int) -> Optional[ImageTk.PhotoImage]:
+    def load_image_for_display(self, image_path: Path, width: int, height: int) -> Optional['ImageTk.PhotoImage']:
         """
         Lädt ein Bild und skaliert es für die Anzeige
         
@@ -112,6 +192,19 @@ class Slideshow:
         Returns:
             PhotoImage für Tkinter oder None bei Fehler
         """
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched and prefetched[:2] == (image_path, (width, height)):
+            self.current_photo = prefetched[2]
+            return self.current_photo
+        
+        return self._decode(image_path, width, height)
+    
+    def _decode(self, image_path: Path, width: int, height: int) -> Optional['ImageTk.PhotoImage']:
+        """Lädt, skaliert und konvertiert ein Bild für Tkinter"""
+        # PIL erst beim ersten Bild laden (Bildliste und CLI-Werkzeuge brauchen es nicht)
+        from PIL import Image, ImageTk
+        
+        start = time.perf_counter()
         try:
             # Lade Bild
             img = Image.open(image_path)
@@ -138,10 +231,11 @@ class Slideshow:
             self.current_image = img
             self.current_photo = photo
             
+            get_flight_recorder().sample('decode_ms', (time.perf_counter() - start) * 1000.0)
             return photo
             
         except Exception as e:
-            logger.error(f"Fehler beim Laden von {image_path}: {e}")
+            logger.error(f"Fehler beim Laden von {image_path}: {e}", extra={'image_path': str(image_path)})
             return None
     
     def get_image_count(self) -> int:
@@ -152,9 +246,24 @@ class Slideshow:
         """Gibt den aktuellen Index zurück"""
         return self.current_index
     
+    def set_folder(self, image_folder: str):
+        """Wechselt den Bildordner (liest die Bilder neu ein)"""
+        self.image_folder = Path(image_folder)
+        self.current_index = 0
+        self.release_frames()
+        self.load_images()
+    
     def set_random_order(self, random_order: bool):
-        """Setzt die Reihenfolge (zufällig oder sortiert)"""
-        if self.random_order != random_order:
-            self.random_order = random_order
-            self.load_images()
+        """Setzt die Reihenfolge (zufällig oder sortiert), ohne den Ordner neu einzulesen"""
+        if self.random_order == random_order:
+            return
+        self.random_order = random_order
+        upcoming = self.peek_next_image()
+        if random_order:
+            random.shuffle(self.images)
+        else:
+            self.images.sort()
+        # Weiter mit dem Bild, das ohnehin als nächstes gekommen wäre
+        if upcoming is None or not self.seek(upcoming):
+            self.current_index = 0
 
@@ -5,49 +5,88 @@ Slideshow-Fenster für die Bildanzeige
 
 import tkinter as tk
 from tkinter import ttk
+import gc
+import os
 import logging
 import time
-from typing import Optional, Callable
+from dataclasses import replace
+from typing import Any, Dict, Optional, Callable, Union
 from pathlib import Path
 
 from .slideshow import Slideshow
 from .pir_sensor import PIRSensor
+from .sensor_manager import SensorInput, SensorManager
 from .screen_control import ScreenController
+from .energy import EnergyMeter
 from .time_control import TimeController
-from .config import AppConfig
+from .config import AppConfig, ConfigDiff, DATA_DIR
+from .event_bus import ConfigChangedEvent, EventBus, MotionEvent
+from .gpio_backend import GPIOBackend
+from .latency import MotionLatencyTracker
+from .motion_trace import MotionTraceWriter
+from .motion_stats import MotionStatistics, PredictiveWake
+from .display_policy import DisplayPolicy, REASON_TIMEOUT, REASON_WARM
+from .event_store import EventStore, EVENT_SCREEN_ON, EVENT_SCREEN_OFF, EVENT_SLIDE
+from .flight_recorder import get_flight_recorder
+from .last_frame import LastFrame
+from .state import StateSnapshot
+from .utils import get_rss_bytes, trim_heap
 
 logger = logging.getLogger(__name__)
 
 
 class SlideshowWindow:
-    """Vollbild-Slideshow-Fenster"""
+    """
+    Vollbild-Slideshow-Fenster
     
-    def __init__(self, config: AppConfig, on_exit_callback: Optional[Callable] = None):
+    Wird einmal erzeugt und über start()/stop() wiederverwendet. Fenster,
+    Bildliste, Caches und Sensor bleiben dabei erhalten; Änderungen der
+    Konfiguration übernimmt apply_config().
+    """
+    
+    # Felder, nach deren Änderung der Sensor neu eingerichtet wird
+    SENSOR_FIELDS = ('display_mode', 'pir_pin', 'pir_pins', 'sensor_logic', 'gpio_chip',
+                     'pir_use_interrupts', 'pir_debounce_ms', 'motion_trace_file', 'record_events')
+    PREDICTIVE_FIELDS = ('display_mode', 'screen_timeout', 'predictive_wake', 'predictive_min_timeout',
+                         'predictive_hot_threshold', 'predictive_dead_threshold')
+    
+    UPDATE_INTERVAL_MS = 100
+    # Im Deep-Idle nur noch selten prüfen (Arbeitsbeginn, vorausschauendes Einschalten)
+    DEEP_IDLE_CHECK_MS = 60000
+    # Beim Beenden höchstens so lange auf den Bildschirm-Worker warten (Sekunden)
+    CLOSE_TIMEOUT = 5.0
+    
+    def __init__(self, config: AppConfig, on_exit_callback: Optional[Callable] = None,
+                 screen_controller: Optional[ScreenController] = None,
+                 gpio_backend: Optional[GPIOBackend] = None, master: Optional[tk.Misc] = None,
+                 state: Optional[StateSnapshot] = None):
         """
         Initialisiert das Slideshow-Fenster
         
         Args:
             config: App-Konfiguration
             on_exit_callback: Callback wenn ESC gedrückt wird
+            screen_controller: Eigener ScreenController (z.B. für Benchmarks)
+            gpio_backend: Eigenes GPIO-Backend für den PIR Sensor
+            master: Tk-Hauptfenster (Standard: das zuerst erstellte)
+            state: Zustands-Snapshot (Reihenfolge und Position vom letzten Lauf)
         """
-        self.config = config
+        self.config = replace(config)  # Eigene Kopie, damit apply_config() Änderungen erkennt
         self.on_exit_callback = on_exit_callback
+        self.gpio_backend = gpio_backend
+        self.clock: Callable[[], float] = time.time  # Austauschbar für Replays
+        # Wird nach dem ersten gezeichneten Bild jedes start() aufgerufen
+        self.on_first_frame: Optional[Callable[[], None]] = None
+        self._first_frame_pending = False
         
         # Fenster erstellen
-        self.root = tk.Toplevel()
+        self.root = tk.Toplevel(master)
         self.root.title("Slideshow")
         
         # Erst normale Größe, dann Vollbild (verhindert Probleme)
         self.root.geometry("1920x1080")
         self.root.configure(bg='black')
         
-        # Vollbild-Konfiguration (wie PowerPoint)
-        if config.fullscreen:
-            # Warte kurz, dann aktiviere Vollbild
-            self.root.after(100, lambda: self.root.attributes('-fullscreen', True))
-            self.root.after(150, lambda: self.root.attributes('-topmost', True))
-            self.root.after(200, lambda: self.root.overrideredirect(True))
-        
         # Mauszeiger verstecken (wenn aktiviert)
         cursor_style = 'none' if getattr(config, 'hide_cursor', True) else ''
         self.root.configure(cursor=cursor_style)
@@ -60,20 +99,61 @@ class SlideshowWindow:
         
         # Komponenten
         self.slideshow = Slideshow(config.image_folder, config.random_order)
-        self.screen_controller = ScreenController()
+        
+        # Letztes Bild für den nächsten Start sichern, Zustand vom letzten Lauf übernehmen
+        self.state = state
+        self.last_frame = LastFrame() if getattr(config, 'resume_last_frame', True) else None
+        self._shown_image: Optional[Path] = None
+        self._shown_size = [0, 0]
+        self._frame_info: Dict[str, Any] = {}  # Herkunft des gesicherten letzten Bildes
+        self._cached_frame: Dict[str, Any] = {}  # Gesichertes Bild vom letzten Lauf (einmalig nutzbar)
+        self._last_frame_time = time.monotonic()
+        if state:
+            self._restore_state(state.get('slideshow'))
+        self.energy_meter = EnergyMeter(
+            watts_on=getattr(config, 'display_watts_on', 30.0),
+            watts_standby=getattr(config, 'display_watts_standby', 0.5)
+        )
+        self.energy_meter.set_mode(config.display_mode)
+        self.screen_controller = screen_controller or ScreenController(energy=self.energy_meter)
+        self.policy = DisplayPolicy(config.display_mode, config.screen_timeout, config.image_duration)
         self.time_controller = TimeController(
-            enabled=(config.display_mode in ["time", "time_pir"]),
+            enabled=self.policy.uses_schedule,
             work_start=config.work_start_time,
             work_end=config.work_end_time
         )
-        self.pir_sensor: Optional[PIRSensor] = None
+        self.pir_sensor: Optional[Union[PIRSensor, SensorManager]] = None
+        self.motion_trace: Optional[MotionTraceWriter] = None
+        self.event_store: Optional[EventStore] = None
+        self._open_event_store()
+        
+        # Events aus Sensor-Threads werden im Tk-Thread verarbeitet
+        self.event_bus = EventBus()
+        self.event_bus.subscribe(MotionEvent, self._handle_motion_event)
+        self.event_bus.subscribe(ConfigChangedEvent, self._handle_config_event)
+        self._config_time = time.time()  # Wann die aktuelle Konfiguration übernommen wurde
+        self._bus_watched = False
+        
+        # Latenz Bewegung -> Bildschirm an -> erstes Bild
+        self.latency_tracker = MotionLatencyTracker()
+        
+        # Vorausschauendes Einschalten (gelernte Besuchszeiten)
+        self.predictive: Optional[PredictiveWake] = None
         
         # Status
         self.running = False
         self.screen_active = True
-        self.last_motion_time = time.time()
+        self.last_motion_time = self.clock()
         self.current_image_time = 0
         self.current_mode = ""  # Arbeitszeit oder Feierabend
+        
+        # Deep-Idle: Bildschirm aus, keine Bilder im Speicher, keine Update-Schleife
+        self.deep_idle = False
+        self.idle_stats = {'entries': 0, 'seconds': 0.0, 'cpu_seconds': 0.0,
+                           'rss_active': 0, 'rss_idle': 0}
+        self._idle_since = 0.0
+        self._idle_cpu = 0.0
+        self._update_job = None
         self.display_mode = config.display_mode  # "pir", "time", "continuous", "time_pir"
         
         # GUI-Elemente
@@ -83,9 +163,11 @@ class SlideshowWindow:
         self.root.bind('<Escape>', self._on_escape)
         self.root.bind('<space>', lambda e: self._next_image())
         
-        # PIR Sensor initialisieren (im PIR-Modus und Zeit+PIR-Modus)
-        if config.display_mode in ["pir", "time_pir"]:
+        # PIR Sensor initialisieren (Modi mit PIR-Phase, siehe display_policy)
+        if self.policy.uses_pir:
             self._init_pir_sensor()
+            if getattr(config, 'predictive_wake', False):
+                self._init_predictive_wake(DATA_DIR / 'motion_stats.bin')
     
     def _create_widgets(self):
         """Erstellt die GUI-Elemente"""
@@ -97,6 +179,16 @@ class SlideshowWindow:
         self.image_label = tk.Label(self.main_frame, bg='black')
         self.image_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
         
+        self.status_label = None
+        self.info_label = None
+        self._create_overlay_labels()
+    
+    def _create_overlay_labels(self):
+        """Erstellt Status- und Info-Label gemäß Konfiguration (ersetzt vorhandene)"""
+        for label in (self.status_label, self.info_label):
+            if label is not None:
+                label.destroy()
+        
         # Status-Label (oben links)
         if self.config.show_sensor_status:
             self.status_label = tk.Label(
@@ -125,36 +217,322 @@ class SlideshowWindow:
             self.info_label = None
     
     def _init_pir_sensor(self):
-        """Initialisiert den PIR Sensor"""
+        """Initialisiert den PIR Sensor (oder mehrere über den SensorManager)"""
         try:
-            self.pir_sensor = PIRSensor(
-                pin=self.config.pir_pin,
-                callback=self._on_motion_detected
-            )
-            self.pir_sensor.start_monitoring()
-            logger.info("PIR Sensor gestartet")
+            pins = list(getattr(self.config, 'pir_pins', None) or [])
+            debounce_ms = getattr(self.config, 'pir_debounce_ms', 50)
+            
+            trace_file = getattr(self.config, 'motion_trace_file', '')
+            if trace_file:
+                try:
+                    self.motion_trace = MotionTraceWriter(trace_file)
+                except OSError as e:
+                    logger.error(f"Bewegungs-Trace kann nicht geöffnet werden: {e}")
+            
+            if len(pins) > 1:
+                # Mehrere Sensoren: ein Lese-Thread, kombiniertes Signal
+                # Erster Pin in der Liste hat die höchste Priorität
+                inputs = [SensorInput(pin=pin, priority=len(pins) - i) for i, pin in enumerate(pins)]
+                self.pir_sensor = SensorManager(
+                    inputs,
+                    callback=self._publish_motion,
+                    logic=getattr(self.config, 'sensor_logic', 'or'),
+                    chip_path=getattr(self.config, 'gpio_chip', '/dev/gpiochip0'),
+                    backend=self.gpio_backend,
+                    debounce_ms=debounce_ms,
+                    trace=self.motion_trace,
+                    events=self.event_store
+                )
+            else:
+                self.pir_sensor = PIRSensor(
+                    pin=pins[0] if pins else self.config.pir_pin,
+                    callback=self._publish_motion,
+                    backend=self.gpio_backend,
+                    use_interrupts=getattr(self.config, 'pir_use_interrupts', True),
+                    debounce_ms=debounce_ms,
+                    trace=self.motion_trace,
+                    events=self.event_store
+                )
+            logger.info("PIR Sensor eingerichtet")
         except Exception as e:
             logger.error(f"Fehler beim Initialisieren des PIR Sensors: {e}")
     
-    def _on_motion_detected(self, motion: bool):
+    def _close_pir_sensor(self):
+        """Gibt Sensor und Bewegungs-Trace frei"""
+        if self.pir_sensor:
+            self.pir_sensor.cleanup()
+            self.pir_sensor = None
+        if self.motion_trace:
+            self.motion_trace.close()
+            self.motion_trace = None
+    
+    def _open_event_store(self):
+        """Öffnet den Event-Speicher (falls record_events aktiv)"""
+        if not getattr(self.config, 'record_events', True):
+            return
+        try:
+            self.event_store = EventStore()
+        except OSError as e:
+            logger.error(f"Event-Speicher kann nicht angelegt werden: {e}")
+    
+    def _init_predictive_wake(self, stats_path: Optional[Path]):
+        """Initialisiert die Bewegungsstatistik für vorausschauendes Einschalten"""
+        self.predictive = PredictiveWake(
+            MotionStatistics(stats_path),
+            base_timeout=self.config.screen_timeout,
+            min_timeout=getattr(self.config, 'predictive_min_timeout', 30),
+            hot_threshold=getattr(self.config, 'predictive_hot_threshold', 0.6),
+            dead_threshold=getattr(self.config, 'predictive_dead_threshold', 0.05)
+        )
+        self.policy.timeout_for = self.predictive.timeout_for
+        logger.info("Vorausschauendes Einschalten aktiviert")
+    
+    def _restore_state(self, section: Dict[str, Any]):
+        """Übernimmt Reihenfolge, Position und letztes Bild aus dem Snapshot"""
+        if not self.slideshow.restore_state(section):
+            return
+        image = section.get('image')
+        if image and self.slideshow.seek(self.slideshow.image_folder / image):
+            logger.info(f"Setze Slideshow fort bei {image}")
+        
+        frame = section.get('frame') or {}
+        if self.last_frame and frame.get('image') == image:
+            # Das gesicherte Bild ersetzt beim ersten Anzeigen das Dekodieren
+            self._frame_info = self._cached_frame = frame
+            self.last_frame.saved_image = self.slideshow.image_folder / image
+            self.last_frame.saved_size = frame.get('size')
+    
+    def _save_state(self):
+        """Schreibt Bildliste, Position und Bewegungsstatistik in den Snapshot"""
+        if self.predictive:
+            self.predictive.stats.save()
+        if not self.state:
+            return
+        section = self.slideshow.get_state()
+        section['image'] = self._shown_image.name if self._shown_image else None
+        section['frame'] = self._frame_info
+        self.state.set('slideshow', section)
+        self.state.save()
+    
+    def _load_cached_frame(self, image_path: Path, width: int, height: int) -> Optional[tk.PhotoImage]:
+        """Gesichertes Bild vom letzten Lauf, falls es genau dieses Bild in dieser Größe zeigt"""
+        frame, self._cached_frame = self._cached_frame, {}
+        if not frame or frame.get('image') != image_path.name or frame.get('size') != [width, height]:
+            return None
+        try:
+            if os.stat(image_path).st_mtime_ns != frame.get('mtime'):
+                return None  # Bilddatei wurde inzwischen ersetzt
+        except OSError:
+            return None
+        photo = self.last_frame.load_photo(self.root)
+        if photo is not None:
+            logger.info(f"Erstes Bild aus dem gesicherten letzten Bild ({image_path.name}, ohne Dekodieren)")
+        return photo
+    
+    def _close_predictive_wake(self):
+        """Speichert die Bewegungsstatistik und beendet das vorausschauende Einschalten"""
+        if not self.predictive:
+            return
+        self.predictive.stats.save()
+        logger.info(f"Vorausschauendes Einschalten: {self.predictive.get_report(self.clock())}")
+        self.predictive = None
+        self.policy.timeout_for = None
+    
+    def apply_config(self, config: AppConfig) -> ConfigDiff:
+        """
+        Übernimmt eine geänderte Konfiguration, ohne das Fenster neu aufzubauen
+        
+        Nur betroffene Teile werden neu eingerichtet: der Bildordner wird nur
+        bei geändertem image_folder neu eingelesen, der Sensor nur bei
+        geänderten Pins oder Modus. Geht auch während die Slideshow läuft.
+        
+        Returns:
+            Die übernommenen Änderungen
+        """
+        self._config_time = time.time()
+        diff = ConfigDiff.between(self.config, config)
+        if not diff:
+            return diff
+        logger.info(f"Konfiguration übernommen: {', '.join(sorted(diff.changed))}")
+        self.config = replace(config)
+        
+        if diff.touches('image_folder'):
+            self.slideshow.set_folder(config.image_folder)
+            self.current_image_time = 0
+        if diff.touches('random_order'):
+            self.slideshow.set_random_order(config.random_order)
+        
+        # Sensor hält den Event-Speicher - zuerst freigeben
+        sensor_changed = diff.touches(*self.SENSOR_FIELDS)
+        if sensor_changed:
+            self._close_pir_sensor()
+        if diff.touches('record_events'):
+            if self.event_store:
+                self.event_store.close()
+                self.event_store = None
+            self._open_event_store()
+        
+        self.display_mode = config.display_mode
+        self.policy = DisplayPolicy(config.display_mode, config.screen_timeout, config.image_duration)
+        if diff.touches('display_mode'):
+            self.energy_meter.set_mode(config.display_mode)
+            self.time_controller.set_enabled(self.policy.uses_schedule)
+        if diff.touches('work_start_time', 'work_end_time'):
+            self.time_controller.update_times(config.work_start_time, config.work_end_time)
+        
+        if diff.touches(*self.PREDICTIVE_FIELDS):
+            self._close_predictive_wake()
+            if self.policy.uses_pir and getattr(config, 'predictive_wake', False):
+                self._init_predictive_wake(DATA_DIR / 'motion_stats.bin')
+        elif self.predictive:
+            self.policy.timeout_for = self.predictive.timeout_for
+        
+        if sensor_changed and self.policy.uses_pir:
+            self._init_pir_sensor()
+            if self.running and self.pir_sensor:
+                self.pir_sensor.start_monitoring()
+        
+        if diff.touches('display_watts_on', 'display_watts_standby'):
+            self.energy_meter.watts_on = getattr(config, 'display_watts_on', 30.0)
+            self.energy_meter.watts_standby = getattr(config, 'display_watts_standby', 0.5)
+        if diff.touches('show_sensor_status', 'debug_mode'):
+            self._create_overlay_labels()
+        if diff.touches('fullscreen', 'hide_cursor') and self.running:
+            self._apply_window_settings()
+        
+        return diff
+    
+    def _publish_motion(self, motion: bool):
+        """Sensor-Callback (läuft im Sensor-Thread) - nur Event einreihen"""
+        edge_time = self.pir_sensor.last_edge_time if self.pir_sensor else 0
+        self.event_bus.publish(MotionEvent(timestamp=edge_time or time.time(), motion=motion))
+    
+    def _handle_motion_event(self, event: MotionEvent):
+        """Event-Handler im Tk-Thread"""
+        if self.running:
+            self._on_motion_detected(event.motion, event.timestamp)
+    
+    def _handle_config_event(self, event: ConfigChangedEvent):
+        """Übernimmt eine extern geänderte Konfiguration (Tk-Thread)"""
+        if not self.running or event.timestamp < self._config_time:
+            # Während des Einstellungsdialogs bleibt das Event in der Warteschlange.
+            # START hat die aktuelle Konfiguration schon übernommen - der ältere
+            # Snapshot würde in der GUI gemachte Änderungen wieder überschreiben.
+            logger.debug("Veraltetes Config-Event verworfen")
+            return
+        if event.diff:
+            self.apply_config(event.diff.new)
+    
+    def _drain_events(self, *args):
+        """Verarbeitet wartende Events aus dem Event-Bus (Tk-Thread)"""
+        try:
+            self.event_bus.drain()
+        except Exception as e:
+            logger.error(f"Fehler beim Verarbeiten der Events: {e}")
+    
+    def _watch_event_bus(self):
+        """Lässt Tk den Event-Bus überwachen (ein Aufwachen pro Burst)"""
+        if self._bus_watched:
+            return
+        try:
+            self.root.tk.createfilehandler(self.event_bus.fileno(), tk.READABLE, self._drain_events)
+            self._bus_watched = True
+        except (AttributeError, tk.TclError):
+            # Ohne Filehandler (z.B. Windows) leert die Update-Schleife den Bus
+            logger.warning("Tk-Filehandler nicht verfügbar - Events werden per Update-Schleife verarbeitet")
+    
+    def _unwatch_event_bus(self):
+        """Beendet die Überwachung des Event-Bus"""
+        if not self._bus_watched:
+            return
+        try:
+            self.root.tk.deletefilehandler(self.event_bus.fileno())
+        except (AttributeError, tk.TclError):
+            pass
+        self._bus_watched = False
+    
+    def _on_motion_detected(self, motion: bool, timestamp: Optional[float] = None):
         """
-        Callback für Bewegungserkennung
+        Verarbeitet eine Bewegungsänderung (nur im Tk-Thread aufrufen)
         
         Args:
             motion: True wenn Bewegung erkannt, False wenn keine Bewegung
+            timestamp: Zeitpunkt der Flanke (Standard: jetzt)
         """
         if motion:
             logger.info("Bewegung erkannt - Bildschirm einschalten")
-            self.last_motion_time = time.time()
+            self.last_motion_time = timestamp if timestamp is not None else self.clock()
+            
+            if self.predictive:
+                self.predictive.stats.record_motion(self.last_motion_time)
+                self.predictive.note_motion(self.last_motion_time, self.screen_active)
             
             if not self.screen_active:
-                self.screen_controller.turn_on()
-                self.screen_active = True
+                self.latency_tracker.begin(self.last_motion_time)
+                self._set_screen(True)
+                self.latency_tracker.mark('screen_on')
                 self._update_status("Bewegung erkannt - Bildschirm AN")
+                self.root.after_idle(self._mark_first_frame)
         else:
             logger.info("Keine Bewegung mehr")
             self._update_status("Keine Bewegung")
     
+    def _set_screen(self, on: bool):
+        """Schaltet den Bildschirm und zeichnet den Wechsel auf"""
+        if on:
+            if self.deep_idle:
+                self._exit_deep_idle()
+            self.screen_controller.turn_on()
+        else:
+            self.screen_controller.turn_off()
+        self.screen_active = on
+        self._record_event(EVENT_SCREEN_ON if on else EVENT_SCREEN_OFF)
+    
+    def _record_event(self, kind: int, value: int = 0):
+        """Schreibt ein Event in den Event-Speicher (falls aktiv)"""
+        if self.event_store:
+            self.event_store.append(kind, self.clock(), value=value)
+    
+    def _mark_first_frame(self):
+        """Schließt die Latenz-Messung ab, sobald das Bild gezeichnet ist"""
+        if not self.latency_tracker.is_active():
+            return
+        self.root.update_idletasks()
+        self.latency_tracker.mark('first_frame')
+        self.latency_tracker.finish()
+    
+    def _save_last_frame(self, force: bool = False):
+        """Sichert das angezeigte Bild für den nächsten Start (regelmäßig und beim Stoppen)"""
+        if not self.last_frame or self._shown_image is None:
+            return
+        photo = getattr(self.image_label, 'image', None)
+        if photo is None:
+            return
+        if self.last_frame.is_saved(self._shown_image, self._shown_size):
+            return  # Schon gesichert (schont die SD-Karte)
+        
+        interval = getattr(self.config, 'last_frame_interval', 3600)
+        now = time.monotonic()
+        if not force and (interval <= 0 or now - self._last_frame_time < interval):
+            return
+        self._last_frame_time = now
+        if not self.last_frame.save(self.root, photo, self._shown_image, self._shown_size):
+            return
+        try:
+            mtime = os.stat(self._shown_image).st_mtime_ns
+        except OSError:
+            mtime = None
+        self._frame_info = {'image': self._shown_image.name, 'size': self._shown_size, 'mtime': mtime}
+        if not force:
+            self._save_state()  # Beim Stoppen schreibt stop() den Snapshot
+    
+    def _report_first_frame(self):
+        """Meldet das erste Bild nach start(), sobald es gezeichnet ist"""
+        if not self.running or not self.on_first_frame:
+            return
+        self.root.update_idletasks()
+        self.on_first_frame()
+    
     def _update_status(self, text: str):
         """Aktualisiert den Status-Text"""
         if self.status_label:
@@ -187,10 +565,17 @@ class SlideshowWindow:
             height = self.root.winfo_height()
             
             if width <= 1 or height <= 1:
-                # Fenster noch nicht initialisiert
-                width, height = 1920, 1080
+                # Fenster noch nicht gezeichnet (erstes Bild direkt nach start())
+                if self.config.fullscreen:
+                    width, height = self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+                else:
+                    width, height = 1920, 1080
             
-            photo = self.slideshow.load_image_for_display(image_path, width, height)
+            photo = None
+            if self._cached_frame:
+                photo = self._load_cached_frame(image_path, width, height)
+            if photo is None:
+                photo = self.slideshow.load_image_for_display(image_path, width, height)
             
             if photo:
                 self.image_label.config(image=photo)
@@ -201,123 +586,153 @@ class SlideshowWindow:
                 index = self.slideshow.get_current_index()
                 self._update_status(f"Bild {index}/{count} - {image_path.name}")
                 
-                self.current_image_time = time.time()
-                logger.debug(f"Zeige Bild: {image_path.name}")
+                self.current_image_time = self.clock()
+                self._shown_image = image_path
+                self._shown_size = [width, height]
+                self._record_event(EVENT_SLIDE, index)
+                logger.debug("Zeige Bild: %s", image_path.name, extra={'image_path': str(image_path)})
+                get_flight_recorder().sample_system()
+                self._save_last_frame()
+                
+                if self._first_frame_pending:
+                    self._first_frame_pending = False
+                    self.root.after_idle(self._report_first_frame)
             
         except Exception as e:
             logger.error(f"Fehler beim Anzeigen des Bildes: {e}")
     
-    def _check_screen_timeout(self):
-        """Prüft ob Bildschirm-Timeout erreicht ist"""
+    def _apply_policy(self):
+        """Wertet die Display-Policy für jetzt aus und setzt das Ergebnis um"""
+        current_time = self.clock()
+        if self.predictive:
+            self.predictive.stats.tick(current_time)
+        
+        work_time = self.policy.uses_schedule and self.time_controller.is_work_time()
+        decision = self.policy.evaluate(current_time, work_time, self.screen_active,
+                                        self.last_motion_time, self.current_image_time)
+        
+        if self.predictive and decision.reason != REASON_WARM:
+            self.predictive.end_warm(current_time)
+        was_idle = self.deep_idle
+        
+        if decision.reason == REASON_WARM:
+            self._keep_screen_warm(current_time, decision.screen is True)
+        elif decision.screen is True:
+            status = self.policy.rule.on_status
+            logger.info("Modus %s: %s - Bildschirm einschalten", self.display_mode, status,
+                        extra={'display_mode': self.display_mode})
+            self._set_screen(True)
+            self._update_status(status)
+        elif decision.screen is False:
+            status = self.policy.rule.off_status
+            logger.info("Modus %s: %s - Bildschirm ausschalten", self.display_mode, status,
+                        extra={'display_mode': self.display_mode})
+            self._set_screen(False)
+            if decision.reason == REASON_TIMEOUT:
+                self._note_screen_off(current_time)
+            self._update_status(status)
+            self._enter_deep_idle()
+        
+        # Beim Verlassen des Deep-Idle ist das nächste Bild schon eingeplant
+        if decision.advance and not (was_idle and not self.deep_idle):
+            self._next_image()
+    
+    def _keep_screen_warm(self, current_time: float, turn_on: bool):
+        """Hält den Bildschirm in Zeiten mit erwarteten Besuchern an"""
+        if turn_on:
+            logger.info("Besucher erwartet - Bildschirm vorab einschalten")
+            self._set_screen(True)
+            self._update_status("Besucher erwartet - Bildschirm AN")
+        if self.predictive.note_warm(current_time, self.last_motion_time, woke=turn_on):
+            # Einmal pro Warmphase statt in jedem Tick
+            self._prefetch_next_frame()
+    
+    def _note_screen_off(self, current_time: float):
+        """Meldet eine Timeout-Abschaltung an die Vorhersage"""
+        if self.predictive:
+            self.predictive.note_screen_off(current_time, self.last_motion_time)
+    
+    def _prefetch_next_frame(self):
+        """Dekodiert das nächste Bild vorab (Tk-Thread)"""
+        width = self.root.winfo_width()
+        height = self.root.winfo_height()
+        if width <= 1 or height <= 1:
+            width, height = 1920, 1080
+        self.slideshow.prefetch_next(width, height)
+    
+    def _enter_deep_idle(self):
+        """
+        Hält die Darstellung an, solange der Bildschirm aus ist
         
-        # === MODUS 1: PIR-Steuerung ===
-        if self.display_mode == "pir":
-            current_time = time.time()
-            time_since_motion = current_time - self.last_motion_time
-            
-            if time_since_motion > self.config.screen_timeout and self.screen_active:
-                logger.info("PIR-Modus: Bildschirm-Timeout erreicht - Bildschirm ausschalten")
-                self.screen_controller.turn_off()
-                self.screen_active = False
-                self._update_status("Bildschirm AUS (Timeout)")
-        
-        # === MODUS 2: Zeitsteuerung ===
-        elif self.display_mode == "time":
-            is_work_time = self.time_controller.is_work_time()
-            
-            if is_work_time:
-                # Während Arbeitszeit: Bildschirm immer an
-                if not self.screen_active:
-                    logger.info("Arbeitszeit - Bildschirm einschalten")
-                    self.screen_controller.turn_on()
-                    self.screen_active = True
-                    self._update_status("Arbeitszeit - Dauerschleife aktiv")
-            else:
-                # Außerhalb Arbeitszeit: Bildschirm aus
-                if self.screen_active:
-                    logger.info("Feierabend - Bildschirm ausschalten")
-                    self.screen_controller.turn_off()
-                    self.screen_active = False
-                    self._update_status("Feierabend - Bildschirm AUS")
-        
-        # === MODUS 3: Dauerschleife (24/7) ===
-        elif self.display_mode == "continuous":
-            # Bildschirm immer an
-            if not self.screen_active:
-                logger.info("Dauerschleife-Modus - Bildschirm einschalten")
-                self.screen_controller.turn_on()
-                self.screen_active = True
-                self._update_status("Dauerschleife aktiv (24/7)")
-        
-        # === MODUS 4: Zeitsteuerung + PIR ===
-        elif self.display_mode == "time_pir":
-            is_work_time = self.time_controller.is_work_time()
-            
-            if is_work_time:
-                # Während Arbeitszeit: Dauerschleife (wie Modus 2)
-                if not self.screen_active:
-                    logger.info("Zeit+PIR: Arbeitszeit - Bildschirm einschalten")
-                    self.screen_controller.turn_on()
-                    self.screen_active = True
-                    self._update_status("Arbeitszeit - Dauerschleife aktiv")
-            else:
-                # Außerhalb Arbeitszeit: PIR-Steuerung (wie Modus 1)
-                current_time = time.time()
-                time_since_motion = current_time - self.last_motion_time
-                
-                if time_since_motion > self.config.screen_timeout and self.screen_active:
-                    logger.info("Zeit+PIR: Feierabend - PIR-Timeout erreicht")
-                    self.screen_controller.turn_off()
-                    self.screen_active = False
-                    self._update_status("Feierabend - PIR aktiv (Bildschirm AUS)")
-    
-    def _check_image_change(self):
-        """Prüft ob Bild gewechselt werden soll"""
-        
-        # Nur Bilder wechseln wenn Bildschirm aktiv ist
-        # AUSNAHME: Im Zeit-Modus während Arbeitszeit oder Dauerschleife-Modus
-        should_change = False
-        
-        if self.display_mode == "pir":
-            # PIR-Modus: Nur bei aktivem Bildschirm
-            should_change = self.screen_active
-        
-        elif self.display_mode == "time":
-            # Zeit-Modus: Nur während Arbeitszeit
-            should_change = self.time_controller.is_work_time()
-        
-        elif self.display_mode == "continuous":
-            # Dauerschleife: Immer
-            should_change = True
-        
-        elif self.display_mode == "time_pir":
-            # Zeit+PIR-Modus: Während Arbeitszeit immer, sonst nur bei aktivem Bildschirm
-            is_work_time = self.time_controller.is_work_time()
-            if is_work_time:
-                should_change = True  # Arbeitszeit: Immer
-            else:
-                should_change = self.screen_active  # Feierabend: Nur wenn Bildschirm an
+        Gibt dekodierte Bilder frei, verkleinert den Heap und ersetzt die
+        100ms-Update-Schleife durch eine seltene Prüfung. Bewegung kommt
+        weiter über den Event-Bus (Tk wartet blockierend auf die Pipe).
+        """
+        if self.deep_idle or not getattr(self.config, 'deep_idle', True):
+            return
         
-        if not should_change:
+        rss_active = get_rss_bytes()
+        self.image_label.config(image='')
+        self.image_label.image = None
+        self.slideshow.release_frames()
+        gc.collect()
+        trim_heap()
+        
+        self.deep_idle = True
+        self.idle_stats['entries'] += 1
+        self.idle_stats['rss_active'] = rss_active
+        self.idle_stats['rss_idle'] = get_rss_bytes()
+        self._idle_since = time.monotonic()
+        self._idle_cpu = time.process_time()
+        
+        self._schedule_update(self._loop_interval())
+        logger.info(f"Deep-Idle: RSS {rss_active / 1e6:.1f} MB -> {self.idle_stats['rss_idle'] / 1e6:.1f} MB")
+    
+    def _exit_deep_idle(self):
+        """Verlässt den Deep-Idle: erstes Bild sofort dekodieren, Schleife wieder starten"""
+        if not self.deep_idle:
             return
+        self.deep_idle = False
         
-        current_time = time.time()
-        time_since_image = current_time - self.current_image_time
+        idle_seconds = time.monotonic() - self._idle_since
+        cpu_seconds = time.process_time() - self._idle_cpu
+        self.idle_stats['seconds'] += idle_seconds
+        self.idle_stats['cpu_seconds'] += cpu_seconds
+        cpu_percent = 100.0 * cpu_seconds / idle_seconds if idle_seconds > 0 else 0.0
+        logger.info(f"Deep-Idle beendet nach {idle_seconds:.0f}s (CPU {cpu_percent:.2f}%)")
         
-        if time_since_image >= self.config.image_duration:
-            self._next_image()
+        if self.running:
+            # Bild dekodieren, während der Bildschirm im Worker einschaltet
+            self.root.after_idle(self._next_image)
+            self._schedule_update(self.UPDATE_INTERVAL_MS)
+    
+    def _loop_interval(self) -> int:
+        """Abstand bis zum nächsten Durchlauf der Update-Schleife (ms)"""
+        if not self.deep_idle:
+            return self.UPDATE_INTERVAL_MS
+        # Ohne Filehandler muss die Schleife den Event-Bus weiter leeren
+        return self.DEEP_IDLE_CHECK_MS if self._bus_watched else 500
+    
+    def _schedule_update(self, delay_ms: int):
+        """Plant den nächsten Durchlauf der Update-Schleife (ersetzt einen geplanten)"""
+        if self._update_job is not None:
+            self.root.after_cancel(self._update_job)
+        self._update_job = self.root.after(delay_ms, self._update_loop)
     
     def _update_loop(self):
         """Hauptupdate-Schleife"""
         if not self.running:
             return
         
+        self._update_job = None
         try:
-            self._check_screen_timeout()
-            self._check_image_change()
+            if not self._bus_watched:
+                self._drain_events()
+            self._apply_policy()
             
             # Nächstes Update planen
-            self.root.after(100, self._update_loop)
+            if self._update_job is None:
+                self._schedule_update(self._loop_interval())
             
         except Exception as e:
             logger.error(f"Fehler in Update-Schleife: {e}")
@@ -347,23 +762,32 @@ class SlideshowWindow:
         
         self.running = True
         self.screen_active = True
-        self.last_motion_time = time.time()
+        self.deep_idle = False
+        self.last_motion_time = self.clock()
         self.current_image_time = 0
         
         # Bildschirm einschalten
         self.screen_controller.turn_on()
+        self._record_event(EVENT_SCREEN_ON)
+        
+        # Sensor-Events im Tk-Thread verarbeiten
+        self._watch_event_bus()
+        if self.pir_sensor:
+            self.pir_sensor.start_monitoring()
         
         # Fenster sichtbar machen und fokussieren
         self.root.deiconify()
         self.root.lift()
         self.root.attributes('-topmost', True)
         self.root.focus_force()
+        self._apply_window_settings()
         
-        # Erstes Bild anzeigen
-        self.root.after(100, self._next_image)
+        # Erstes Bild sofort anzeigen (ohne feste Wartezeit)
+        self._first_frame_pending = True
+        self.root.after_idle(self._next_image)
         
         # Update-Schleife starten
-        self.root.after(200, self._update_loop)
+        self._schedule_update(self.UPDATE_INTERVAL_MS)
         
         logger.info("Slideshow gestartet und Fenster angezeigt")
     
@@ -373,13 +797,47 @@ class SlideshowWindow:
             return
         
         self.running = False
-        
-        # PIR Sensor stoppen
+        if self._update_job is not None:
+            self.root.after_cancel(self._update_job)
+            self._update_job = None
+        self._save_last_frame(force=True)
+        self._save_state()
+        self._exit_deep_idle()
+        if self.idle_stats['entries']:
+            stats = self.idle_stats
+            cpu_percent = 100.0 * stats['cpu_seconds'] / stats['seconds'] if stats['seconds'] else 0.0
+            logger.info(f"Deep-Idle: {stats['entries']}x, {stats['seconds'] / 60:.0f} min, "
+                        f"CPU {cpu_percent:.2f}%, RSS {stats['rss_active'] / 1e6:.1f} MB aktiv / "
+                        f"{stats['rss_idle'] / 1e6:.1f} MB idle")
+        
+        # PIR Sensor anhalten (bleibt für den nächsten Start eingerichtet)
         if self.pir_sensor:
-            self.pir_sensor.cleanup()
+            self.pir_sensor.stop_monitoring()
+        if self.event_store:
+            self.event_store.close()
+        
+        self._unwatch_event_bus()
+        
+        if self.latency_tracker.samples:
+            logger.info(f"Aufweck-Latenz: {self.latency_tracker.summary()}")
+        
+        if self.predictive:
+            logger.info(f"Vorausschauendes Einschalten: {self.predictive.get_report(self.clock())}")
         
         # Bildschirm einschalten (für Konfiguration)
         self.screen_controller.turn_on()
+        stats = self.screen_controller.get_statistics()
+        if stats['commands']:
+            logger.info(f"Bildschirm-Befehle: {stats['commands']} ({stats['failures']} Fehler, "
+                        f"{stats['coalesced']} zusammengefasst), mittel {stats['mean_ms']:.0f}ms, "
+                        f"max {stats['max_ms']:.0f}ms")
+        # Worker führt das Einschalten noch aus und beendet sich dann (nicht blockieren)
+        self.screen_controller.close(timeout=0)
+        
+        today = self.energy_meter.get_report(days=1).get(self.display_mode)
+        if today:
+            logger.info(f"Bildschirm heute im Modus {self.display_mode}: {today['on_hours']:.1f} h an, "
+                        f"{today['toggles']} Schaltungen, ca. {today['energy_wh']:.0f} Wh")
         
         # Fenster verstecken
         self.root.withdraw()
@@ -405,4 +863,29 @@ class SlideshowWindow:
     def hide(self):
         """Versteckt das Slideshow-Fenster"""
         self.root.withdraw()
+    
+    def _apply_window_settings(self):
+        """Setzt Mauszeiger und Vollbild gemäß Konfiguration"""
+        self.root.configure(cursor='none' if getattr(self.config, 'hide_cursor', True) else '')
+        if self.config.fullscreen:
+            self.root.attributes('-fullscreen', True)
+            self.root.attributes('-topmost', True)
+            self.root.overrideredirect(True)
+        else:
+            self.root.overrideredirect(False)
+            self.root.attributes('-fullscreen', False)
+    
+    def destroy(self):
+        """Stoppt die Slideshow und gibt Fenster, Sensor und Speicher endgültig frei"""
+        self.stop()
+        # Anders als bei stop() endet danach der Prozess: letzten Befehl,
+        # Rückmeldung und Energie-Daten des Daemon-Workers abwarten
+        self.screen_controller.close(timeout=self.CLOSE_TIMEOUT)
+        self.energy_meter.save()
+        self._close_pir_sensor()
+        self._close_predictive_wake()
+        self.slideshow.release_frames()
+        self.event_bus.close()
+        self.root.destroy()
+        logger.info("Slideshow-Fenster geschlossen")
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Zustands-Snapshot über Neustarts des Dienstes hinweg
+Bildliste samt Reihenfolge und Position, Rate-Limiter und das gesicherte
+letzte Bild werden in einer kleinen JSON-Datei abgelegt, damit ein
+Neustart (z.B. durch update.sh) für Besucher unsichtbar bleibt.
+"""
+
+import os
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+from .config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = DATA_DIR / 'state.json'
+STATE_VERSION = 1
+
+
+class StateSnapshot:
+    """
+    Abschnitte des Laufzeitzustands, atomar als eine Datei gespeichert
+    
+    Jede Komponente legt ihren Abschnitt mit set() ab und liest ihn beim
+    Start mit get(). Ein Abschnitt ist ein JSON-fähiges Dict.
+    """
+    
+    def __init__(self, path: Path = STATE_FILE):
+        self.path = Path(path)
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.saved = 0.0  # Zeitpunkt des gelesenen bzw. zuletzt geschriebenen Snapshots
+    
+    def load(self) -> bool:
+        """Liest den Snapshot (False wenn keiner vorhanden oder unlesbar)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Zustands-Snapshot nicht lesbar: {e}")
+            return False
+        
+        if data.get('version') != STATE_VERSION:
+            logger.info("Zustands-Snapshot aus anderer Version - wird ignoriert")
+            return False
+        self.sections = data.get('sections', {})
+        self.saved = data.get('saved', 0.0)
+        logger.info(f"Zustands-Snapshot geladen ({', '.join(self.sections) or 'leer'}, "
+                    f"{time.time() - self.saved:.0f}s alt)")
+        return True
+    
+    def get(self, name: str) -> Dict[str, Any]:
+        """Abschnitt name (leer wenn nicht vorhanden)"""
+        section = self.sections.get(name)
+        return section if isinstance(section, dict) else {}
+    
+    def set(self, name: str, section: Dict[str, Any]):
+        """Ersetzt Abschnitt name (geschrieben wird erst mit save())"""
+        self.sections[name] = section
+    
+    def save(self) -> bool:
+        """Schreibt den Snapshot atomar (auch bei Stromausfall nie halb)"""
+        self.saved = time.time()
+        data = {'version': STATE_VERSION, 'saved': self.saved, 'sections': self.sections}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Zustands-Snapshot konnte nicht gespeichert werden: {e}")
+            return False
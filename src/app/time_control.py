@@ -5,7 +5,7 @@ Zeitsteuerung für Arbeitszeit-Modus
 
 import logging
 from datetime import datetime, time
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,8 @@ class TimeController:
     
     def __init__(self, enabled: bool = False, 
                  work_start: str = "08:00", 
-                 work_end: str = "17:00"):
+                 work_end: str = "17:00",
+                 clock: Optional[Callable[[], datetime]] = None):
         """
         Initialisiert den TimeController
         
@@ -23,8 +24,10 @@ class TimeController:
             enabled: Zeitsteuerung aktiviert
             work_start: Arbeitsbeginn (Format: "HH:MM")
             work_end: Feierabend (Format: "HH:MM")
+            clock: Liefert die aktuelle Zeit (Standard: datetime.now, z.B. virtuelle Uhr für Replays)
         """
         self.enabled = enabled
+        self.clock = clock or datetime.now
         self.work_start = self._parse_time(work_start)
         self.work_end = self._parse_time(work_end)
         
@@ -57,7 +60,7 @@ class TimeController:
         if not self.enabled:
             return False
         
-        current_time = datetime.now().time()
+        current_time = self.clock().time()
         
         # Normale Arbeitszeit (z.B. 08:00 - 17:00)
         if self.work_start < self.work_end:
@@ -104,3 +104,41 @@ def get_system_info() -> dict:
     
     return info
 
+
+def get_rss_bytes() -> int:
+    """Gibt den belegten Arbeitsspeicher (RSS) des Prozesses zurück (0 wenn unbekannt)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def get_process_uptime() -> Optional[float]:
+    """Sekunden seit dem Start dieses Prozesses (None wenn unbekannt)"""
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            stat = f.read()
+        with open('/proc/uptime', 'rb') as f:
+            uptime = float(f.read().split()[0])
+        # Feld 22 (starttime, in Ticks seit Systemstart) - gezählt nach dem Programmnamen in Klammern
+        start_ticks = int(stat.rpartition(b')')[2].split()[19])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def trim_heap() -> bool:
+    """
+    Gibt freien Heap-Speicher an das Betriebssystem zurück (glibc malloc_trim)
+    
+    Returns:
+        True wenn Speicher freigegeben wurde
+    """
+    try:
+        import ctypes
+        libc = ctypes.CDLL('libc.so.6')
+        return bool(libc.malloc_trim(0))
+    except (OSError, AttributeError):
+        return False